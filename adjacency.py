@@ -0,0 +1,190 @@
+"""
+Greedy Algorithm Assignment - Adjacency Index
+
+This file contains a precomputed neighbor index built once from the edge list,
+so the route builders don't have to rescan every road at each step. The edge
+list is normalized first: a road listed twice (in either direction) is kept
+once and roads from a node to itself are dropped, so no neighbor is offered,
+and scored, more than once per step.
+"""
+from array import array
+from typing import Dict, List, NamedTuple, Optional, Union
+
+from main import Node, Edge
+
+
+class NormalizedEdges(NamedTuple):
+    """
+    An edge list without duplicate roads or self-loops.
+
+    Attributes:
+        edges (List[Edge]): First occurrence of each road, in the original order
+        duplicates (int): Roads dropped because they were already listed (either direction)
+        self_loops (int): Roads dropped because both ends are the same node
+    """
+    edges: List[Edge]
+    duplicates: int
+    self_loops: int
+
+
+def normalize_edges(edges: List[Edge]) -> NormalizedEdges:
+    """
+    Drop repeated undirected roads and self-loops, keeping the first occurrence of each road.
+
+    Neighbors keep the order a full scan of the original list would find them in.
+
+    Args:
+        edges (List[Edge]): Road connections
+
+    Returns:
+        NormalizedEdges: The remaining roads and what was dropped
+    """
+    seen = set()
+    kept = []
+    duplicates = self_loops = 0
+    for edge in edges:
+        u, v = edge.u.id, edge.v.id
+        if u == v:
+            self_loops += 1
+            continue
+        key = (u, v) if u < v else (v, u)
+        if key in seen:
+            duplicates += 1
+            continue
+        seen.add(key)
+        kept.append(edge)
+    return NormalizedEdges(kept, duplicates, self_loops)
+
+
+class AdjacencyIndex:
+    """
+    Neighbor lists for every node, stored CSR-style.
+
+    Node ids are mapped to dense slots 0..n-1. The neighbors of the node in
+    slot s are neighbor_slots[offsets[s]:offsets[s + 1]], in the same order
+    a full scan of the normalized edge list would find them.
+
+    Attributes:
+        nodes (List[Node]): Node object stored in each slot
+        slot_of (Dict[int, int]): Maps a node id to its slot
+        edges (List[Edge]): The normalized roads the index was built from
+        duplicate_edges (int): Repeated roads dropped by normalize_edges
+        self_loops (int): Self-loops dropped by normalize_edges
+        offsets (array): Start of each slot's run in neighbor_slots (length n + 1)
+        neighbor_slots (array): Concatenated neighbor slots for all nodes
+        cache (Dict[str, object]): Structures derived from this index by the route
+            builders (scoring engine, candidate heaps); cleared when nodes are added
+    """
+
+    def __init__(self, edges: List[Edge], nodes: Optional[List[Node]] = None):
+        self.nodes: List[Node] = []
+        self.slot_of: Dict[int, int] = {}
+        self.cache: Dict[str, object] = {}
+
+        # Nodes passed in explicitly keep their order, so isolated nodes get a slot too
+        for node in nodes or []:
+            self._add_node(node)
+        for edge in edges:
+            self._add_node(edge.u)
+            self._add_node(edge.v)
+        edges, self.duplicate_edges, self.self_loops = normalize_edges(edges)
+        self.edges: List[Edge] = edges
+
+        # First pass counts the degree of each slot
+        counts = [0] * len(self.nodes)
+        for edge in edges:
+            counts[self.slot_of[edge.u.id]] += 1
+            counts[self.slot_of[edge.v.id]] += 1
+
+        self.offsets = array('l', [0] * (len(self.nodes) + 1))
+        for slot, count in enumerate(counts):
+            self.offsets[slot + 1] = self.offsets[slot] + count
+
+        # Second pass fills each run in edge order
+        self.neighbor_slots = array('l', [0] * self.offsets[-1])
+        cursor = list(self.offsets[:-1])
+        for edge in edges:
+            u = self.slot_of[edge.u.id]
+            v = self.slot_of[edge.v.id]
+            self.neighbor_slots[cursor[u]] = v
+            cursor[u] += 1
+            self.neighbor_slots[cursor[v]] = u
+            cursor[v] += 1
+
+    def _add_node(self, node: Node):
+        if node.id not in self.slot_of:
+            self.slot_of[node.id] = len(self.nodes)
+            self.nodes.append(node)
+
+    def ensure_nodes(self, nodes: List[Node]):
+        """
+        Register any of the given nodes that have no slot yet, as nodes without roads.
+
+        Args:
+            nodes (List[Node]): Nodes that must have a slot
+        """
+        for node in nodes:
+            if node.id not in self.slot_of:
+                self._add_node(node)
+                self.offsets.append(self.offsets[-1])
+                self.cache.clear()
+
+    def neighbor_slots_of(self, slot: int) -> array:
+        """
+        Get the neighbor slots of the node in the given slot.
+
+        Args:
+            slot (int): Dense slot of the node
+
+        Returns:
+            array: Slots of all directly connected nodes
+        """
+        return self.neighbor_slots[self.offsets[slot]:self.offsets[slot + 1]]
+
+    def neighbors(self, node: Node) -> List[Node]:
+        """
+        Get all nodes that are directly connected to the given node.
+
+        Args:
+            node (Node): The node to find neighbors for
+
+        Returns:
+            List[Node]: List of neighboring nodes (empty if the node has no roads)
+        """
+        slot = self.slot_of.get(node.id)
+        if slot is None:
+            return []
+        nodes = self.nodes
+        return [nodes[s] for s in self.neighbor_slots_of(slot)]
+
+    def degree(self, node: Node) -> int:
+        """Number of distinct neighbors of the given node."""
+        slot = self.slot_of.get(node.id)
+        if slot is None:
+            return 0
+        return self.offsets[slot + 1] - self.offsets[slot]
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __repr__(self):
+        return f"AdjacencyIndex({len(self.nodes)} nodes, {len(self.neighbor_slots)} neighbor entries)"
+
+
+def as_adjacency(edges: Union[List[Edge], AdjacencyIndex],
+                 nodes: Optional[List[Node]] = None) -> AdjacencyIndex:
+    """
+    Return edges unchanged if it is already an AdjacencyIndex, otherwise build one.
+
+    Args:
+        edges (List[Edge] or AdjacencyIndex): Road connections
+        nodes (List[Node], optional): Nodes to register even if they have no roads
+
+    Returns:
+        AdjacencyIndex: Index over the given roads
+    """
+    if isinstance(edges, AdjacencyIndex):
+        if nodes:
+            edges.ensure_nodes(nodes)
+        return edges
+    return AdjacencyIndex(edges, nodes)
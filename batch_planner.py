@@ -0,0 +1,197 @@
+"""
+Greedy Algorithm Assignment - Batch Route Planning
+
+This file plans many routes (many drivers, many depots) against one shared graph.
+The nodes and edges are sent to each worker process once, through the pool
+initializer, and every worker builds its own AdjacencyIndex from them; jobs only
+carry a depot id, an objective and the assigned customer ids.
+
+plan_routes_batch_from_file sends only the path of a columnar dataset file
+(see dataset_file.py) instead: each worker maps the file read-only, so the
+operating system shares its pages between all of them.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, List, NamedTuple, Optional, Tuple
+
+from main import Node, Edge
+from adjacency import AdjacencyIndex
+from dataset_file import load_dataset
+from greedy_approach import greedy_company_route, greedy_driver_route, greedy_ethical_route
+from policies import ETHICAL_RULES
+
+OBJECTIVES = ("company", "driver", "ethical")
+
+
+class RouteJob(NamedTuple):
+    """
+    One route to plan.
+
+    Attributes:
+        depot_id (int): Id of the depot the route starts and ends at
+        objective (str): "company" (Part A), "driver" (Part B) or "ethical" (Part C)
+        customer_ids (Tuple[int, ...], optional): Customers assigned to this route (default: all)
+        ethical_rule (str, optional): Rule for the "ethical" objective
+    """
+    depot_id: int
+    objective: str = "driver"
+    customer_ids: Optional[Tuple[int, ...]] = None
+    ethical_rule: Optional[str] = None
+
+
+class RouteResult(NamedTuple):
+    """
+    A planned route.
+
+    Attributes:
+        job (RouteJob): The job this result answers
+        route (List[Node]): Stops in order, depot first and last
+        total (float): Total profit/earnings of the route
+    """
+    job: RouteJob
+    route: List[Node]
+    total: float
+
+
+# AdjacencyIndex of the graph this worker process was started with (see init_worker)
+_worker_graph: Optional[AdjacencyIndex] = None
+
+
+def init_worker(nodes: List[Node], edges: List[Edge]):
+    """
+    Pool initializer: build the shared graph once per worker process.
+
+    Args:
+        nodes (List[Node]): All locations
+        edges (List[Edge]): All road connections
+    """
+    global _worker_graph
+    _worker_graph = AdjacencyIndex(edges, nodes)
+
+
+def worker_graph() -> Optional[AdjacencyIndex]:
+    """The graph this worker process was initialized with (None outside a worker)."""
+    return _worker_graph
+
+
+def _init_worker_from_file(path: str):
+    """Pool initializer: map the dataset file and build the shared graph once per worker process."""
+    global _worker_graph
+    _worker_graph = _graph_from_file(path)
+
+
+def _graph_from_file(path: str) -> AdjacencyIndex:
+    nodes, edges = load_dataset(path)
+    return AdjacencyIndex(list(edges), nodes.views())
+
+
+def check_job(job: RouteJob):
+    """
+    Raise ValueError for a job no planner can run.
+
+    Args:
+        job (RouteJob): Job to validate
+    """
+    if job.objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective: {job.objective!r}")
+    if job.objective == "ethical" and job.ethical_rule is None:
+        raise ValueError("Ethical jobs need an ethical_rule")
+    if job.ethical_rule is not None and (not isinstance(job.ethical_rule, str)
+                                         or job.ethical_rule not in ETHICAL_RULES):
+        raise ValueError(f"Unknown ethical rule: {job.ethical_rule!r}")
+
+
+def plan_job(graph: AdjacencyIndex, job: RouteJob) -> Tuple[List[int], float]:
+    """
+    Plan one job on the given graph.
+
+    Args:
+        graph (AdjacencyIndex): Graph holding the job's depot and customers
+        job (RouteJob): Job to plan (see check_job)
+
+    Returns:
+        Tuple[List[int], float]: (route as node ids, total profit/earnings)
+    """
+    depot = graph.nodes[graph.slot_of[job.depot_id]]
+    if job.customer_ids is None:
+        customers = [node for node in graph.nodes if not node.is_depot]
+    else:
+        customers = [graph.nodes[graph.slot_of[node_id]] for node_id in job.customer_ids]
+    nodes = [depot] + customers
+
+    if job.objective == "company":
+        route, total = greedy_company_route(nodes, depot, graph)
+    elif job.objective == "driver":
+        route, total = greedy_driver_route(nodes, depot, graph)
+    else:
+        route, total = greedy_ethical_route(nodes, depot, graph, job.ethical_rule)
+    return [node.id for node in route], total
+
+
+def _plan_in_worker(job: RouteJob) -> Tuple[List[int], float]:
+    return plan_job(_worker_graph, job)
+
+
+def plan_routes_batch(jobs: Iterable[RouteJob], nodes: List[Node], edges: List[Edge],
+                      workers: Optional[int] = None, chunksize: Optional[int] = None) -> List[RouteResult]:
+    """
+    Plan many routes on one graph, in parallel worker processes.
+
+    Args:
+        jobs (Iterable[RouteJob]): Routes to plan
+        nodes (List[Node]): All locations, including every depot used by the jobs
+        edges (List[Edge]): All road connections
+        workers (int, optional): Worker processes (default: os.cpu_count()); 1 plans in this process
+        chunksize (int, optional): Jobs sent to a worker at a time (default: about 4 chunks per worker)
+
+    Returns:
+        List[RouteResult]: One result per job, in submission order
+    """
+    jobs = list(jobs)
+    planned = _run_jobs(jobs, workers, chunksize, lambda: AdjacencyIndex(edges, nodes),
+                        init_worker, (nodes, edges))
+    by_id = {node.id: node for node in nodes}
+    return [RouteResult(job, [by_id[node_id] for node_id in route_ids], total)
+            for job, (route_ids, total) in zip(jobs, planned)]
+
+
+def plan_routes_batch_from_file(jobs: Iterable[RouteJob], path: str, workers: Optional[int] = None,
+                                chunksize: Optional[int] = None) -> List[RouteResult]:
+    """
+    plan_routes_batch for a graph stored in a columnar dataset file.
+
+    Workers map the file themselves, so nothing but the path and the jobs is sent to them.
+
+    Args:
+        jobs (Iterable[RouteJob]): Routes to plan
+        path (str): Dataset file written by dataset_file.write_dataset
+        workers (int, optional): Worker processes (default: os.cpu_count()); 1 plans in this process
+        chunksize (int, optional): Jobs sent to a worker at a time (default: about 4 chunks per worker)
+
+    Returns:
+        List[RouteResult]: One result per job, in submission order; routes hold NodeViews
+    """
+    jobs = list(jobs)
+    planned = _run_jobs(jobs, workers, chunksize, lambda: _graph_from_file(path),
+                        _init_worker_from_file, (path,))
+    nodes, _ = load_dataset(path)
+    return [RouteResult(job, [nodes.view(node_id) for node_id in route_ids], total)
+            for job, (route_ids, total) in zip(jobs, planned)]
+
+
+def _run_jobs(jobs: List[RouteJob], workers: Optional[int], chunksize: Optional[int],
+              build_graph: Callable[[], AdjacencyIndex], initializer: Callable, initargs: tuple):
+    """Validate the jobs and plan them in this process or on a pool; returns (route ids, total) per job."""
+    for job in jobs:
+        check_job(job)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(jobs)))
+
+    if workers == 1:
+        graph = build_graph()
+        return [plan_job(graph, job) for job in jobs]
+    if chunksize is None:
+        chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+        return list(pool.map(_plan_in_worker, jobs, chunksize=chunksize))
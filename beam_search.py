@@ -0,0 +1,187 @@
+"""
+Greedy Algorithm Assignment - Beam Search with Lookahead
+
+greedy_company_route and greedy_driver_route commit to the best-scoring next
+stop at every step. This file keeps the `beam` best partial routes instead, and
+ranks every possible next stop by its own score plus a greedy rollout of the
+following `depth - 1` stops, so a stop that leads into an expensive dead end can
+lose to one that scores a little less now. beam=1, depth=1 is exactly the greedy
+router, route and total. With beam > 1 the greedy route itself always keeps one
+place in the beam, so the result is never below the greedy total; depth on its
+own is a heuristic and can do worse. benchmarks/run.py --beam reports the
+profit each setting gains and the CPU it costs.
+
+Two routes at the same stop that have visited the same customers have the same
+future, so the beam keeps only the better one; visited sets are compared by
+Zobrist hash (a random 64-bit key per slot, XORed along the route).
+
+Every partial route has visited the same number of customers, so the beam
+advances in lockstep, one customer per step. A partial route is a cons cell
+(slot, previous cell), so routes that share a prefix share its cells, and each
+keeps one visited bytearray; that is all the memory a route needs, O(beam * n)
+for the beam. Children aren't copied until they survive the cut. Each route's
+road neighbors are scored in one batch per step, as in the routers.
+
+Jumps (no unvisited neighbor) go to the best remaining customer anywhere, found
+in one GridIndex over all customers that is shared by the whole beam: customers
+the route has visited score -inf, and a customer is removed from the index once
+every route in the beam has visited it.
+"""
+import random
+from collections import Counter
+from typing import List, Optional, Tuple, Union
+
+from main import Node, Edge, calculate_travel_cost
+from adjacency import AdjacencyIndex, as_adjacency
+from scoring import argmax_first
+from route_building import (fallback_index, leg_distance, next_candidates, objective_scores,
+                            route_start, scoring_engine)
+
+INF = float('inf')
+
+
+class _State:
+    """A partial route: its last cell, running total and visited flags."""
+    __slots__ = ("path", "total", "visited", "key")
+
+    def __init__(self, path: tuple, total: float, visited: bytearray, key: int):
+        self.path = path            # (slot, previous path), () before the first customer
+        self.total = total
+        self.visited = visited
+        self.key = key              # hash of the visited set
+
+
+def beam_search_route(nodes: List[Node], depot: Node, edges: Union[List[Edge], AdjacencyIndex],
+                      objective: str = "driver", beam: int = 1, depth: int = 1) -> Tuple[List[Node], float]:
+    """
+    Greedy route that keeps the best `beam` partial routes, looking `depth` stops ahead.
+
+    Args:
+        nodes (List[Node]): All delivery locations including depot
+        depot (Node): The starting depot location
+        edges (List[Edge], AdjacencyIndex or RoadNetwork): All road connections between cities
+        objective (str): "company" (profit, Part A) or "driver" (earnings, Part B)
+        beam (int): Partial routes kept after each step
+        depth (int): Stops each candidate is valued over: itself plus a greedy
+            rollout of depth - 1 more (1: its own score only)
+
+    Returns:
+        Tuple[List[Node], float]: (route as list of nodes, total profit/earnings)
+    """
+    if objective not in ("company", "driver"):
+        raise ValueError(f"Unknown objective: {objective!r}")
+    if beam < 1 or depth < 1:
+        raise ValueError("beam and depth must be at least 1")
+
+    graph = as_adjacency(edges, nodes)
+    engine = scoring_engine(graph)
+    score_batch, values = objective_scores(graph, engine, objective)
+    customers, visited = route_start(graph, nodes)
+    unvisited = bytes(visited)
+    start = graph.slot_of[depot.id]
+    fallback = None
+
+    def best_move(here: int, visited: bytearray) -> Optional[Tuple[int, float]]:
+        """The router's next step from here: best neighbor, else the best jump; None when done."""
+        nonlocal fallback
+        candidates = next_candidates(graph, engine, here, visited)
+        if candidates:
+            scores = score_batch(here, candidates)
+            best = argmax_first(scores)
+            return candidates[best], scores[best]
+        if fallback is None:
+            # over every customer: other routes in the beam may not have visited these yet
+            fallback = fallback_index(engine, customers, unvisited, values)
+
+        def masked(slots: List[int]) -> List[float]:
+            live = iter(score_batch(here, [s for s in slots if not visited[s]]))
+            return [-INF if visited[s] else next(live) for s in slots]
+        best = fallback.best(engine.x[here], engine.y[here], masked)
+        if best is None:
+            return None
+        return best, score_batch(here, [best])[0]
+
+    def rollout(here: int, visited: bytearray, steps: int) -> float:
+        """Total of the next greedy steps from here (and the drive home if they run out)."""
+        gain, taken = 0.0, []
+        for _ in range(steps):
+            move = best_move(here, visited)
+            if move is None:
+                gain -= calculate_travel_cost(leg_distance(graph, graph.nodes[here], depot))
+                break
+            here, score = move
+            visited[here] = 1
+            taken.append(here)
+            gain += score
+        for slot in taken:
+            visited[slot] = 0
+        return gain
+
+    rng = random.Random(0)
+    zobrist = [rng.getrandbits(64) for _ in range(len(graph))]
+
+    states = [_State((), 0.0, visited, 0)]
+    for _ in range(len(customers)):
+        # (rank, parent, slot, score) for every child, in beam then neighbor order
+        children = []
+        for parent, state in enumerate(states):
+            here = state.path[0] if state.path else start
+            candidates = next_candidates(graph, engine, here, state.visited)
+            if candidates:
+                scores = score_batch(here, candidates)
+            else:
+                slot, score = best_move(here, state.visited)
+                candidates, scores = [slot], [score]
+            if parent == 0:
+                greedy = len(children) + argmax_first(scores)
+            for slot, score in zip(candidates, scores):
+                value = score
+                if depth > 1:
+                    state.visited[slot] = 1
+                    value += rollout(slot, state.visited, depth - 1)
+                    state.visited[slot] = 0
+                # the second key keeps beam=1 identical to argmax_first when adding
+                # the total rounds two values together
+                children.append(((state.total + value, value), parent, slot, score))
+
+        ranked = sorted(children, key=lambda child: child[0], reverse=True)
+        if beam > 1:
+            # states[0] always continues as the plain greedy route
+            ranked.insert(0, children[greedy])
+        survivors, seen = [], set()
+        for child in ranked:
+            _, parent, slot, _ = child
+            key = (slot, states[parent].key ^ zobrist[slot])
+            if key not in seen:
+                seen.add(key)
+                survivors.append(child)
+                if len(survivors) == beam:
+                    break
+        left = Counter(parent for _, parent, _, _ in survivors)
+        new_states = []
+        for _, parent, slot, score in survivors:
+            state = states[parent]
+            # a parent's last surviving child takes over its flags, the others get copies
+            left[parent] -= 1
+            flags = bytearray(state.visited) if left[parent] else state.visited
+            flags[slot] = 1
+            new_states.append(_State((slot, state.path), state.total + score, flags,
+                                     state.key ^ zobrist[slot]))
+        states = new_states
+        if fallback is not None:
+            for _, _, slot, _ in survivors:
+                if all(state.visited[slot] for state in states):
+                    fallback.remove(slot)
+
+    finals = []
+    for state in states:
+        last = graph.nodes[state.path[0]] if state.path else depot
+        finals.append(state.total - calculate_travel_cost(leg_distance(graph, last, depot)))
+    best = argmax_first(finals)
+
+    slots, path = [], states[best].path
+    while path:
+        slots.append(path[0])
+        path = path[1]
+    route = [depot] + [graph.nodes[slot] for slot in reversed(slots)] + [depot]
+    return route, finals[best]
@@ -0,0 +1,16 @@
+"""
+Greedy Algorithm Assignment - Benchmarks
+
+Seeded synthetic datasets shaped like mn_dataset.py (generators.py) and a standalone
+runner that times Parts A, B and C and writes the results as JSON (run.py):
+
+    python -m benchmarks.run --sizes 100 1000 10000 --out bench.json
+    python -m benchmarks.run --sizes 100 1000 10000 --compare bench.json
+
+load.py load-tests the dispatch service (dispatch_service.py) and reports tail latency:
+
+    python -m benchmarks.load --concurrency 1000 --requests 5000
+"""
+from benchmarks.generators import generate_dataset
+
+__all__ = ["generate_dataset"]
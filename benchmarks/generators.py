@@ -0,0 +1,91 @@
+"""
+Greedy Algorithm Assignment - Synthetic Datasets
+
+Seeded generators that scale the structure of mn_dataset.py up to any size:
+a depot at the origin, a downtown core, a suburban ring and a rural outer ring
+(with the fee/tip/priority ranges of the Minnesota nodes in each region), and a
+sparse corridor road network: customers are grouped into angular corridors, each
+corridor is a chain of roads running outward, the depot has a spoke to the start
+of every corridor, and a few cross roads join neighboring corridors.
+
+Radii grow with sqrt(n) so the density of stops stays close to the MN dataset.
+"""
+import math
+import random
+from typing import List, Tuple
+
+from main import Node, Edge
+
+# region: (share of customers, inner radius, outer radius, fee range, tip range, priorities)
+# Radii are for a 25-node graph like mn_dataset.py and scale with sqrt(n / 25).
+REGION_PROFILES = {
+    "downtown": (4 / 24, 5.0, 10.5, (10.3, 12.5), (2.6, 4.0), (2, 2, 3, 3)),
+    "suburban": (13 / 24, 8.0, 16.5, (11.2, 13.1), (2.7, 3.3), (2, 2, 3, 3, 3, 3, 3, 3, 3, 4, 4, 4, 4)),
+    "rural": (7 / 24, 17.0, 21.0, (14.5, 16.8), (2.0, 2.6), (3, 3, 4, 4, 4, 4, 5)),
+}
+
+
+def _region_counts(customers: int) -> List[Tuple[str, int]]:
+    counts = [(region, int(customers * profile[0])) for region, profile in REGION_PROFILES.items()]
+    # give the rounding remainder to the suburbs, the largest region
+    short = customers - sum(count for _, count in counts)
+    return [(region, count + short if region == "suburban" else count) for region, count in counts]
+
+
+def generate_dataset(n: int, seed: int = 0, cross_road_rate: float = 0.25) -> Tuple[List[Node], Node, List[Edge]]:
+    """
+    Build a synthetic dataset with n nodes (1 depot + n - 1 customers).
+
+    Args:
+        n (int): Total number of nodes, at least 2
+        seed (int): Random seed; the same (n, seed) always gives the same dataset
+        cross_road_rate (float): Expected cross roads between corridors per customer
+
+    Returns:
+        Tuple[List[Node], Node, List[Edge]]: (nodes with the depot first, depot, edges)
+    """
+    if n < 2:
+        raise ValueError("A dataset needs a depot and at least one customer")
+    rng = random.Random(seed)
+    scale = math.sqrt(n / 25.0)
+
+    depot = Node(0, 0.0, 0.0, delivery_fee=0.0, estimated_tip=0.0,
+                 region="downtown", priority=1, is_depot=True)
+    nodes = [depot]
+    for region, count in _region_counts(n - 1):
+        _, r_in, r_out, fee_range, tip_range, priorities = REGION_PROFILES[region]
+        for _ in range(count):
+            # uniform over the ring's area
+            radius = scale * math.sqrt(rng.uniform(r_in ** 2, r_out ** 2))
+            angle = rng.uniform(0.0, 2.0 * math.pi)
+            nodes.append(Node(len(nodes),
+                              round(radius * math.cos(angle), 2), round(radius * math.sin(angle), 2),
+                              delivery_fee=round(rng.uniform(*fee_range), 2),
+                              estimated_tip=round(rng.uniform(*tip_range), 2),
+                              region=region, priority=rng.choice(priorities), is_depot=False))
+
+    # Corridors: angular sectors, each a chain of roads running outward from the depot
+    corridors = max(6, int(math.sqrt(n) / 2))
+    sectors: List[List[Node]] = [[] for _ in range(corridors)]
+    for node in nodes[1:]:
+        angle = math.atan2(node.y, node.x) % (2.0 * math.pi)
+        sectors[min(int(angle / (2.0 * math.pi) * corridors), corridors - 1)].append(node)
+
+    edges = []
+    for sector in sectors:
+        sector.sort(key=lambda node: node.x ** 2 + node.y ** 2)
+        if sector:
+            edges.append(Edge(depot, sector[0]))
+        edges.extend(Edge(a, b) for a, b in zip(sector, sector[1:]))
+
+    # Cross roads between a stop and a stop at a similar radius in the next corridor
+    for i, sector in enumerate(sectors):
+        neighbor = sectors[(i + 1) % corridors]
+        if not sector or not neighbor or neighbor is sector:
+            continue
+        for k, node in enumerate(sector):
+            if rng.random() < cross_road_rate:
+                # both sectors are sorted by radius, so the same relative position is about as far out
+                j = min(int((k + rng.random()) * len(neighbor) / len(sector)), len(neighbor) - 1)
+                edges.append(Edge(node, neighbor[j]))
+    return nodes, depot, edges
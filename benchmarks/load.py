@@ -0,0 +1,210 @@
+"""
+Greedy Algorithm Assignment - Dispatch Service Load Generator
+
+Fires route requests at a DispatchService from many concurrent clients and
+reports throughput and tail latency as JSON.
+
+Usage:
+    python -m benchmarks.load --size 200 --concurrency 1000 --requests 5000
+    python -m benchmarks.load --api python --concurrency 1000
+    python -m benchmarks.load --target 127.0.0.1:8080 --concurrency 1000
+
+By default a service and its HTTP endpoint run in this process on a synthetic
+dataset; --target points the clients at a server started separately instead
+(python dispatch_service.py --dataset FILE, with FILE holding the same
+generate_dataset(--size, --seed) written by dataset_file.write_dataset). Each HTTP client holds one keep-alive
+connection, so --concurrency is also the number of open connections. Jobs are
+routes over random subsets of --stops customers; --repeat-rate of them repeat an
+earlier job, which the service's batching plans only once.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from benchmarks.generators import generate_dataset
+from batch_planner import RouteJob
+from dispatch_service import DispatchService, ServiceOverloaded, percentile, serve_http
+
+OBJECTIVES = (("company", None), ("driver", None), ("ethical", "fairness"),
+              ("ethical", "fatigue"), ("ethical", "priority"))
+
+
+def make_jobs(nodes, depot, count: int, stops: int = 20, repeat_rate: float = 0.2,
+              seed: int = 0) -> List[RouteJob]:
+    """
+    Random route requests over one dataset.
+
+    Args:
+        nodes (List[Node]): All locations
+        depot (Node): Depot every route starts from
+        count (int): Number of jobs
+        stops (int): Customers per route
+        repeat_rate (float): Share of jobs that copy an earlier job
+        seed (int): Random seed
+
+    Returns:
+        List[RouteJob]: The jobs
+    """
+    rng = random.Random(seed)
+    customers = [node.id for node in nodes if not node.is_depot]
+    stops = min(stops, len(customers))
+    jobs = []
+    for _ in range(count):
+        if jobs and rng.random() < repeat_rate:
+            jobs.append(rng.choice(jobs))
+            continue
+        objective, rule = rng.choice(OBJECTIVES)
+        jobs.append(RouteJob(depot.id, objective, tuple(rng.sample(customers, stops)), rule))
+    return jobs
+
+
+def _summary(latencies: List[float], statuses: Counter, seconds: float, concurrency: int) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "requests": sum(statuses.values()),
+        "concurrency": concurrency,
+        "seconds": seconds,
+        "throughput": len(ordered) / seconds if seconds else 0.0,
+        "statuses": {str(status): n for status, n in sorted(statuses.items())},
+        "p50": percentile(ordered, 50),
+        "p95": percentile(ordered, 95),
+        "p99": percentile(ordered, 99),
+        "max": ordered[-1] if ordered else 0.0,
+    }
+
+
+async def _http_client(host: str, port: int, jobs: List[RouteJob], next_job, latencies: List[float],
+                       statuses: Counter):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            index = next_job()
+            if index is None:
+                return
+            job = jobs[index]
+            body = json.dumps({"depot_id": job.depot_id, "objective": job.objective,
+                               "customer_ids": job.customer_ids, "ethical_rule": job.ethical_rule}).encode()
+            start = time.perf_counter()
+            writer.write(b"POST /route HTTP/1.1\r\nHost: %s\r\nContent-Type: application/json\r\n"
+                         b"Content-Length: %d\r\n\r\n%s" % (host.encode(), len(body), body))
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            statuses[status] += 1
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def _api_client(service: DispatchService, jobs: List[RouteJob], next_job, latencies: List[float],
+                      statuses: Counter):
+    while True:
+        index = next_job()
+        if index is None:
+            return
+        start = time.perf_counter()
+        try:
+            await service.plan(jobs[index])
+        except ServiceOverloaded:
+            statuses[503] += 1
+            continue
+        statuses[200] += 1
+        latencies.append(time.perf_counter() - start)
+
+
+async def run_load(jobs: List[RouteJob], concurrency: int, target: Optional[Tuple[str, int]] = None,
+                   service: Optional[DispatchService] = None) -> dict:
+    """
+    Send every job from `concurrency` concurrent clients and time them.
+
+    Args:
+        jobs (List[RouteJob]): Requests to send (each once)
+        concurrency (int): Concurrent clients (and HTTP connections)
+        target (Tuple[str, int], optional): HTTP host and port to send to
+        service (DispatchService, optional): Started service to call directly instead
+
+    Returns:
+        dict: requests, concurrency, seconds, throughput, statuses, p50, p95, p99, max
+            (latencies in seconds, successful requests only)
+    """
+    if (target is None) == (service is None):
+        raise ValueError("Give exactly one of target and service")
+    remaining = iter(range(len(jobs)))
+    next_job = lambda: next(remaining, None)
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    if service is not None:
+        clients = [_api_client(service, jobs, next_job, latencies, statuses) for _ in range(concurrency)]
+    else:
+        clients = [_http_client(*target, jobs, next_job, latencies, statuses) for _ in range(concurrency)]
+    start = time.perf_counter()
+    await asyncio.gather(*clients)
+    return _summary(latencies, statuses, time.perf_counter() - start, concurrency)
+
+
+async def _main(args) -> dict:
+    if args.target:
+        host, _, port = args.target.rpartition(":")
+        nodes, depot, _ = generate_dataset(args.size, seed=args.seed)
+        jobs = make_jobs(nodes, depot, args.requests, args.stops, args.repeat_rate, args.seed)
+        return {"load": await run_load(jobs, args.concurrency, target=(host, int(port)))}
+
+    nodes, depot, edges = generate_dataset(args.size, seed=args.seed)
+    jobs = make_jobs(nodes, depot, args.requests, args.stops, args.repeat_rate, args.seed)
+    async with DispatchService(nodes, edges, workers=args.workers, max_batch=args.max_batch,
+                               batch_window_ms=args.window_ms, max_pending=args.max_pending) as service:
+        if args.api == "python":
+            result = await run_load(jobs, args.concurrency, service=service)
+        else:
+            server = await serve_http(service, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            result = await run_load(jobs, args.concurrency, target=("127.0.0.1", port))
+            server.close()
+            await server.wait_closed()
+        return {"load": result, "service": service.stats()}
+
+
+def main(argv: Optional[List[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description="Load-test the dispatch service.")
+    parser.add_argument("--size", type=int, default=200, help="nodes in the synthetic dataset")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=1000)
+    parser.add_argument("--stops", type=int, default=20, help="customers per requested route")
+    parser.add_argument("--repeat-rate", type=float, default=0.2)
+    parser.add_argument("--api", choices=("http", "python"), default="http")
+    parser.add_argument("--target", help="host:port of a running server (default: start one here)")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--window-ms", type=float, default=1.0)
+    parser.add_argument("--max-pending", type=int, default=1024)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(_main(args))
+    report["meta"] = {"argv": sys.argv[1:] if argv is None else list(argv), "python": sys.version.split()[0]}
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Greedy Algorithm Assignment - Benchmark Runner
+
+Times Parts A, B and C on synthetic datasets and writes the results as JSON.
+
+Usage:
+    python -m benchmarks.run --sizes 100 1000 10000 --out bench.json
+    python -m benchmarks.run --sizes 100 1000 --compare bench.json
+
+Each result records the best and mean wall-clock time over --repeat runs, plus the
+route total, so a later run can be compared against a saved baseline both for speed
+and for unchanged output.
+
+    python -m benchmarks.run --sizes 1000 --parts A B --beam 4 2 --beam 8 3
+
+also times the beam-search routers (beam_search.py) for each WIDTH DEPTH given, and
+records the extra profit and the extra time relative to the greedy route.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from benchmarks.generators import generate_dataset
+from greedy_approach import greedy_company_route, greedy_driver_route, greedy_ethical_route
+from beam_search import beam_search_route
+from policies import ETHICAL_RULES
+
+
+def _time_call(fn, repeat: int):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return times, result
+
+
+def run_benchmarks(sizes: List[int], parts: List[str], repeat: int = 3, seed: int = 0,
+                   rules=tuple(ETHICAL_RULES), beams: Sequence[Tuple[int, int]] = ()) -> List[dict]:
+    """
+    Time the requested parts on a synthetic dataset of each size.
+
+    Args:
+        sizes (List[int]): Dataset sizes (total nodes)
+        parts (List[str]): Any of "A", "B", "C"
+        repeat (int): Runs per measurement
+        seed (int): Dataset seed
+        rules: Ethical rules to time for Part C
+        beams (Sequence[Tuple[int, int]]): (width, depth) of beam-search runs to time for Parts A and B
+
+    Returns:
+        List[dict]: One record per (size, part, rule) measurement
+    """
+    records = []
+    for size in sizes:
+        start = time.perf_counter()
+        nodes, depot, edges = generate_dataset(size, seed=seed)
+        build_seconds = time.perf_counter() - start
+
+        cases = []
+        if "A" in parts:
+            cases.append(("A", None, None, lambda: greedy_company_route(nodes, depot, edges)))
+        if "B" in parts:
+            cases.append(("B", None, None, lambda: greedy_driver_route(nodes, depot, edges)))
+        if "C" in parts:
+            for rule in rules:
+                cases.append(("C", rule, None,
+                              lambda rule=rule: greedy_ethical_route(nodes, depot, edges, rule)))
+        for part, objective in (("A", "company"), ("B", "driver")):
+            if part in parts:
+                for beam in beams:
+                    cases.append((part, None, beam, lambda objective=objective, beam=beam:
+                                  beam_search_route(nodes, depot, edges, objective, *beam)))
+
+        greedy = {}
+        for part, rule, beam, fn in cases:
+            times, (route, total) = _time_call(fn, repeat)
+            record = {
+                "size": size,
+                "edges": len(edges),
+                "part": part,
+                "rule": rule,
+                "seconds_min": min(times),
+                "seconds_mean": sum(times) / len(times),
+                "dataset_seconds": build_seconds,
+                "total": total,
+                "stops": len(route),
+            }
+            label = f"{part}" + (f" ({rule})" if rule else "")
+            if beam is None:
+                greedy[part] = record
+            else:
+                base = greedy[part]
+                record.update(beam=beam[0], depth=beam[1], greedy_total=base["total"],
+                              total_gain=total - base["total"],
+                              cpu_ratio=min(times) / base["seconds_min"] if base["seconds_min"] else None)
+                label += f" beam={beam[0]}x{beam[1]}"
+            records.append(record)
+            gain = f"  gain={record['total_gain']:+.2f}" if beam else ""
+            print(f"n={size:>8}  {label:<14} {min(times):9.4f}s  total={total:.2f}{gain}", file=sys.stderr)
+    return records
+
+
+def _key(record: dict):
+    return record["size"], record["part"], record["rule"], record.get("beam"), record.get("depth")
+
+
+def compare(records: List[dict], baseline: List[dict]) -> List[dict]:
+    """
+    Add speedup and output-change fields to each record that has a baseline match.
+
+    speedup is baseline seconds_min / current seconds_min (above 1.0 is faster);
+    total_changed flags a route total that differs from the baseline's.
+    """
+    by_key: Dict[tuple, dict] = {_key(r): r for r in baseline}
+    for record in records:
+        base = by_key.get(_key(record))
+        if base is None:
+            continue
+        record["baseline_seconds_min"] = base["seconds_min"]
+        record["speedup"] = base["seconds_min"] / record["seconds_min"] if record["seconds_min"] else None
+        record["total_changed"] = base["total"] != record["total"]
+    return records
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Time the greedy routers on synthetic datasets.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000],
+                        help="dataset sizes in nodes (up to 1000000)")
+    parser.add_argument("--parts", nargs="+", default=["A", "B", "C"], choices=["A", "B", "C"])
+    parser.add_argument("--rules", nargs="+", default=list(ETHICAL_RULES), choices=list(ETHICAL_RULES))
+    parser.add_argument("--beam", type=int, nargs=2, action="append", default=[], metavar=("WIDTH", "DEPTH"),
+                        help="also time beam search with this width and lookahead depth (repeatable)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write JSON here (default: stdout)")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run")
+    args = parser.parse_args(argv)
+
+    records = run_benchmarks(args.sizes, args.parts, args.repeat, args.seed, args.rules,
+                             [tuple(beam) for beam in args.beam])
+    if args.compare:
+        with open(args.compare) as f:
+            compare(records, json.load(f)["results"])
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": records,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
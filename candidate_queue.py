@@ -0,0 +1,133 @@
+"""
+Greedy Algorithm Assignment - Incremental Candidate Selection
+
+Company profit and driver earnings for a move u -> v depend only on u and v, so
+each node's scored neighbors never change. This file keeps them in a heap per
+node (built the first time the node is the current stop, then reused by every
+later route over the same graph) and drops visited candidates lazily, only when
+they reach the top of a heap.
+
+Heap entries are (-score, rank, slot) where rank is the candidate's position in
+the neighbor list, so ties go to the first neighbor exactly like a plain scan.
+
+Within a single route every node is the current stop at most once, so the heaps
+only pay off when the same graph is routed again (prebuilt AdjacencyIndex, many
+depots, re-planning). ScanQueue offers the same interface without any caching
+for one-off routes.
+"""
+from heapq import heapify, heappop
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from adjacency import AdjacencyIndex
+from scoring import argmax_first
+
+Entry = Tuple[float, int, int]
+
+
+class FrontierCache:
+    """
+    Scored neighbor heaps for one objective, shared across routes on the same graph.
+
+    The heaps are snapshots of the node attributes at the time they were built;
+    clear graph.cache if nodes are edited.
+    """
+
+    def __init__(self, graph: AdjacencyIndex, is_depot: Sequence[int],
+                 score_batch: Callable[[int, List[int]], List[float]]):
+        self._graph = graph
+        self._is_depot = is_depot
+        self._score_batch = score_batch
+        self._heaps: Dict[int, List[Entry]] = {}
+
+    def heap(self, slot: int) -> List[Entry]:
+        """
+        Heap of the customer neighbors of a slot, best first (do not modify).
+
+        Args:
+            slot (int): Slot of the current node
+
+        Returns:
+            List[Entry]: Heap-ordered (-score, rank, neighbor slot) entries
+        """
+        heap = self._heaps.get(slot)
+        if heap is None:
+            is_depot = self._is_depot
+            candidates = [s for s in self._graph.neighbor_slots_of(slot) if not is_depot[s]]
+            neg_scores = [-score for score in self._score_batch(slot, candidates)]
+            heap = list(zip(neg_scores, range(len(candidates)), candidates))
+            heapify(heap)
+            self._heaps[slot] = heap
+        return heap
+
+    def __len__(self):
+        return len(self._heaps)
+
+
+class CandidateQueue:
+    """
+    One route's view of a FrontierCache, with lazy deletion of visited candidates.
+
+    Visited only ever grows during a route, so an entry popped for being
+    visited never has to come back.
+    """
+
+    def __init__(self, cache: FrontierCache, visited: bytearray):
+        self._cache = cache
+        self._visited = visited
+        self._open: Dict[int, List[Entry]] = {}
+
+    def best(self, current: int) -> Optional[Tuple[int, float]]:
+        """
+        Best unvisited customer neighbor of the current slot.
+
+        Args:
+            current (int): Slot of the current node
+
+        Returns:
+            Optional[Tuple[int, float]]: (slot, score), or None if every neighbor is visited
+        """
+        heap = self._open.get(current)
+        if heap is None:
+            heap = list(self._cache.heap(current))
+            self._open[current] = heap
+        visited = self._visited
+        while heap and visited[heap[0][2]]:
+            heappop(heap)
+        if not heap:
+            return None
+        neg_score, _, slot = heap[0]
+        return slot, -neg_score
+
+
+class ScanQueue:
+    """
+    CandidateQueue interface that scores the unvisited neighbors afresh on every call.
+
+    Cheaper than building heaps when the graph is only routed once.
+    """
+
+    def __init__(self, graph: AdjacencyIndex, is_depot: Sequence[int],
+                 score_batch: Callable[[int, List[int]], List[float]], visited: bytearray):
+        self._graph = graph
+        self._is_depot = is_depot
+        self._score_batch = score_batch
+        self._visited = visited
+
+    def best(self, current: int) -> Optional[Tuple[int, float]]:
+        """
+        Best unvisited customer neighbor of the current slot.
+
+        Args:
+            current (int): Slot of the current node
+
+        Returns:
+            Optional[Tuple[int, float]]: (slot, score), or None if every neighbor is visited
+        """
+        visited, is_depot = self._visited, self._is_depot
+        candidates = [s for s in self._graph.neighbor_slots_of(current)
+                      if not visited[s] and not is_depot[s]]
+        if not candidates:
+            return None
+        scores = self._score_batch(current, candidates)
+        best = argmax_first(scores)
+        return candidates[best], scores[best]
@@ -0,0 +1,145 @@
+"""
+Greedy Algorithm Assignment - Columnar Dataset Files
+
+mn_dataset.py builds its Node and Edge objects when it is imported, which every
+worker process has to repeat and which doesn't scale past a few thousand nodes.
+This file contains a binary on-disk format holding the NodeTable/EdgeTable
+columns as they are laid out in memory, a writer, and a reader that memory-maps
+the file and hands the columns to the tables without copying them.
+
+Layout (all offsets in bytes):
+    0   magic b"GRDYCOL1"
+    8   header length, uint64 little-endian
+    16  header: UTF-8 JSON with the node and edge counts, region names, byte
+        order and, per column, its typecode, offset (from the data section) and size
+    ..  data section, starting at the next multiple of 8: the node columns (ids,
+        x, y, delivery_fee, estimated_tip, window_start, window_end, service_time,
+        priority, is_depot, region_code) then
+        the edge endpoint rows (u_rows, v_rows), each aligned to 8 bytes
+
+Opening a file only parses the header, so it takes the same few milliseconds
+whatever the size; pages are read on first access and are shared by every
+process that maps the same file.
+
+Version 1 files have no time-window columns; they still load, with every node
+open at all times and no service time.
+"""
+import json
+import mmap
+import struct
+import sys
+from array import array
+from typing import List, Tuple, Union
+
+from main import Node, Edge
+from node_table import NodeTable, EdgeTable
+
+MAGIC = b"GRDYCOL1"
+VERSION = 2
+NODE_COLUMNS = (("ids", "q"), ("x", "d"), ("y", "d"), ("delivery_fee", "d"), ("estimated_tip", "d"),
+                ("window_start", "d"), ("window_end", "d"), ("service_time", "d"),
+                ("priority", "b"), ("is_depot", "B"), ("region_code", "B"))
+# node columns added after version 1, and the value a version 1 file implies for them
+WINDOW_DEFAULTS = {"window_start": 0.0, "window_end": float("inf"), "service_time": 0.0}
+EDGE_COLUMNS = (("u_rows", "q"), ("v_rows", "q"))
+
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def write_dataset(path: str, nodes: Union[List[Node], NodeTable], edges: Union[List[Edge], EdgeTable]):
+    """
+    Write nodes and edges to a columnar dataset file.
+
+    Args:
+        path (str): File to create (overwritten if it exists)
+        nodes (List[Node] or NodeTable): All locations, depots included
+        edges (List[Edge] or EdgeTable): Roads between those locations
+    """
+    table = nodes if isinstance(nodes, NodeTable) else NodeTable.from_nodes(nodes)
+    if isinstance(edges, EdgeTable):
+        if edges.nodes is not table:
+            raise ValueError("EdgeTable must refer to the NodeTable being written")
+        edge_table = edges
+    else:
+        edge_table = EdgeTable.from_edges(edges, table)
+
+    columns = [(name, code, getattr(table, name)) for name, code in NODE_COLUMNS]
+    columns += [(name, code, getattr(edge_table, name)) for name, code in EDGE_COLUMNS]
+    layout, offset = {}, 0
+    for name, code, column in columns:
+        size = len(column) * array(code).itemsize
+        layout[name] = [code, offset, size]
+        offset = _aligned(offset + size)
+
+    header = json.dumps({
+        "version": VERSION,
+        "byteorder": sys.byteorder,
+        "nodes": len(table),
+        "edges": len(edge_table),
+        "regions": table.regions,
+        "columns": layout,
+    }).encode("utf-8")
+    data_start = _aligned(16 + len(header))
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        f.write(b"\0" * (data_start - 16 - len(header)))
+        for name, code, column in columns:
+            size = layout[name][2]
+            f.write(column)
+            f.write(b"\0" * (_aligned(size) - size))
+
+
+def load_dataset(path: str, copy: bool = False) -> Tuple[NodeTable, EdgeTable]:
+    """
+    Open a columnar dataset file.
+
+    Args:
+        path (str): File written by write_dataset
+        copy (bool): Read the columns into ordinary (writable) arrays instead of mapping them
+
+    Returns:
+        Tuple[NodeTable, EdgeTable]: Tables over the file's columns; read-only unless copy
+            (or the file was written on a machine with the other byte order)
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    buffer = memoryview(mapped)
+    if bytes(buffer[:8]) != MAGIC:
+        raise ValueError(f"{path} is not a columnar dataset file")
+    (header_length,) = struct.unpack_from("<Q", buffer, 8)
+    header = json.loads(bytes(buffer[16:16 + header_length]).decode("utf-8"))
+    if header["version"] not in (1, VERSION):
+        raise ValueError(f"Unsupported dataset file version: {header['version']}")
+    data_start = _aligned(16 + header_length)
+    swap = header["byteorder"] != sys.byteorder
+
+    def column(name: str):
+        code, offset, size = header["columns"][name]
+        raw = buffer[data_start + offset:data_start + offset + size]
+        if not (copy or swap):
+            return raw.cast(code)
+        values = array(code)
+        values.frombytes(raw)
+        if swap:
+            values.byteswap()
+        return bytearray(values) if name == "is_depot" else values
+
+    nodes = NodeTable(header["regions"])
+    for name, code in NODE_COLUMNS:
+        if name in header["columns"]:
+            setattr(nodes, name, column(name))
+        else:
+            setattr(nodes, name, array(code, [WINDOW_DEFAULTS[name]]) * header["nodes"])
+    nodes._row_of = None
+    edges = EdgeTable(nodes)
+    for name, _ in EDGE_COLUMNS:
+        setattr(edges, name, column(name))
+    if copy or swap:
+        buffer.release()
+        mapped.close()
+    return nodes, edges
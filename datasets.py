@@ -0,0 +1,136 @@
+"""
+Greedy Algorithm Assignment - Dataset Registry
+
+mn_dataset.py builds every Node and Edge when it is imported. This file maps
+dataset names to loaders instead, and only runs a loader the first time its
+dataset is asked for; the result (and the AdjacencyIndex built from it) is then
+cached for the rest of the process. Importing this file loads no dataset
+module, so start-up time doesn't depend on which datasets exist or how big
+they are, and forked workers inherit whatever their parent already loaded.
+
+Built-in names:
+    "mn"                 the Minnesota dataset (mn_dataset.py)
+    "synthetic-<n>"      benchmarks.generators.generate_dataset(n, seed=0)
+    any file path        a columnar dataset file (dataset_file.py), memory-mapped
+
+    nodes, depot, edges = get_dataset("mn")
+    graph = get_graph("/data/state.gcol")
+"""
+import os
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+from main import Node, Edge
+from adjacency import AdjacencyIndex
+
+
+class Dataset(NamedTuple):
+    """
+    A loaded dataset.
+
+    Attributes:
+        nodes (List[Node]): All locations, depots included
+        depot (Node): The (first) depot
+        edges (List[Edge]): All road connections
+    """
+    nodes: List[Node]
+    depot: Node
+    edges: List[Edge]
+
+
+Loader = Callable[[], Tuple[List[Node], Node, List[Edge]]]
+
+_loaders: Dict[str, Loader] = {}
+_datasets: Dict[str, Dataset] = {}
+_graphs: Dict[str, AdjacencyIndex] = {}
+
+
+def register(name: str, loader: Loader, replace: bool = False):
+    """
+    Register a dataset loader. Nothing is loaded until the dataset is first used.
+
+    Args:
+        name (str): Dataset name
+        loader (Callable): Returns (nodes, depot, edges)
+        replace (bool): Allow replacing an existing registration (drops its cached copy)
+    """
+    if name in _loaders and not replace:
+        raise ValueError(f"Dataset already registered: {name!r}")
+    _loaders[name] = loader
+    _datasets.pop(name, None)
+    _graphs.pop(name, None)
+
+
+def register_file(name: str, path: str, replace: bool = False):
+    """Register a columnar dataset file under a name (memory-mapped on first use)."""
+    register(name, lambda: _load_file(path), replace)
+
+
+def names() -> List[str]:
+    """Registered dataset names (file paths and synthetic-<n> are accepted as well)."""
+    return sorted(_loaders)
+
+
+def _load_mn() -> Tuple[List[Node], Node, List[Edge]]:
+    import mn_dataset
+    return mn_dataset.MN_NODES, mn_dataset.MN_DEPOT, mn_dataset.MN_EDGES
+
+
+def _load_file(path: str) -> Tuple[List[Node], Node, List[Edge]]:
+    from dataset_file import load_dataset
+    node_table, edge_table = load_dataset(path)
+    return node_table.views(), node_table.depot(), list(edge_table)
+
+
+def _loader_for(name: str) -> Loader:
+    loader = _loaders.get(name)
+    if loader is not None:
+        return loader
+    if name.startswith("synthetic-") and name[len("synthetic-"):].isdigit():
+        from benchmarks.generators import generate_dataset
+        size = int(name[len("synthetic-"):])
+        return lambda: generate_dataset(size, seed=0)
+    if os.path.exists(name):
+        return lambda: _load_file(name)
+    raise KeyError(f"Unknown dataset: {name!r}")
+
+
+def get_dataset(name: str) -> Dataset:
+    """
+    The dataset with the given name, loaded on first use and cached per process.
+
+    Args:
+        name (str): A registered name, "synthetic-<n>" or a dataset file path
+
+    Returns:
+        Dataset: (nodes, depot, edges)
+    """
+    dataset = _datasets.get(name)
+    if dataset is None:
+        dataset = _datasets[name] = Dataset(*_loader_for(name)())
+    return dataset
+
+
+def get_graph(name: str) -> AdjacencyIndex:
+    """
+    AdjacencyIndex of a dataset, built on first use and cached per process.
+
+    Args:
+        name (str): As for get_dataset
+
+    Returns:
+        AdjacencyIndex: Neighbor index over the dataset's nodes and edges
+    """
+    graph = _graphs.get(name)
+    if graph is None:
+        dataset = get_dataset(name)
+        graph = _graphs[name] = AdjacencyIndex(dataset.edges, dataset.nodes)
+    return graph
+
+
+def clear_cache():
+    """Forget every loaded dataset and graph (registrations stay)."""
+    _datasets.clear()
+    _graphs.clear()
+
+
+register("mn", _load_mn)
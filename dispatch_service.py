@@ -0,0 +1,399 @@
+"""
+Greedy Algorithm Assignment - Asyncio Dispatch Service
+
+This file puts the route planners behind a long-running asyncio service instead
+of the one-shot run_mn_data() script. Requests (batch_planner.RouteJob) go into a
+bounded in-process queue; a batcher takes whatever has queued up (after waiting
+batch_window_ms for more to arrive), plans identical jobs only once, and hands the
+batch to an executor so the event loop keeps accepting requests while routes are
+being planned.
+
+    async with DispatchService(nodes, edges) as service:
+        result = await service.plan(RouteJob(depot.id, "driver"))
+
+Executors:
+    workers=1  one planning thread over a graph built in this process; the
+               AdjacencyIndex's frontier caches stay warm across requests
+    workers>1  a process pool whose workers build the graph once (batch_planner's
+               initializer); batches run in parallel, one per worker
+
+Backpressure: at most max_pending requests wait in the queue and at most one batch
+per worker is in flight; plan() raises ServiceOverloaded (HTTP 503) beyond that
+instead of letting latency grow without bound. Requests still queued when the
+service closes fail with ServiceClosed (also HTTP 503). Latencies (enqueue to
+result) of the last LATENCY_WINDOW requests are kept for stats().
+
+serve_http() exposes the service over a minimal HTTP/1.1 endpoint (keep-alive, JSON):
+    POST /route  {"depot_id": 0, "objective": "driver", "customer_ids": [...], "ethical_rule": null}
+                 -> {"route": [node ids], "total": float}
+    GET  /stats  -> stats()
+Malformed requests get 400 and bodies over max_body bytes get 413; both close the
+connection.
+
+    python dispatch_service.py --port 8080 [--dataset graph.grdy] [--workers 4]
+
+benchmarks/load.py drives it with many concurrent keep-alive connections and
+reports tail latency.
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+from main import Node, Edge
+from adjacency import AdjacencyIndex
+from datasets import get_dataset
+from batch_planner import RouteJob, RouteResult, check_job, init_worker, plan_job, worker_graph
+
+LATENCY_WINDOW = 100_000
+MAX_BODY_BYTES = 1 << 20
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large",
+                500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class ServiceOverloaded(Exception):
+    """Raised by DispatchService.plan when the request queue is full."""
+
+
+class ServiceClosed(Exception):
+    """Raised for requests still queued when the DispatchService shuts down."""
+
+
+def _plan_batch(graph: AdjacencyIndex, jobs: List[RouteJob]) -> List[object]:
+    """Plan each job; a job that fails gives its exception instead of failing the batch."""
+    planned = []
+    for job in jobs:
+        try:
+            planned.append(plan_job(graph, job))
+        except Exception as error:      # whatever one job raises is that job's failure only
+            planned.append(error)
+    return planned
+
+
+def _plan_batch_in_worker(jobs: List[RouteJob]) -> List[object]:
+    return _plan_batch(worker_graph(), jobs)
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """
+    Nearest-rank percentile of an ascending list.
+
+    Args:
+        ordered (List[float]): Values in ascending order
+        q (float): Percentile, 0-100
+
+    Returns:
+        float: The value at that rank (0.0 for an empty list)
+    """
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q / 100.0 * len(ordered)))]
+
+
+class DispatchService:
+    """
+    Micro-batching route planning service over one shared graph.
+
+    Attributes:
+        nodes (List[Node]): All locations the jobs refer to
+        max_batch (int): Most jobs planned per executor call
+        batch_window (float): Seconds the batcher waits for more requests before a batch
+        max_pending (int): Queue length beyond which plan() raises ServiceOverloaded
+        workers (int): Executor size, and the number of batches in flight
+    """
+
+    def __init__(self, nodes: List[Node], edges: List[Edge], workers: int = 1, max_batch: int = 64,
+                 batch_window_ms: float = 1.0, max_pending: int = 1024):
+        if workers < 1 or max_batch < 1 or max_pending < 1:
+            raise ValueError("workers, max_batch and max_pending must be at least 1")
+        self.nodes = nodes
+        self.max_batch = max_batch
+        self.batch_window = batch_window_ms / 1000.0
+        self.max_pending = max_pending
+        self.workers = workers
+        self._edges = edges
+        self._by_id: Dict[int, Node] = {node.id: node for node in nodes}
+        self._executor: Optional[Executor] = None
+        self._run = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._in_flight: set = set()
+        self._latencies: deque = deque(maxlen=LATENCY_WINDOW)
+        self._counts = {"completed": 0, "failed": 0, "rejected": 0, "batches": 0,
+                        "batched_jobs": 0, "planned_jobs": 0}
+
+    async def start(self):
+        """Create the executor and start the batcher (done by async with)."""
+        if self._batcher is not None:
+            return
+        if self.workers == 1:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="planner")
+            self._run = partial(_plan_batch, AdjacencyIndex(self._edges, self.nodes))
+        else:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker,
+                                                 initargs=(self.nodes, self._edges))
+            self._run = _plan_batch_in_worker
+        self._queue = asyncio.Queue(self.max_pending)
+        self._slots = asyncio.Semaphore(self.workers)
+        self._batcher = asyncio.get_running_loop().create_task(self._batch_loop())
+
+    async def close(self):
+        """Finish the batches already running, fail queued requests and shut the executor down."""
+        if self._batcher is None:
+            return
+        self._batcher.cancel()
+        try:
+            await self._batcher
+        except asyncio.CancelledError:
+            pass
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        while not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(ServiceClosed("Service closed"))
+        self._executor.shutdown(wait=True)
+        self._batcher = None
+
+    async def __aenter__(self) -> "DispatchService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def plan(self, job: RouteJob) -> RouteResult:
+        """
+        Plan one route.
+
+        Args:
+            job (RouteJob): Route to plan
+
+        Returns:
+            RouteResult: The route, with the nodes passed to the service
+
+        Raises:
+            ServiceOverloaded: If max_pending requests are already queued
+            ServiceClosed: If the service shuts down before the job is planned
+            ValueError, KeyError: For an invalid job or unknown node ids
+        """
+        if self._batcher is None:
+            raise RuntimeError("DispatchService is not started")
+        check_job(job)
+        if job.customer_ids is not None and not isinstance(job.customer_ids, tuple):
+            job = job._replace(customer_ids=tuple(job.customer_ids))
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((job, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            self._counts["rejected"] += 1
+            raise ServiceOverloaded(f"{self.max_pending} requests already queued") from None
+        route_ids, total = await future
+        return RouteResult(job, [self._by_id[node_id] for node_id in route_ids], total)
+
+    async def _batch_loop(self):
+        queue = self._queue
+        batch = []
+        try:
+            while True:
+                batch = [await queue.get()]
+                if queue.qsize() < self.max_batch - 1:
+                    # let requests arriving at about the same time join this batch
+                    await asyncio.sleep(self.batch_window)
+                while len(batch) < self.max_batch and not queue.empty():
+                    batch.append(queue.get_nowait())
+                await self._slots.acquire()
+                task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+                self._in_flight.add(task)
+                task.add_done_callback(self._in_flight.discard)
+                batch = []
+        except asyncio.CancelledError:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(ServiceClosed("Service closed"))
+            raise
+
+    async def _run_batch(self, batch: List[Tuple[RouteJob, asyncio.Future, float]]):
+        try:
+            unique = list(dict.fromkeys(job for job, _, _ in batch))
+            counts = self._counts
+            counts["batches"] += 1
+            counts["batched_jobs"] += len(batch)
+            counts["planned_jobs"] += len(unique)
+            try:
+                planned = await asyncio.get_running_loop().run_in_executor(self._executor, self._run, unique)
+            except Exception as error:          # executor failure (e.g. a worker died)
+                planned = [error] * len(unique)
+            results = dict(zip(unique, planned))
+            now = time.perf_counter()
+            for job, future, enqueued in batch:
+                if future.done():               # the caller gave up on it
+                    continue
+                result = results[job]
+                if isinstance(result, Exception):
+                    counts["failed"] += 1
+                    future.set_exception(result)
+                else:
+                    counts["completed"] += 1
+                    self._latencies.append(now - enqueued)
+                    future.set_result(result)
+        finally:
+            self._slots.release()
+
+    def stats(self) -> dict:
+        """
+        Request counts, batching and latency percentiles (seconds) over recent requests.
+
+        Returns:
+            dict: completed, failed, rejected, pending, batches, mean_batch, dedup_ratio,
+                p50, p95, p99, max
+        """
+        counts = dict(self._counts)
+        ordered = sorted(self._latencies)
+        batches = counts["batches"]
+        counts.update(
+            pending=self._queue.qsize() if self._queue is not None else 0,
+            mean_batch=counts["batched_jobs"] / batches if batches else 0.0,
+            dedup_ratio=counts["planned_jobs"] / counts["batched_jobs"] if batches else 1.0,
+            p50=percentile(ordered, 50), p95=percentile(ordered, 95),
+            p99=percentile(ordered, 99), max=ordered[-1] if ordered else 0.0,
+        )
+        return counts
+
+    def reset_stats(self):
+        """Forget the latencies and counts collected so far (e.g. after a warm-up)."""
+        self._latencies.clear()
+        for key in self._counts:
+            self._counts[key] = 0
+
+
+def _job_from_json(payload: dict) -> RouteJob:
+    if not isinstance(payload, dict):
+        raise ValueError("The request body must be a JSON object")
+    customer_ids = payload.get("customer_ids")
+    return RouteJob(int(payload["depot_id"]), payload.get("objective", "driver"),
+                    None if customer_ids is None else tuple(int(i) for i in customer_ids),
+                    payload.get("ethical_rule"))
+
+
+async def _respond(service: DispatchService, method: str, target: str, body: bytes) -> Tuple[int, dict]:
+    if target == "/route" and method == "POST":
+        try:
+            job = _job_from_json(json.loads(body))
+            result = await service.plan(job)
+        except (ServiceOverloaded, ServiceClosed) as error:
+            return 503, {"error": str(error)}
+        except (KeyError, ValueError, TypeError) as error:
+            return 400, {"error": f"{type(error).__name__}: {error}"}
+        except Exception as error:
+            return 500, {"error": f"{type(error).__name__}: {error}"}
+        return 200, {"route": [node.id for node in result.route], "total": result.total}
+    if target == "/stats" and method == "GET":
+        return 200, service.stats()
+    return 404, {"error": f"No route for {method} {target}"}
+
+
+async def _write_response(writer: asyncio.StreamWriter, status: int, payload: dict, keep_alive: bool):
+    data = json.dumps(payload).encode()
+    head = (f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n")
+    if not keep_alive:
+        head += "Connection: close\r\n"
+    writer.write(head.encode() + b"\r\n" + data)
+    await writer.drain()
+
+
+async def _handle_http(service: DispatchService, max_body: int, reader: asyncio.StreamReader,
+                       writer: asyncio.StreamWriter):
+    """Serve HTTP/1.x requests on one connection until the client closes it."""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            parts = request_line.decode("latin-1").split()
+            if len(parts) != 3:
+                await _write_response(writer, 400, {"error": "Malformed request line"}, False)
+                break
+            method, target, version = parts
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            length = headers.get("content-length", "0")
+            if not (length.isascii() and length.isdigit()):
+                await _write_response(writer, 400, {"error": f"Bad Content-Length: {length!r}"}, False)
+                break
+            if int(length) > max_body:
+                # the body is never read, so the connection can't be reused
+                await _write_response(writer, 413, {"error": f"Body over {max_body} bytes"}, False)
+                break
+            body = await reader.readexactly(int(length))
+
+            status, payload = await _respond(service, method, target, body)
+            keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+            await _write_response(writer, status, payload, keep_alive)
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass                                    # client went away mid-request
+    except asyncio.CancelledError:
+        pass                                    # event loop shutting down with the connection open
+    finally:
+        writer.close()
+
+
+async def serve_http(service: DispatchService, host: str = "127.0.0.1", port: int = 8080,
+                     backlog: int = 2048, max_body: int = MAX_BODY_BYTES) -> asyncio.AbstractServer:
+    """
+    Start an HTTP endpoint for a started service.
+
+    Args:
+        service (DispatchService): Service to forward requests to
+        host (str): Interface to listen on
+        port (int): Port (0 picks a free one; see server.sockets[0].getsockname())
+        backlog (int): Pending connections the listening socket queues
+        max_body (int): Largest request body accepted, in bytes (larger ones get 413)
+
+    Returns:
+        asyncio.AbstractServer: The listening server; close() it to stop accepting
+    """
+    return await asyncio.start_server(partial(_handle_http, service, max_body), host, port, backlog=backlog)
+
+
+async def _serve_forever(args):
+    nodes, _, edges = get_dataset(args.dataset)
+    async with DispatchService(nodes, edges, workers=args.workers, max_batch=args.max_batch,
+                               batch_window_ms=args.window_ms, max_pending=args.max_pending) as service:
+        server = await serve_http(service, args.host, args.port)
+        print(f"Serving {len(nodes)} nodes on http://{args.host}:{server.sockets[0].getsockname()[1]}")
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Serve the route planners over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--dataset", default="mn", help="dataset name or columnar dataset file (see datasets.py)")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--window-ms", type=float, default=1.0)
+    parser.add_argument("--max-pending", type=int, default=1024)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve_forever(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Greedy Algorithm Assignment - Pairwise Distance Cache
+
+Node.distance_to recomputes the Euclidean distance on every call. This file contains
+a DistanceOracle keyed by node-id pairs that either precomputes a dense matrix
+(small graphs) or keeps an LRU-bounded cache of the pairs actually asked for
+(large graphs), and counts hits and misses.
+
+Cached values come from Node.distance_to itself, so they are bit-for-bit the
+same as computing the distance directly.
+"""
+from array import array
+from collections import OrderedDict
+from typing import Dict, List
+
+from main import Node, calculate_travel_cost
+
+
+class DistanceOracle:
+    """
+    Memoized distances between nodes, looked up by node id.
+
+    Attributes:
+        mode (str): "dense" (precomputed n x n matrix) or "sparse" (LRU cache)
+        max_entries (int): Most pairs kept by the sparse cache
+        hits (int): Lookups answered from the matrix or cache
+        misses (int): Lookups that had to compute the distance
+    """
+
+    def __init__(self, nodes: List[Node], mode: str = "auto", max_entries: int = 1_000_000,
+                 dense_limit: int = 1000):
+        """
+        Args:
+            nodes (List[Node]): Nodes the oracle can answer for
+            mode (str): "dense", "sparse", or "auto" (dense up to dense_limit nodes)
+            max_entries (int): Capacity of the sparse cache before evicting least recently used pairs
+            dense_limit (int): Largest graph "auto" builds a dense matrix for
+        """
+        if mode == "auto":
+            mode = "dense" if len(nodes) <= dense_limit else "sparse"
+        if mode not in ("dense", "sparse"):
+            raise ValueError(f"Unknown distance oracle mode: {mode!r}")
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.mode = mode
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._nodes: Dict[int, Node] = {node.id: node for node in nodes}
+        self._index: Dict[int, int] = {}
+        self._matrix = array('d')
+        self._cache: "OrderedDict[tuple, float]" = OrderedDict()
+
+        if mode == "dense":
+            ordered = list(self._nodes.values())
+            self._index = {node.id: i for i, node in enumerate(ordered)}
+            self._n = len(ordered)
+            for node in ordered:
+                self._matrix.extend([node.distance_to(other) for other in ordered])
+
+    def distance_by_id(self, u_id: int, v_id: int) -> float:
+        """
+        Distance between two nodes given by id.
+
+        Args:
+            u_id (int): Id of the first node
+            v_id (int): Id of the second node
+
+        Returns:
+            float: Euclidean distance between them
+        """
+        if self.mode == "dense":
+            i, j = self._index.get(u_id), self._index.get(v_id)
+            if i is not None and j is not None:
+                self.hits += 1
+                return self._matrix[i * self._n + j]
+            self.misses += 1
+            return self._nodes[u_id].distance_to(self._nodes[v_id])
+
+        # (a - b) ** 2 == (b - a) ** 2 exactly, so one entry serves both directions
+        key = (u_id, v_id) if u_id <= v_id else (v_id, u_id)
+        cache = self._cache
+        value = cache.get(key)
+        if value is not None:
+            self.hits += 1
+            cache.move_to_end(key)
+            return value
+        self.misses += 1
+        value = self._nodes[u_id].distance_to(self._nodes[v_id])
+        cache[key] = value
+        if len(cache) > self.max_entries:
+            cache.popitem(last=False)
+        return value
+
+    def distance(self, u: Node, v: Node) -> float:
+        """
+        Distance between two nodes (drop-in for u.distance_to(v)).
+
+        Nodes the oracle was not built with are computed directly and counted as misses.
+        """
+        if u.id not in self._nodes or v.id not in self._nodes:
+            self.misses += 1
+            return u.distance_to(v)
+        return self.distance_by_id(u.id, v.id)
+
+    def travel_cost(self, u: Node, v: Node, base_cost_per_mile: float = 0.50) -> float:
+        """
+        Travel cost between two nodes, via calculate_travel_cost on the cached distance.
+
+        Args:
+            u (Node): Start node
+            v (Node): End node
+            base_cost_per_mile (float): Cost per unit distance (default: $0.50/mile)
+
+        Returns:
+            float: Total travel cost
+        """
+        return calculate_travel_cost(self.distance(u, v), base_cost_per_mile)
+
+    def stats(self) -> dict:
+        """Counters as a dict: mode, hits, misses, hit_rate and cached entries."""
+        lookups = self.hits + self.misses
+        return {
+            "mode": self.mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._matrix) if self.mode == "dense" else len(self._cache),
+        }
+
+    def clear(self):
+        """Drop the sparse cache and reset the counters (the dense matrix is kept)."""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return f"DistanceOracle(mode={self.mode}, nodes={len(self._nodes)}, hits={self.hits}, misses={self.misses})"
+
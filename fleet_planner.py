@@ -0,0 +1,416 @@
+"""
+Greedy Algorithm Assignment - Fleet Planning
+
+greedy_driver_route sends one driver to every customer. This file splits the
+customers across a fleet of vehicles leaving from the same depot, each with a
+capacity (total demand, one unit per stop by default) and optionally a longest
+allowed route, using one of two classic constructions:
+
+    "sweep"    customers sorted by angle around the depot (starting in the widest
+               empty sector) are dealt to vehicles in turn until each is full;
+               every vehicle's stops are then ordered by the greedy builder of
+               the objective (Part A or B), over the roads, and a route over the
+               length limit ends at the last stop it can still drive home from
+    "savings"  Clarke-Wright: every customer starts on its own out-and-back trip
+               and two trips are joined end to end, largest saving first, while
+               capacity and route length allow. Joining i and j saves
+               cost_per_mile * (d(depot, i) + d(depot, j) - d(i, j)) of travel
+               cost; fees and tips are earned either way, so that is the whole
+               change in profit and in driver earnings.
+
+Computing every pairwise saving is quadratic, so savings only pair customers
+with their nearest neighbors: customers go into a k-d tree with small leaves,
+and each customer's distances to the points of the nearest few leaves are
+computed in one batch, keeping the `neighbors` closest. The savings go into one
+heap, popped largest first.
+
+Savings routes keep the Clarke-Wright visiting order. If a construction needs
+more vehicles than the fleet has, the least profitable routes are left out, and
+their customers are inserted (cheapest insertion) into routes that still have
+room; only customers that fit nowhere are reported as unassigned.
+"""
+import heapq
+import math
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+from main import Node, Edge
+from adjacency import AdjacencyIndex
+from greedy_approach import greedy_company_route, greedy_driver_route
+from route_analytics import analyze_routes
+
+METHODS = ("sweep", "savings")
+
+
+class FleetPlan(NamedTuple):
+    """
+    Routes for a fleet of vehicles.
+
+    Attributes:
+        routes (List[List[Node]]): One route per vehicle used, depot first and last
+        totals (List[float]): Profit/earnings of each route
+        loads (List[float]): Demand served by each route
+        distances (List[float]): Length of each route
+        total (float): Sum of totals
+        unassigned (List[Node]): Customers no vehicle could take
+    """
+    routes: List[List[Node]]
+    totals: List[float]
+    loads: List[float]
+    distances: List[float]
+    total: float
+    unassigned: List[Node]
+
+
+def _unit_demand(node: Node) -> float:
+    return 1.0
+
+
+def sweep_clusters(customers: List[Node], depot: Node, vehicles: int, capacity: float,
+                   demand: Callable[[Node], float] = _unit_demand) -> List[List[Node]]:
+    """
+    Deal customers, by angle around the depot, to vehicles until each is full.
+
+    The sweep starts right after the widest angle with no customer in it, so a
+    group of customers isn't split between the first and the last vehicle.
+
+    Args:
+        customers (List[Node]): Customers to split
+        depot (Node): Center of the sweep
+        vehicles (int): Most clusters
+        capacity (float): Most demand per cluster
+        demand (Callable): Demand of a customer
+
+    Returns:
+        List[List[Node]]: Clusters in sweep order; customers that didn't fit in any are left out
+    """
+    if not customers:
+        return []
+    angles = [math.atan2(node.y - depot.y, node.x - depot.x) for node in customers]
+    order = sorted(range(len(customers)), key=angles.__getitem__)
+    gaps = [angles[order[(k + 1) % len(order)]] - angles[order[k]] for k in range(len(order))]
+    gaps[-1] += 2.0 * math.pi
+    start = (max(range(len(gaps)), key=gaps.__getitem__) + 1) % len(order)
+    order = order[start:] + order[:start]
+
+    clusters: List[List[Node]] = [[]]
+    load = 0.0
+    for index in order:
+        node = customers[index]
+        need = demand(node)
+        if need > capacity:
+            continue
+        if load + need > capacity:
+            if len(clusters) == vehicles:
+                continue        # fleet full; a later, smaller customer may still fit
+            clusters.append([])
+            load = 0.0
+        clusters[-1].append(node)
+        load += need
+    return [cluster for cluster in clusters if cluster]
+
+
+def _box(members: List[int], xs: List[float], ys: List[float]) -> Tuple[float, float, float, float]:
+    px = [xs[i] for i in members]
+    py = [ys[i] for i in members]
+    return min(px), min(py), max(px), max(py)
+
+
+def _ranked(members: List[int], block: List[int], xs: List[float], ys: List[float],
+            neighbors: int) -> List[List[Tuple[float, int]]]:
+    """For each member, (squared distance, point) of the neighbors + 1 points of block closest to it."""
+    bx = [xs[j] for j in block]
+    by = [ys[j] for j in block]
+    ranked = []
+    for i in members:
+        x, y = xs[i], ys[i]
+        d2 = [(x - px) * (x - px) + (y - py) * (y - py) for px, py in zip(bx, by)]
+        ranked.append(sorted(zip(d2, block))[:neighbors + 1])
+    return ranked
+
+
+def _nearest_pairs(xs: List[float], ys: List[float], neighbors: int, leaf_size: int = 8,
+                   queries: Optional[Sequence[int]] = None) -> List[List[int]]:
+    """
+    The (up to) `neighbors` nearest other points of each point (of each query point, if given).
+
+    Points go into a k-d tree (split at the median of the wider side), so leaves
+    hold leaf_size points however clustered or collinear the points are. The
+    leaves closest to each leaf are collected best-first until they hold
+    4 * (neighbors + 1) points, and each of the leaf's points is compared with
+    them in one batch: the result is near-exact and the work per point stays
+    bounded.
+    """
+    n = len(xs)
+    if n < 2:
+        return [[] for _ in range(n)]
+    boxes, kids, members_of = [], [], {}
+    stack = [(list(range(n)), None)]        # (points, parent node)
+    while stack:
+        members, parent = stack.pop()
+        node = len(boxes)
+        if parent is not None:
+            kids[parent].append(node)
+        box = _box(members, xs, ys)
+        boxes.append(box)
+        kids.append([])
+        if len(members) <= leaf_size:
+            members_of[node] = members
+            continue
+        coords = xs if box[2] - box[0] >= box[3] - box[1] else ys
+        members.sort(key=coords.__getitem__)
+        half = len(members) // 2
+        stack.append((members[half:], node))
+        stack.append((members[:half], node))
+
+    wanted = None if queries is None else set(queries)
+    cap = 4 * (neighbors + 1)
+    nearest: List[List[int]] = [[] for _ in range(n)]
+    for node, members in members_of.items():
+        if wanted is not None:
+            members = [i for i in members if i in wanted]
+            if not members:
+                continue
+        x0, y0, x1, y1 = boxes[node]
+        # best-first over the tree by distance from this leaf, until enough points
+        block, heap = [], [(0.0, 0)]
+        while heap and len(block) < cap:
+            _, other = heapq.heappop(heap)
+            if other in members_of:
+                block.extend(members_of[other])
+                continue
+            for kid in kids[other]:
+                bx0, by0, bx1, by1 = boxes[kid]
+                dx = max(0.0, x0 - bx1, bx0 - x1)
+                dy = max(0.0, y0 - by1, by0 - y1)
+                heapq.heappush(heap, (dx * dx + dy * dy, kid))
+        for i, best in zip(members, _ranked(members, block, xs, ys, neighbors)):
+            nearest[i] = [j for _, j in best if j != i][:neighbors]
+    return nearest
+
+
+def savings_routes(customers: List[Node], depot: Node, capacity: float,
+                   demand: Callable[[Node], float] = _unit_demand,
+                   max_distance: float = math.inf, neighbors: int = 10) -> List[List[Node]]:
+    """
+    Clarke-Wright savings routes over nearest-neighbor pairs.
+
+    Savings are kept in miles: pricing them per mile doesn't change their order.
+
+    Args:
+        customers (List[Node]): Customers to route
+        depot (Node): Where every route starts and ends
+        capacity (float): Most demand per route
+        demand (Callable): Demand of a customer
+        max_distance (float): Longest allowed route, depot legs included
+        neighbors (int): Candidate partners per customer
+
+    Returns:
+        List[List[Node]]: Customer sequences (without the depot); customers that
+            can't be served even alone are left out
+    """
+    n = len(customers)
+    xs = [node.x for node in customers]
+    ys = [node.y for node in customers]
+    to_depot = [depot.distance_to(node) for node in customers]
+    load = [demand(node) for node in customers]
+
+    # route state, kept at the route's id (the customer it started with)
+    route_of = list(range(n))
+    members: List[Optional[List[int]]] = [[i] for i in range(n)]
+    length = [2.0 * d for d in to_depot]
+    feasible = [load[i] <= capacity and length[i] <= max_distance for i in range(n)]
+
+    # (-saving, i, j) with i < j, once per pair even if both list the other
+    pairs = {}
+    for i, partners in enumerate(_nearest_pairs(xs, ys, neighbors)):
+        xi, yi, di = xs[i], ys[i], to_depot[i]
+        savings = [di + to_depot[j] - ((xi - xs[j]) ** 2 + (yi - ys[j]) ** 2) ** 0.5 for j in partners]
+        for j, saving in zip(partners, savings):
+            if saving > 0.0:
+                pairs[(i, j) if i < j else (j, i)] = saving
+    heap = [(-saving, i, j) for (i, j), saving in pairs.items()]
+    heapq.heapify(heap)
+
+    while heap:
+        negative, i, j = heapq.heappop(heap)
+        a, b = route_of[i], route_of[j]
+        if a == b or not (feasible[i] and feasible[j]):
+            continue
+        route_a, route_b = members[a], members[b]
+        # both must be at an end of their route (next to the depot)
+        if route_a[0] != i and route_a[-1] != i or route_b[0] != j and route_b[-1] != j:
+            continue
+        new_load = load[a] + load[b]
+        new_length = length[a] + length[b] + negative
+        if new_load > capacity or new_length > max_distance:
+            continue
+        if route_a[-1] != i:
+            route_a.reverse()
+        if route_b[0] != j:
+            route_b.reverse()
+        if len(route_a) < len(route_b):
+            route_b[:0] = route_a
+            keep, drop = b, a
+        else:
+            route_a.extend(route_b)
+            keep, drop = a, b
+        for k in members[drop]:
+            route_of[k] = keep
+        members[drop] = None
+        load[keep], length[keep] = new_load, new_length
+
+    return [[customers[k] for k in route] for route in members
+            if route is not None and feasible[route[0]]]
+
+
+def _within_distance(route: List[Node], max_distance: float) -> List[Node]:
+    """The longest start of a closed route that can still drive home within max_distance."""
+    depot = route[0]
+    length, keep = 0.0, 0
+    for k in range(1, len(route) - 1):
+        length += route[k - 1].distance_to(route[k])
+        if length > max_distance:
+            break
+        if length + route[k].distance_to(depot) <= max_distance:
+            keep = k
+    if keep == len(route) - 2:
+        return route
+    return route[:keep + 1] + [depot]
+
+
+def plan_fleet(nodes: List[Node], depot: Node, edges: List[Edge], vehicles: int,
+               capacity: Optional[float] = None, method: str = "savings", objective: str = "driver",
+               demand: Callable[[Node], float] = _unit_demand, max_distance: float = math.inf,
+               neighbors: int = 10) -> FleetPlan:
+    """
+    Split the customers across a fleet of vehicles leaving from one depot.
+
+    Args:
+        nodes (List[Node]): All delivery locations including depot
+        depot (Node): The depot every vehicle starts and ends at
+        edges (List[Edge]): All road connections (used to order "sweep" routes)
+        vehicles (int): Fleet size
+        capacity (float, optional): Most demand per vehicle (default: total demand / vehicles, rounded up)
+        method (str): "sweep" or "savings"
+        objective (str): "company" (profit, Part A) or "driver" (earnings, Part B)
+        demand (Callable): Demand of a customer (default: 1 per stop)
+        max_distance (float): Longest allowed route; a "sweep" route over it ends early and
+            its last stops are inserted elsewhere like any other leftover
+        neighbors (int): Savings partners per customer ("savings" only)
+
+    Returns:
+        FleetPlan: Routes, per-route totals and the customers left unassigned
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown fleet method: {method!r}")
+    if objective not in ("company", "driver"):
+        raise ValueError(f"Unknown objective: {objective!r}")
+    if vehicles < 1:
+        raise ValueError("A fleet needs at least one vehicle")
+    customers = [node for node in nodes if not node.is_depot]
+    if capacity is None:
+        capacity = math.ceil(sum(demand(node) for node in customers) / vehicles)
+
+    if method == "sweep":
+        graph = AdjacencyIndex(edges, nodes)
+        route_fn = greedy_company_route if objective == "company" else greedy_driver_route
+        routes = [_within_distance(route_fn([depot] + cluster, depot, graph)[0], max_distance)
+                  for cluster in sweep_clusters(customers, depot, vehicles, capacity, demand)]
+    else:
+        routes = [[depot] + sequence + [depot]
+                  for sequence in savings_routes(customers, depot, capacity, demand, max_distance, neighbors)]
+
+    metrics = analyze_routes(routes)
+    totals = metrics.company_profit if objective == "company" else metrics.driver_earnings
+    keep = sorted(range(len(routes)), key=lambda r: -totals[r])[:vehicles]
+    keep.sort()
+    routes = [routes[r] for r in keep]
+    served = {node.id for route in routes for node in route}
+    leftovers = [node for node in customers if node.id not in served]
+    unassigned = insert_leftovers(routes, leftovers, depot, vehicles, capacity, demand, max_distance)
+
+    metrics = analyze_routes(routes)
+    totals = metrics.company_profit if objective == "company" else metrics.driver_earnings
+    return FleetPlan(
+        routes=routes,
+        totals=totals,
+        loads=[sum(demand(node) for node in route[1:-1]) for route in routes],
+        distances=metrics.distance,
+        total=sum(totals),
+        unassigned=unassigned,
+    )
+
+
+def insert_leftovers(routes: List[List[Node]], leftovers: List[Node], depot: Node, vehicles: int,
+                     capacity: float, demand: Callable[[Node], float] = _unit_demand,
+                     max_distance: float = math.inf, neighbors: int = 20) -> List[Node]:
+    """
+    Add customers to routes with spare capacity, each where it adds the least distance.
+
+    Positions next to a customer's nearest served neighbors are tried first; only
+    when none of those routes has room are all routes with room searched. A
+    customer no route can take gets a route of its own while vehicles are left.
+
+    Args:
+        routes (List[List[Node]]): Depot-to-depot routes, changed in place
+        leftovers (List[Node]): Customers to place, in order
+        depot (Node): Where new routes start and end
+        vehicles (int): Most routes
+        capacity (float): Most demand per route
+        demand (Callable): Demand of a customer
+        max_distance (float): Longest allowed route
+        neighbors (int): Nearest customers whose positions are tried first
+
+    Returns:
+        List[Node]: The customers that couldn't be placed
+    """
+    if not leftovers:
+        return []
+    load = [sum(demand(node) for node in route[1:-1]) for route in routes]
+    length = [sum(a.distance_to(b) for a, b in zip(route, route[1:])) for route in routes]
+    route_of = {node.id: r for r, route in enumerate(routes) for node in route[1:-1]}
+    points = [node for route in routes for node in route[1:-1]] + leftovers
+    first = len(points) - len(leftovers)
+    nearest = _nearest_pairs([node.x for node in points], [node.y for node in points], neighbors,
+                             queries=range(first, len(points)))
+
+    def best_position(node: Node, candidates) -> Optional[Tuple[float, int, int]]:
+        """(added distance, route, index) of the cheapest feasible insertion among the candidates."""
+        best, x, y, need = None, node.x, node.y, demand(node)
+        for r in candidates:
+            if load[r] + need > capacity:
+                continue
+            route = routes[r]
+            rx = [stop.x for stop in route]
+            ry = [stop.y for stop in route]
+            to = [((x - px) ** 2 + (y - py) ** 2) ** 0.5 for px, py in zip(rx, ry)]
+            legs = [((ax - bx) ** 2 + (ay - by) ** 2) ** 0.5
+                    for ax, ay, bx, by in zip(rx, ry, rx[1:], ry[1:])]
+            added = [a + b - leg for a, b, leg in zip(to, to[1:], legs)]
+            k = min(range(len(added)), key=added.__getitem__)
+            if (best is None or added[k] < best[0]) and length[r] + added[k] <= max_distance:
+                best = (added[k], r, k + 1)
+        return best
+
+    unplaced = []
+    for offset, node in enumerate(leftovers):
+        near = {route_of[points[j].id] for j in nearest[first + offset] if points[j].id in route_of}
+        best = best_position(node, sorted(near))
+        if best is None:
+            best = best_position(node, range(len(routes)))
+        if best is not None:
+            added, r, k = best
+            routes[r].insert(k, node)
+        elif len(routes) < vehicles and 2 * depot.distance_to(node) <= max_distance \
+                and demand(node) <= capacity:
+            routes.append([depot, node, depot])
+            load.append(0.0)
+            length.append(0.0)
+            added, r = 2 * depot.distance_to(node), len(routes) - 1
+        else:
+            unplaced.append(node)
+            continue
+        load[r] += demand(node)
+        length[r] += added
+        route_of[node.id] = r
+    return unplaced
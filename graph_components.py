@@ -0,0 +1,141 @@
+"""
+Greedy Algorithm Assignment - Connected Components
+
+A greedy route only moves along roads between the route's own stops, so the
+road graph restricted to those stops splits into connected components. The
+driver can never reach a component other than the depot's by road: each one
+costs at least one fallback jump, and its customers are known before routing
+starts. This file finds the components with union-find over the normalized
+roads (see adjacency.normalize_edges).
+"""
+from array import array
+from typing import List, NamedTuple, Optional, Sequence, Union
+
+from main import Node, Edge
+from adjacency import AdjacencyIndex, as_adjacency
+
+
+class UnionFind:
+    """Disjoint sets over 0..n-1, with union by size and path halving."""
+
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> bool:
+        """Merge the sets of a and b; False if they were already one set."""
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        return True
+
+
+class ComponentIndex:
+    """
+    Connected components of the roads between a set of slots of an AdjacencyIndex.
+
+    Components are numbered in order of their first slot (in the order the slots
+    were given), and list their slots in that order too.
+
+    Attributes:
+        label (array): Component of every slot of the graph, -1 for slots not in the set
+        members (List[List[int]]): Slots of each component
+    """
+
+    def __init__(self, graph: AdjacencyIndex, slots: Optional[Sequence[int]] = None):
+        """
+        Args:
+            graph (AdjacencyIndex): Roads to follow
+            slots (Sequence[int], optional): Slots to consider (default: every slot);
+                roads through other slots don't connect anything
+        """
+        if slots is None:
+            slots = range(len(graph))
+        inside = bytearray(len(graph))
+        for slot in slots:
+            inside[slot] = 1
+        sets = UnionFind(len(graph))
+        slot_of = graph.slot_of
+        for edge in graph.edges:
+            u, v = slot_of[edge.u.id], slot_of[edge.v.id]
+            if inside[u] and inside[v]:
+                sets.union(u, v)
+
+        self.label = array('l', [-1]) * len(graph)
+        self.members: List[List[int]] = []
+        root_label = {}
+        for slot in slots:
+            if self.label[slot] != -1:
+                continue
+            root = sets.find(slot)
+            component = root_label.get(root)
+            if component is None:
+                component = root_label[root] = len(self.members)
+                self.members.append([])
+            self.label[slot] = component
+            self.members[component].append(slot)
+        self._graph = graph
+
+    def component_of(self, node: Node) -> int:
+        """Component of the given node (-1 if it isn't in the set)."""
+        slot = self._graph.slot_of.get(node.id)
+        return -1 if slot is None else self.label[slot]
+
+    def nodes_of(self, component: int) -> List[Node]:
+        """Nodes of one component."""
+        nodes = self._graph.nodes
+        return [nodes[slot] for slot in self.members[component]]
+
+    def __len__(self):
+        return len(self.members)
+
+    def __repr__(self):
+        return f"ComponentIndex({len(self.members)} components)"
+
+
+class RouteComponents(NamedTuple):
+    """
+    How a route's stops are connected by road.
+
+    Attributes:
+        reachable (List[Node]): Customers the depot reaches by road through the route's stops
+        unreachable (List[List[Node]]): Customers of every other component, one list each
+        forced_jumps (int): Fallback jumps every route over these stops needs at least
+    """
+    reachable: List[Node]
+    unreachable: List[List[Node]]
+    forced_jumps: int
+
+
+def route_components(nodes: List[Node], depot: Node,
+                     edges: Union[List[Edge], AdjacencyIndex]) -> RouteComponents:
+    """
+    Split a route's customers by whether the depot can reach them by road.
+
+    Args:
+        nodes (List[Node]): All delivery locations including depot
+        depot (Node): The starting depot location
+        edges (List[Edge] or AdjacencyIndex): All road connections
+
+    Returns:
+        RouteComponents: The depot's customers, the unreachable components and the
+            fallback jumps they force
+    """
+    graph = as_adjacency(edges, nodes)
+    slot_of = graph.slot_of
+    slots = [slot_of[depot.id]] + [slot_of[node.id] for node in nodes if not node.is_depot]
+    components = ComponentIndex(graph, slots)
+    reachable = components.nodes_of(0)[1:]
+    unreachable = [components.nodes_of(c) for c in range(1, len(components))]
+    return RouteComponents(reachable, unreachable, len(unreachable))
@@ -4,35 +4,157 @@ Greedy Algorithm Assignment - Greedy Approach Implementation
 You should implement greedy algorithms in this file.
 """
 
-from typing import List, Tuple
+from typing import Callable, Iterator, List, Tuple, Union
 from main import Node, Edge, calculate_travel_cost
+from adjacency import AdjacencyIndex, as_adjacency
+from road_network import RoadNetwork
+from scoring import argmax_first
+from spatial_index import GridIndex
+from candidate_queue import CandidateQueue, FrontierCache, ScanQueue
+from route_building import (fallback_index, leg_distance, next_candidates, objective_scores,
+                            route_start, scoring_engine)
+from policies import ScoringPolicy, ethical_policy
+from profiling import RouteProfiler, current_profiler
 
+# One streamed greedy decision: (stop, profit/earnings of that step, running total)
+RouteStep = Tuple[Node, float, float]
 
-def get_neighbors(current_node: Node, edges: List[Edge]) -> List[Node]:
+
+def get_neighbors(current_node: Node, edges: Union[List[Edge], AdjacencyIndex]) -> List[Node]:
     """
     Get all nodes that are directly connected to the current node.
     
     Args:
         current_node (Node): The node to find neighbors for
-        edges (List[Edge]): All available edges
+        edges (List[Edge] or AdjacencyIndex): All available edges, or an index built from them
         
     Returns:
-        List[Node]: List of neighboring nodes
+        List[Node]: List of neighboring nodes, each once (a road listed twice or a
+            road to itself doesn't add a neighbor)
     """
+    if isinstance(edges, AdjacencyIndex):
+        return edges.neighbors(current_node)
+
     neighbors = []
+    seen = {current_node.id}
     for edge in edges:
         if edge.u.id == current_node.id:
-            neighbors.append(edge.v)
+            other = edge.v
         elif edge.v.id == current_node.id:
-            neighbors.append(edge.u)
+            other = edge.u
+        else:
+            continue
+        if other.id not in seen:
+            seen.add(other.id)
+            neighbors.append(other)
     return neighbors
 
 
+def _frontier_cache(graph: AdjacencyIndex, objective: str,
+                    score_batch: Callable[[int, List[int]], List[float]]) -> FrontierCache:
+    """Scored neighbor heaps for the objective, built lazily and kept in graph.cache."""
+    key = "frontier_" + objective
+    cache = graph.cache.get(key)
+    if cache is None:
+        cache = graph.cache[key] = FrontierCache(graph, scoring_engine(graph).is_depot, score_batch)
+    return cache
+
+
+def _traced(name: str, router: Callable[..., Iterator[RouteStep]], *args) -> Iterator[RouteStep]:
+    """Start a route, instrumented if a RouteProfiler is active (see profiling.py)."""
+    profiler = current_profiler()
+    steps = router(*args, profiler=profiler)
+    return steps if profiler is None else profiler.trace_route(name, steps)
+
+
+def _iter_greedy_route(nodes: List[Node], depot: Node, graph: AdjacencyIndex, objective: str,
+                       reuse: bool = False, profiler: RouteProfiler = None) -> Iterator[RouteStep]:
+    """
+    Shared greedy loop for Parts A and B, yielding each stop as soon as it is chosen.
+    
+    At each step every candidate is scored in one batch ("company" or "driver"
+    objective) and the highest score wins (first one on ties). If no unvisited
+    customer is reachable by road, the route jumps to the best remaining one anywhere.
+    
+    On a RoadNetwork every leg (neighbor moves, jumps, the return to the depot) is
+    charged by road distance instead of the straight line.
+    
+    Neighbor scores only depend on the (current, candidate) pair, so with reuse=True
+    (the caller passed a prebuilt AdjacencyIndex) they come from per-node heaps that
+    are scored once per graph and skip visited entries lazily.
+    
+    With a profiler, the scorer, neighbor selection and fallback jumps are swapped
+    for timed wrappers before the loop starts; without one the loop is unchanged.
+    """
+    engine = scoring_engine(graph)
+    score_batch, values = objective_scores(graph, engine, objective)
+    # the frontier cache outlives this route, so it always keeps the plain scorer
+    frontier = _frontier_cache(graph, objective, score_batch) if reuse else None
+    if profiler is not None:
+        score_batch = profiler.timed("score", score_batch, "candidates_scored", sized=True)
+
+    customers, visited = route_start(graph, nodes)
+    current = graph.slot_of[depot.id]
+    if reuse:
+        queue = CandidateQueue(frontier, visited)
+    else:
+        queue = ScanQueue(graph, engine.is_depot, score_batch, visited)
+    select, jump = queue.best, GridIndex.best
+    if profiler is not None:
+        select = profiler.timed("select", select, "neighbor_lookups")
+        if reuse:
+            select = profiler.cache_counter(select, frontier, "frontier")
+        jump = profiler.timed("fallback", jump, "fallback_jumps")
+    last = depot
+    total = 0.0
+    fallback = None
+
+    # visit each customer once
+    for _ in range(len(customers)):
+        choice = select(current)
+        # If no neighbor is reachable, jump to the best remaining customer anywhere
+        if choice is None:
+            if fallback is None:
+                fallback = fallback_index(engine, customers, visited, values)
+            here = current
+            best = jump(fallback, engine.x[here], engine.y[here],
+                        lambda slots: score_batch(here, slots))
+            choice = best, score_batch(here, [best])[0]
+
+        current, step_score = choice
+        last = graph.nodes[current]
+        visited[current] = 1
+        if fallback is not None:
+            fallback.remove(current)
+        total += step_score
+        yield last, step_score, total
+
+    # return to depot
+    return_cost = calculate_travel_cost(leg_distance(graph, last, depot))
+    total -= return_cost
+    yield depot, -return_cost, total
+
+
+def _collect_route(depot: Node, steps: Iterator[RouteStep]) -> Tuple[List[Node], float]:
+    """Run a route generator to completion and return (route, total) like the Part A-C functions."""
+    route = [depot]
+    total = 0.0
+    for node, _, total in steps:
+        route.append(node)
+    return route, total
+
+
 # ============================================================================
 # PART A: COMPANY'S GREEDY ALGORITHM 
 # ============================================================================
 
-def greedy_company_route(nodes: List[Node], depot: Node, edges: List[Edge]) -> Tuple[List[Node], float]:
+def company_profit(current: Node, neighbor: Node) -> float:
+    """Company profit for moving from current to neighbor: delivery_fee - travel_cost."""
+    return neighbor.delivery_fee - calculate_travel_cost(current.distance_to(neighbor))
+
+
+def greedy_company_route(nodes: List[Node], depot: Node,
+                         edges: Union[List[Edge], AdjacencyIndex]) -> Tuple[List[Node], float]:
     """
     Part A: Implement the company's greedy algorithm.
     
@@ -49,294 +171,224 @@ def greedy_company_route(nodes: List[Node], depot: Node, edges: List[Edge]) -> T
     Args:
         nodes (List[Node]): All delivery locations including depot
         depot (Node): The starting depot location
-        edges (List[Edge]): All road connections between cities
+        edges (List[Edge], AdjacencyIndex or RoadNetwork): All road connections between cities
         
     Returns:
         Tuple[List[Node], float]: (route as list of nodes, total profit)
-        
-    TODO: Students implement this function
     """
-    visited = set()
-    route = [depot]
-    current_node = depot
-    total_profit = 0.0
-
-    # Mark visited depot 
-    visited.add(depot.id)
-    # Continuing until all nodes (customers in this case) are visited) 
-    customers = []
-    for node in nodes:
-        if not node.is_depot:
-            customers.append(node)
-
-    # visit each customers +1 for depot!
-    while len(visited) < len(customers) +1:
-        # get possible next stops (unvisited neighbors)
-        neighbors = get_neighbors(current, edges)
-        next_stops = []
-            for n in neighbors:
-                if n.id not in visited and n.is_depot == False:
-                    next_stops.append(n)
-    # If no neighbors found, find the best stop by profit
-    if not next_stops:
-        break 
-    best_next = None
-    best_profit = -float('inf')
-    
-    for neighbor in next_stops:
-        #calculating distance and travel costs
-        dist = current.distance_to(neighbor)
-        cost = calculate_travel_cost(dist)
-        # profit = delivery_fee - travel_costs
-        profit = neighbor.delivery_fee - cost
-
-    # track the best option
-    if profit > best_profit:
-        best_profit = profit
-        best_next = neighbor
-    # moving to the best next stop
-    current = best_next
-    route.append(current)
-    visited.add(current.id)
-    total_profit += best_profit
+    return _collect_route(depot, iter_company_route(nodes, depot, edges))
 
-    # return to depot
-    return_dist = current.distance_to(depot)
-    return_cost = calculate_travel_cost(return_dist)
-    total_profit -= return_cost
-    route.append(depot)
-    
-return route, total_profit
-                        
-            
+
+def iter_company_route(nodes: List[Node], depot: Node,
+                       edges: Union[List[Edge], AdjacencyIndex]) -> Iterator[RouteStep]:
     """
-    # START YOUR IMPLEMENTATION HERE
+    Part A as a generator: yield (node, step_profit, running_total) as each stop is chosen.
     
-    # Hints:
-    # - Use get_neighbors(current_node, edges) to find connected cities
-    # - Use current_node.distance_to(neighbor) to get distance
-    # - Use calculate_travel_cost(distance) to get travel cost
-    # - Keep track of visited customers using a set of IDs
-    # - Calculate profit = neighbor.delivery_fee - travel_cost
-    # - Choose the neighbor with the highest profit at each step
-    # - Only consider unvisited customer neighbors (not depot, not already visited)
-    # - Don't forget to return to the depot at the end
-
-    raise NotImplementedError("Part A not yet implemented")
+    The last item is the return to the depot, with step_profit = -travel_cost.
+    Stop iterating (or call .close()) to cancel; no further stops are planned.
     
-    # END YOUR IMPLEMENTATION
+    Args:
+        nodes (List[Node]): All delivery locations including depot
+        depot (Node): The starting depot location
+        edges (List[Edge], AdjacencyIndex or RoadNetwork): All road connections between cities
+    """
+    return _traced("company", _iter_greedy_route, nodes, depot, as_adjacency(edges, nodes), "company",
+                   isinstance(edges, AdjacencyIndex))
 
 
 # ============================================================================
 # PART B: DRIVER'S GREEDY ALGORITHM - STUDENT IMPLEMENTATION
 # ============================================================================
 
-def greedy_driver_route(nodes: List[Node], depot: Node, edges: List[Edge]) -> Tuple[List[Node], float]:
+def driver_earnings(current: Node, neighbor: Node) -> float:
+    """Driver earnings for moving from current to neighbor: delivery_fee + estimated_tip - travel_cost."""
+    return (neighbor.delivery_fee + neighbor.estimated_tip
+            - calculate_travel_cost(current.distance_to(neighbor)))
+
+
+def greedy_driver_route(nodes: List[Node], depot: Node,
+                        edges: Union[List[Edge], AdjacencyIndex]) -> Tuple[List[Node], float]:
     """
-  #  Part B: Implement the driver's greedy algorithm.
+    Part B: Implement the driver's greedy algorithm.
     
-  #  Goal: Maximize driver earnings (delivery_fee + estimated_tip - travel_cost)
-
-      visited = set()
-    route = [depot]
-    current_node = depot
-    total_profit = 0.0
-
-    # Mark visited depot 
-    visited.add(depot.id)
-    # Continuing until all nodes (customers in this case) are visited) 
-    customers = []
-    for node in nodes:
-        if not node.is_depot:
-            customers.append(node)
-
-    # visit each customers +1 for depot!
-    while len(visited) < len(customers) +1:
-        # get possible next stops (unvisited neighbors)
-        neighbors = get_neighbors(current, edges)
-        next_stops = []
-            for n in neighbors:
-                if n.id not in visited and n.is_depot == False:
-                    next_stops.append(n)
-    # If no neighbors found, find the best stop by profit
-    if not next_stops:
-        break 
-    best_next = None
-    best_profit = -float('inf')
+    Goal: Maximize driver earnings (delivery_fee + estimated_tip - travel_cost)
     
-    for neighbor in next_stops:
-        #calculating distance and travel costs
-        dist = current.distance_to(neighbor)
-        cost = calculate_travel_cost(dist)
-        # earnings = delivery fee + estimated tip - travel_cost
-        earnings = neighbor.delivery_fee + neighbor.estimated_tip - cost
-
-        if earnings > best_earnings:
-            best_earnings = earnings
-            best_next = neighbor
-            
-            current = best_next
-            route.append(current)
-            visited.add(current.id)
-            total_earnings += best_earnings
-
-        #return to depot
-        if current != depot:
-            return_dist + current_distance_to(depot)
-            return_cost + calculate_travel_cost(return_dist)
-            total_earnings -= return_cost
-            route.append(depot)
-        return route, total_earnings
+    Args:
+        nodes (List[Node]): All delivery locations including depot
+        depot (Node): The starting depot location
+        edges (List[Edge], AdjacencyIndex or RoadNetwork): All road connections between cities
+        
+    Returns:
+        Tuple[List[Node], float]: (route as list of nodes, total earnings)
+    """
+    return _collect_route(depot, iter_driver_route(nodes, depot, edges))
+
+
+def iter_driver_route(nodes: List[Node], depot: Node,
+                      edges: Union[List[Edge], AdjacencyIndex]) -> Iterator[RouteStep]:
     """
-    # START YOUR IMPLEMENTATION HERE
-
-    # Hints:
-    # - Use get_neighbors(current_node, edges) to find connected cities
-    # - Use current_node.distance_to(neighbor) to get distance
-    # - Use calculate_travel_cost(distance) to get travel cost
-    # - Keep track of visited customers using a set of IDs
-    # - Calculate earnings = neighbor.delivery_fee + neighbor.estimated_tip - travel_cost
-    # - Choose the neighbor with the highest earnings at each step
-    # - Only consider unvisited customer neighbors (not depot, not already visited)
-    # - Don't forget to return to the depot at the end
+    Part B as a generator: yield (node, step_earnings, running_total) as each stop is chosen.
     
-    raise NotImplementedError("Part B not yet implemented")
+    The last item is the return to the depot, with step_earnings = -travel_cost.
+    Stop iterating (or call .close()) to cancel; no further stops are planned.
     
-    # END YOUR IMPLEMENTATION
+    Args:
+        nodes (List[Node]): All delivery locations including depot
+        depot (Node): The starting depot location
+        edges (List[Edge], AdjacencyIndex or RoadNetwork): All road connections between cities
+    """
+    return _traced("driver", _iter_greedy_route, nodes, depot, as_adjacency(edges, nodes), "driver",
+                   isinstance(edges, AdjacencyIndex))
+
 
 # ============================================================================
 # PART C: ETHICAL GREEDY ALGORITHM - STUDENT IMPLEMENTATION
 # ============================================================================
 
-def greedy_ethical_route(nodes: List[Node], depot: Node, edges: List[Edge], ethical_rule: str) -> Tuple[List[Node], float]:
-    ""   
-    
+def greedy_ethical_route(nodes: List[Node], depot: Node, edges: Union[List[Edge], AdjacencyIndex],
+                         ethical_rule: Union[str, ScoringPolicy]) -> Tuple[List[Node], float]:
+    """
     Part C: Implement an ethically-modified greedy algorithm.
     
     Modify your code from either Part A or B to incorporate ethical considerations.
+    This builds on Part B: each candidate is scored by its driver earnings plus a
+    bonus/penalty from the chosen rule, but the returned total is real earnings.
     
     Choose ONE ethical rule to implement:
     - "fairness": Alternate between high-tip and low-tip regions
     - "fatigue": Limit consecutive long-distance drives 
     - "priority": Consider delivery priority levels
     
+    A ScoringPolicy (see policies.py) can be passed instead of a rule name, e.g. a
+    WeightedPolicy combining driver earnings, fairness and fatigue.
+    
     Args:
         nodes (List[Node]): All delivery locations including depot
         depot (Node): The starting depot location
-        edges (List[Edge]): All road connections between cities
-        ethical_rule (str): Which ethical rule to apply
+        edges (List[Edge], AdjacencyIndex or RoadNetwork): All road connections between cities
+        ethical_rule (str or ScoringPolicy): Which ethical rule to apply
         
     Returns:
-        Tuple[List[Node], float]: (route as list of nodes, total profit/earnings)
-        
-    TODO: Students implement this function with ethical modifications  
-
+        Tuple[List[Node], float]: (route as list of nodes, total earnings)
     """
-    # START YOUR IMPLEMENTATION HERE
+    return _collect_route(depot, iter_ethical_route(nodes, depot, edges, ethical_rule))
 
-    visited = set()
-    route = [depot]
-    current = depot
-    total_earnings = 0.0
-
-    # Choosing fairness rule/tracking if the last stop was high or low tip
-    last_was_high_tip = False
-    # Starting with false so first stop can be either
-    visited.add(depot.id)
-    # Mark visited depot 
-    visited.add(depot.id)
-    # Continuing until all nodes (customers in this case) are visited) 
-    customers = []
-    for node in nodes:
-        if not node.is_depot:
-            customers.append(node)
-
-    # visit each customers +1 for depot!
-    while len(visited) < len(customers) +1:
-        # get possible next stops (unvisited neighbors)
-        neighbors = get_neighbors(current, edges)
-        next_stops = []
-            for n in neighbors:
-                if n.id not in visited and n.is_depot == False:
-                    next_stops.append(n)
-    # If no neighbors found, find the best stop by profit
-    if not next_stops:
-        break 
-
-    best_next = None
-    best_score = -999999.0
-    best_earnings = 0.0
-for neighbor in next_stops:
-    # calculate the best earnings
-    dist = current.distance_to(neighbor)
-    cost = calculate_travel_cost(dist)
-    base_earnings = neighbor.delivery_fee + neighbor.estimated_tip - cost
-# Applying fairness rule, just using random tip numbers to be considered low or high
-score = base_earnings
-is_high_tip = neighbor.estimated_tip >= 3.00
-# bonus alternating between high and low tip areas or penalty for serving only same type 
-if is_high_tip != last_was_high_tip:
-    score += 3.0
-else:
-    score -=2.0 
-# bonus for serving low tip areas
-if not is_high_tip and last_was_high_tip
-    score += 2.0
-if score > best_score:
-    best_score = score
-    best_next = neighbor
-    best_earnings = base_earnings
-    best_is_high_tip = is_high_tip
-
-# Move to best next stop
-if best_next:
-    current = best_next
-    route.append(current)
-    visited.add(current.id)
-    total_earnings += best+earnings
-    last_was_high_tip = best_is_high_tip
-
-# return to depot
-if current != depot:
-    return_dist = current.distance_to(depot)
-    return_cost = calculate_travel_cost(return_dist)
-    total_earnings -+ return_cost
-    route.append(depot)
-
-return route, total_earnings
+
+def iter_ethical_route(nodes: List[Node], depot: Node, edges: Union[List[Edge], AdjacencyIndex],
+                       ethical_rule: Union[str, ScoringPolicy]) -> Iterator[RouteStep]:
+    """
+    Part C as a generator: yield (node, step_earnings, running_total) as each stop is chosen.
+    
+    step_earnings are real driver earnings, not the ethical score. The last item is
+    the return to the depot. Stop iterating (or call .close()) to cancel.
+    
+    Args:
+        nodes (List[Node]): All delivery locations including depot
+        depot (Node): The starting depot location
+        edges (List[Edge], AdjacencyIndex or RoadNetwork): All road connections between cities
+        ethical_rule (str or ScoringPolicy): Which ethical rule to apply
+    """
+    policy = ethical_policy(ethical_rule) if isinstance(ethical_rule, str) else ethical_rule
+    return iter_policy_route(nodes, depot, edges, policy)
 
 
+def greedy_policy_route(nodes: List[Node], depot: Node, edges: Union[List[Edge], AdjacencyIndex],
+                        policy: ScoringPolicy, reward: str = "driver") -> Tuple[List[Node], float]:
+    """
+    Greedy route that picks stops by any ScoringPolicy.
     
-    # Hints:
-    # - Start with either your Part A or Part B algorithm as a base
-    # - Add ethical considerations to the greedy selection process
-    # - Use get_neighbors(current_node, edges) to find connected cities
-    # 
-    # 
-    # FAIRNESS RULE:
-    # - Track high-tip (≥$3.00) vs low-tip (<$3.00) areas
-    # - Alternate between serving affluent and underserved neighborhoods
-    # - Give bonus points: +2 for high-tip when due, +3 for low-tip areas
-    # - Research basis: McCoy & Lee (2014) delivery equity studies
-    #
-    # FATIGUE RULE:
-    # - Track consecutive long drives (≥15 miles)
-    # - Penalize dangerous consecutive long drives: -10 points
-    # - Reward short "rest" drives after long ones: +3 points
-    # - Research basis: FMCSA safety studies show crash risk increases
-    #
-    # PRIORITY RULE:
-    # - Balance urgent (priority 1-2) vs routine (priority 3-5) deliveries
-    # - Target ratio: serve 2 urgent for every 1 routine delivery
-    # - Prevent starvation: +6 bonus for routine after 3+ urgent serves
-    # - Research basis: Priority scheduling fairness research
-    #
-    # You can modify the scoring function to include ethical factors
-    # Compare results with and without ethical modifications
-
-    raise NotImplementedError("Part C not yet implemented")
+    Args:
+        nodes (List[Node]): All delivery locations including depot
+        depot (Node): The starting depot location
+        edges (List[Edge], AdjacencyIndex or RoadNetwork): All road connections between cities
+        policy (ScoringPolicy): How candidates are scored
+        reward (str): What the total adds up: "driver" earnings or "company" profit
+        
+    Returns:
+        Tuple[List[Node], float]: (route as list of nodes, total reward)
+    """
+    return _collect_route(depot, iter_policy_route(nodes, depot, edges, policy, reward))
+
+
+def iter_policy_route(nodes: List[Node], depot: Node, edges: Union[List[Edge], AdjacencyIndex],
+                      policy: ScoringPolicy, reward: str = "driver") -> Iterator[RouteStep]:
+    """
+    Generator form of greedy_policy_route: yield (node, step_reward, running_total).
     
-    # END YOUR IMPLEMENTATION
+    Args:
+        nodes (List[Node]): All delivery locations including depot
+        depot (Node): The starting depot location
+        edges (List[Edge], AdjacencyIndex or RoadNetwork): All road connections between cities
+        policy (ScoringPolicy): How candidates are scored
+        reward (str): What the total adds up: "driver" earnings or "company" profit
+    """
+    if reward not in ("driver", "company"):
+        raise ValueError(f"Unknown reward: {reward!r}")
+    return _traced(type(policy).__name__, _iter_policy_route, nodes, depot,
+                   as_adjacency(edges, nodes), policy, reward)
+
+
+def _iter_policy_route(nodes: List[Node], depot: Node, graph: AdjacencyIndex,
+                       policy: ScoringPolicy, reward: str,
+                       profiler: RouteProfiler = None) -> Iterator[RouteStep]:
+    engine = scoring_engine(graph)
+    reward_batch, _ = objective_scores(graph, engine, reward)
+    distances = graph.distances if isinstance(graph, RoadNetwork) else engine.distances
+
+    customers, visited = route_start(graph, nodes)
+    current = graph.slot_of[depot.id]
+    last = depot
+    total = 0.0
+    fallback = None
+    state = {"current": depot, "distance": lambda u, v: leg_distance(graph, u, v)}
+    policy.init_state(state)
+
+    def score_batch(here: int, slots: List[int]) -> List[float]:
+        return policy.score_batch(engine, here, slots, distances(here, slots), state)
+
+    def fallback_stops(here: int) -> List[int]:
+        """Candidates when no neighbor is reachable: the best remaining customer anywhere."""
+        nonlocal fallback
+        bound = policy.fallback_bound(engine, state)
+        if bound is None or bound[0] is None:
+            # nothing to prune by distance with, so sweep every unvisited customer
+            return [s for s in customers if not visited[s]]
+        values, cost_per_mile, bonus = bound
+        if (fallback is None or fallback.values is not values
+                or fallback.cost_per_mile != cost_per_mile):
+            fallback = fallback_index(engine, customers, visited, values, cost_per_mile)
+        return [fallback.best(engine.x[here], engine.y[here],
+                              lambda slots: score_batch(here, slots), bonus)]
+
+    candidates, jump = next_candidates, fallback_stops
+    if profiler is not None:
+        score_batch = profiler.timed("score", score_batch, "candidates_scored", sized=True)
+        candidates = profiler.timed("select", candidates, "neighbor_lookups")
+        jump = profiler.timed("fallback", jump, "fallback_jumps")
+
+    for _ in range(len(customers)):
+        next_stops = candidates(graph, engine, current, visited)
+        if not next_stops:
+            next_stops = jump(current)
+        scores = score_batch(current, next_stops)
+        best = next_stops[argmax_first(scores)]
+
+        # the total tracks the real reward, not the policy score
+        step_reward = reward_batch(current, [best])[0]
+        total += step_reward
+        last = graph.nodes[best]
+        policy.update(state, last)
+        state["current"] = last
+        current = best
+        visited[current] = 1
+        if fallback is not None:
+            fallback.remove(current)
+        yield last, step_reward, total
+
+    # return to depot
+    return_cost = calculate_travel_cost(leg_distance(graph, last, depot))
+    total -= return_cost
+    yield depot, -return_cost, total
 
 
 # ============================================================================
@@ -346,7 +398,8 @@ return route, total_earnings
 def run_mn_data():
     """Run implementations with Minnesota data."""
     try:
-        from mn_dataset import MN_NODES, MN_DEPOT, MN_EDGES
+        from datasets import get_dataset
+        MN_NODES, MN_DEPOT, MN_EDGES = get_dataset("mn")
         
         print("\n" + "="*60)
         print("RUNNING WITH MINNESOTA DATA")
@@ -424,15 +477,18 @@ def analyze_fairness_impact(route, nodes):
     print(f"  Alternation score: {alternations} tip-level changes in route")
 
 
-def analyze_fatigue_impact(route):
-    """Analyze how the fatigue rule affected drive distances."""
+def analyze_fatigue_impact(route, oracle=None):
+    """Analyze how the fatigue rule affected drive distances (optionally through a DistanceOracle or RoadNetwork)."""
     long_drives = 0
     consecutive_long = 0
     max_consecutive_long = 0
     current_consecutive = 0
     
     for i in range(1, len(route)):
-        distance = route[i-1].distance_to(route[i])
+        if oracle is not None:
+            distance = oracle.distance(route[i-1], route[i])
+        else:
+            distance = route[i-1].distance_to(route[i])
         if distance >= 15.0:
             long_drives += 1
             current_consecutive += 1
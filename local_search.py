@@ -0,0 +1,226 @@
+"""
+Greedy Algorithm Assignment - Local-Search Route Improvement
+
+The greedy routers commit to each stop without looking ahead, so their routes
+usually contain crossings and detours. This file contains improve_route, which
+polishes a finished route with 2-opt (reverse a stretch of the route) and
+Or-opt (move a run of 1-3 stops elsewhere, possibly reversed) moves.
+
+For the company and driver objectives the fees and tips collected don't depend on
+the order of the stops, so a move only changes the legs it touches: each one is
+evaluated in O(1) from the lengths of those legs. Moves are only tried towards each
+stop's nearest neighbors, and stops whose legs haven't changed are not looked at
+again ("don't look" bits). The search stops at a local optimum or when the time
+budget runs out, whichever comes first.
+
+Legs are measured in a straight line, like the default route functions.
+"""
+import time
+from collections import deque
+from typing import Callable, Dict, List, Tuple, Union
+
+from main import Node, calculate_travel_cost
+from policies import CompanyPolicy, DriverPolicy, ScoringPolicy
+
+# moves must shorten the route by more than this, so rounding noise can't cycle
+MIN_GAIN = 1e-9
+
+
+def _neighbor_finder(xs: List[float], ys: List[float], k: int) -> Callable[[int], List[Tuple[float, int]]]:
+    """
+    Lookup of the k nearest other points of a point, closest first, via a uniform grid.
+
+    Lists are computed the first time a point is asked for, so a search that runs
+    out of time doesn't pay for the points it never reached.
+
+    Returns:
+        Callable[[int], List[Tuple[float, int]]]: (distance, index) pairs for a point
+    """
+    n = len(xs)
+    x0, y0 = min(xs), min(ys)
+    area = max(max(xs) - x0, 1e-9) * max(max(ys) - y0, 1e-9)
+    # about k/2 points per cell, so the 3 x 3 block around a point usually holds its k nearest
+    cell = (area * k / (2 * n)) ** 0.5 or 1.0
+    grid: Dict[Tuple[int, int], List[int]] = {}
+    for i in range(n):
+        grid.setdefault((int((xs[i] - x0) // cell), int((ys[i] - y0) // cell)), []).append(i)
+    lists: Dict[int, List[Tuple[float, int]]] = {}
+
+    def nearest(i: int) -> List[Tuple[float, int]]:
+        found = lists.get(i)
+        if found is not None:
+            return found
+        xi, yi = xs[i], ys[i]
+        cx, cy = int((xi - x0) // cell), int((yi - y0) // cell)
+        members = [j for gx in (cx - 1, cx, cx + 1) for gy in (cy - 1, cy, cy + 1)
+                   for j in grid.get((gx, gy), ()) if j != i]
+        r = 1
+        while True:
+            # points outside the block of radius r are more than r cells' width away
+            if len(members) >= k or len(members) == n - 1:
+                found = sorted([(((xi - xs[j]) ** 2 + (yi - ys[j]) ** 2) ** 0.5, j) for j in members])
+                if len(found) < k or found[k - 1][0] <= r * cell:
+                    break
+            r += 1
+            members.extend(j for gx in range(cx - r, cx + r + 1)
+                           for gy in ((cy - r, cy + r) if abs(gx - cx) != r else range(cy - r, cy + r + 1))
+                           for j in grid.get((gx, gy), ()))
+        found = lists[i] = found[:k]
+        return found
+
+    return nearest
+
+
+def route_total(route: List[Node], policy: ScoringPolicy) -> float:
+    """
+    Total reward of a depot-to-depot route, summed the way the greedy routers do.
+
+    Args:
+        route (List[Node]): Stops in order, depot first and last
+        policy (ScoringPolicy): CompanyPolicy or DriverPolicy
+
+    Returns:
+        float: Sum of the policy's step scores minus the travel cost back to the depot
+    """
+    total = 0.0
+    for a, b in zip(route[:-2], route[1:-1]):
+        total += policy.score(a, b, {})
+    if len(route) > 1:
+        total -= calculate_travel_cost(route[-2].distance_to(route[-1]))
+    return total
+
+
+def improve_route(route: List[Node], policy: Union[str, ScoringPolicy] = "driver",
+                  time_budget_ms: float = 50.0, neighbors: int = 8) -> Tuple[List[Node], float]:
+    """
+    Improve a greedy route with 2-opt and Or-opt moves, within a time budget.
+
+    Args:
+        route (List[Node]): Stops in order, depot first and last (as returned by Part A-C)
+        policy (str or ScoringPolicy): "company"/CompanyPolicy or "driver"/DriverPolicy;
+            the stops' rewards don't depend on their order, so only the distance changes
+        time_budget_ms (float): Wall-clock budget, including setup
+        neighbors (int): Nearest stops each stop tries to connect to
+
+    Returns:
+        Tuple[List[Node], float]: (improved route, its total); never worse than the input
+    """
+    start = time.perf_counter()
+    deadline = start + time_budget_ms / 1000.0
+    if isinstance(policy, str):
+        policies = {"company": CompanyPolicy, "driver": DriverPolicy}
+        if policy not in policies:
+            raise ValueError(f"Unknown policy: {policy!r}")
+        policy = policies[policy]()
+    if type(policy) not in (CompanyPolicy, DriverPolicy):
+        raise ValueError("improve_route needs an order-independent policy (CompanyPolicy or DriverPolicy)")
+
+    original = route_total(route, policy)
+    m = len(route)
+    if m < 5:
+        return list(route), original
+
+    # Points are route positions, so the start and end depot are different points
+    xs = [float(node.x) for node in route]
+    ys = [float(node.y) for node in route]
+    near = _neighbor_finder(xs, ys, min(neighbors, m - 1))
+    tour = list(range(m))
+    pos = list(range(m))
+    last = m - 1
+
+    def dist(p: int, q: int) -> float:
+        return ((xs[p] - xs[q]) ** 2 + (ys[p] - ys[q]) ** 2) ** 0.5
+
+    def reverse(lo: int, hi: int):
+        tour[lo:hi + 1] = tour[lo:hi + 1][::-1]
+        for idx in range(lo, hi + 1):
+            pos[tour[idx]] = idx
+
+    def two_opt(a: int) -> Tuple[int, ...]:
+        """First improving 2-opt move at point a; returns the points whose legs changed."""
+        i = pos[a]
+        if i < last:
+            b = tour[i + 1]
+            d_ab = dist(a, b)
+            for d_ac, c in near(a):
+                if d_ac >= d_ab:
+                    break
+                j = pos[c]
+                if j == last or j == i + 1 or j == i - 1:
+                    continue
+                d = tour[j + 1]
+                if d_ac + dist(b, d) - d_ab - dist(c, d) < -MIN_GAIN:
+                    reverse(i + 1, j) if j > i else reverse(j + 1, i)
+                    return a, b, c, d
+        if i > 0:
+            b = tour[i - 1]
+            d_ab = dist(a, b)
+            for d_ac, c in near(a):
+                if d_ac >= d_ab:
+                    break
+                j = pos[c]
+                if j == 0 or j == i - 1 or j == i + 1:
+                    continue
+                d = tour[j - 1]
+                if d_ac + dist(b, d) - d_ab - dist(c, d) < -MIN_GAIN:
+                    reverse(j, i - 1) if j < i else reverse(i, j - 1)
+                    return a, b, c, d
+        return ()
+
+    def or_opt(a: int) -> Tuple[int, ...]:
+        """Move the run of 1-3 points starting at a next to one of their neighbors."""
+        i = pos[a]
+        if i == 0:
+            return ()
+        for length in (1, 2, 3):
+            end = i + length - 1
+            if end >= last:
+                break
+            p, s1, s2, n = tour[i - 1], a, tour[end], tour[end + 1]
+            removed = dist(p, s1) + dist(s2, n) - dist(p, n)
+            if removed <= MIN_GAIN:
+                continue
+            for s in (s1, s2):
+                for d_sc, c in near(s):
+                    if d_sc >= removed:
+                        break
+                    j = pos[c]
+                    for k in (j - 1, j):
+                        # the leg (tour[k], tour[k + 1]) must lie outside p..n
+                        if k < 0 or k >= last or i - 1 <= k <= end:
+                            continue
+                        u, w = tour[k], tour[k + 1]
+                        d_uw = dist(u, w)
+                        forward = dist(u, s1) + dist(s2, w) - d_uw
+                        backward = dist(u, s2) + dist(s1, w) - d_uw
+                        if min(forward, backward) - removed < -MIN_GAIN:
+                            run = tour[i:end + 1]
+                            if backward < forward:
+                                run.reverse()
+                            del tour[i:end + 1]
+                            at = k + 1 if k < i else k + 1 - length
+                            tour[at:at] = run
+                            for idx in range(min(i, at), max(end, at + length - 1) + 1):
+                                pos[tour[idx]] = idx
+                            return p, n, u, w, s1, s2
+        return ()
+
+    queue = deque(range(m))
+    queued = [True] * m
+    while queue and time.perf_counter() < deadline:
+        a = queue.popleft()
+        queued[a] = False
+        touched = two_opt(a) or or_opt(a)
+        for point in touched:
+            if not queued[point]:
+                queued[point] = True
+                queue.append(point)
+        if touched and not queued[a]:
+            queued[a] = True
+            queue.append(a)
+
+    improved = [route[p] for p in tour]
+    total = route_total(improved, policy)
+    if total < original:
+        return list(route), original
+    return improved, total
@@ -21,12 +21,16 @@ class Node:
         region (str): Region type ('downtown', 'suburban', 'rural')
         priority (int): Priority level (1=highest, 5=lowest)
         is_depot (bool): Whether this is the starting depot
+        window_start (float): Earliest time service can start (default: 0.0)
+        window_end (float): Latest time service can start (default: no limit)
+        service_time (float): Time spent at the stop (default: 0.0)
     """
     
     def __init__(self, node_id: int, x: float, y: float, 
                  delivery_fee: float = 0.0, estimated_tip: float = 0.0,
                  region: str = "suburban", priority: int = 3, 
-                 is_depot: bool = False):
+                 is_depot: bool = False, window_start: float = 0.0,
+                 window_end: float = float("inf"), service_time: float = 0.0):
         self.id = node_id
         self.x = x
         self.y = y
@@ -35,6 +39,9 @@ class Node:
         self.region = region
         self.priority = priority
         self.is_depot = is_depot
+        self.window_start = window_start
+        self.window_end = window_end
+        self.service_time = service_time
     
     def distance_to(self, other_node) -> float:
         """
@@ -67,13 +74,18 @@ class Edge:
         self.u = u
         self.v = v
     
-    def get_distance(self) -> float:
+    def get_distance(self, oracle=None) -> float:
         """
         Calculate Euclidean distance between the two nodes.
         
+        Args:
+            oracle (DistanceOracle, optional): Distance cache to look the pair up in
+        
         Returns:
             float: Distance between nodes u and v
         """
+        if oracle is not None:
+            return oracle.distance(self.u, self.v)
         return self.u.distance_to(self.v)
     
     def __repr__(self):
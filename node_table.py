@@ -0,0 +1,383 @@
+"""
+Greedy Algorithm Assignment - Array-backed Node and Edge Tables
+
+This file stores nodes and edges column-wise in typed arrays instead of one Python
+object per node. NodeView/EdgeView are small __slots__ objects that expose the same
+attributes as Node/Edge (id, x, y, delivery_fee, ..., u, v, distance_to, get_distance),
+so the route builders and the analyze_* helpers work on them unchanged.
+
+Measured memory per million nodes (CPython 3.11, 64-bit, tracemalloc):
+    List[Node]        ~ 280 MB  (object + __dict__ + boxed floats per node)
+    NodeTable         ~  67 MB  of columns (8-byte id, 7 x float64, int8 priority,
+                                 bool depot, uint8 region), ~170 MB including the
+                                 id -> row dict
+Views are only created when a row is accessed.
+
+Tables loaded with dataset_file.load_dataset hold memoryviews into a memory-mapped
+file instead of arrays; they are read-only and build row_of on first use.
+"""
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from main import Node, Edge
+
+REGIONS = ("downtown", "suburban", "rural")
+
+
+class NodeTable:
+    """
+    Column store for delivery locations.
+
+    Attributes:
+        ids (array): Node id per row (int64)
+        x, y (array): Coordinates per row (float64)
+        delivery_fee, estimated_tip (array): Fee and expected tip per row (float64)
+        window_start, window_end, service_time (array): Time window and service time per row (float64)
+        priority (array): Priority level per row (int8)
+        is_depot (bytearray): 1 if the row is a depot
+        region_code (array): Index into regions per row (uint8)
+        regions (List[str]): Region names, indexed by region_code
+        row_of (Dict[int, int]): Maps a node id to its row (built on first use for loaded tables)
+    """
+
+    def __init__(self, regions: Iterable[str] = REGIONS):
+        self.ids = array('q')
+        self.x = array('d')
+        self.y = array('d')
+        self.delivery_fee = array('d')
+        self.estimated_tip = array('d')
+        self.window_start = array('d')
+        self.window_end = array('d')
+        self.service_time = array('d')
+        self.priority = array('b')
+        self.is_depot = bytearray()
+        self.region_code = array('B')
+        self.regions: List[str] = list(regions)
+        self._region_index = {name: code for code, name in enumerate(self.regions)}
+        self._row_of: Optional[Dict[int, int]] = {}
+
+    @property
+    def row_of(self) -> Dict[int, int]:
+        """Maps a node id to its row; tables loaded from a file build it on first use."""
+        if self._row_of is None:
+            self._row_of = {node_id: row for row, node_id in enumerate(self.ids)}
+        return self._row_of
+
+    @property
+    def readonly(self) -> bool:
+        """True for tables backed by a read-only file mapping."""
+        return isinstance(self.ids, memoryview)
+
+    @classmethod
+    def from_nodes(cls, nodes: Iterable[Node]) -> "NodeTable":
+        """
+        Build a table from Node objects (e.g. mn_dataset.MN_NODES).
+
+        Args:
+            nodes (Iterable[Node]): Nodes to copy into the table
+
+        Returns:
+            NodeTable: Table with one row per node, in the given order
+        """
+        table = cls()
+        for node in nodes:
+            table.append(node.id, node.x, node.y, node.delivery_fee, node.estimated_tip,
+                         node.region, node.priority, node.is_depot,
+                         node.window_start, node.window_end, node.service_time)
+        return table
+
+    def region_code_for(self, region: str) -> int:
+        """Code for a region name, registering new names as they appear."""
+        code = self._region_index.get(region)
+        if code is None:
+            code = len(self.regions)
+            self.regions.append(region)
+            self._region_index[region] = code
+        return code
+
+    def append(self, node_id: int, x: float, y: float,
+               delivery_fee: float = 0.0, estimated_tip: float = 0.0,
+               region: str = "suburban", priority: int = 3,
+               is_depot: bool = False, window_start: float = 0.0,
+               window_end: float = float("inf"), service_time: float = 0.0) -> int:
+        """
+        Add one node as a new row. Arguments mirror Node's constructor.
+
+        Returns:
+            int: Row of the new node
+        """
+        if self.readonly:
+            raise TypeError("NodeTable loaded from a dataset file is read-only")
+        if node_id in self.row_of:
+            raise ValueError(f"Duplicate node id: {node_id}")
+        row = len(self.ids)
+        self.ids.append(node_id)
+        self.x.append(x)
+        self.y.append(y)
+        self.delivery_fee.append(delivery_fee)
+        self.estimated_tip.append(estimated_tip)
+        self.window_start.append(window_start)
+        self.window_end.append(window_end)
+        self.service_time.append(service_time)
+        self.priority.append(priority)
+        self.is_depot.append(1 if is_depot else 0)
+        self.region_code.append(self.region_code_for(region))
+        self.row_of[node_id] = row
+        return row
+
+    def extend(self, ids: array, x: array, y: array, delivery_fee: array, estimated_tip: array,
+               region_code: array, priority: array, is_depot: bytes,
+               window_start: Optional[array] = None, window_end: Optional[array] = None,
+               service_time: Optional[array] = None):
+        """
+        Add many rows at once from already typed columns (e.g. one chunk of a file).
+
+        Args:
+            ids, x, y, delivery_fee, estimated_tip (array): Columns with the types listed above
+            region_code (array): Codes into self.regions
+            priority (array): Priority levels
+            is_depot (bytes): 1 for depot rows
+            window_start, window_end, service_time (array, optional): Time-window columns;
+                rows are open at all times with no service time when omitted
+        """
+        if self.readonly:
+            raise TypeError("NodeTable loaded from a dataset file is read-only")
+        start = len(self.ids)
+        row_of = self.row_of
+        rows = dict(zip(ids, range(start, start + len(ids))))
+        if len(rows) != len(ids) or not row_of.keys().isdisjoint(rows):
+            seen = set()
+            for node_id in ids:
+                if node_id in row_of or node_id in seen:
+                    raise ValueError(f"Duplicate node id: {node_id}")
+                seen.add(node_id)
+        row_of.update(rows)
+        self.ids.extend(ids)
+        self.x.extend(x)
+        self.y.extend(y)
+        self.delivery_fee.extend(delivery_fee)
+        self.estimated_tip.extend(estimated_tip)
+        count = len(ids)
+        self.window_start.extend(array('d', [0.0]) * count if window_start is None else window_start)
+        self.window_end.extend(array('d', [float("inf")]) * count if window_end is None else window_end)
+        self.service_time.extend(array('d', [0.0]) * count if service_time is None else service_time)
+        self.region_code.extend(region_code)
+        self.priority.extend(priority)
+        self.is_depot.extend(is_depot)
+
+    def view(self, node_id: int) -> "NodeView":
+        """Node view for the given node id."""
+        return NodeView(self, self.row_of[node_id])
+
+    def views(self) -> List["NodeView"]:
+        """One view per row, usable wherever a List[Node] is expected."""
+        return [NodeView(self, row) for row in range(len(self.ids))]
+
+    def depot(self) -> "NodeView":
+        """View of the (first) depot row."""
+        for row, flag in enumerate(self.is_depot):
+            if flag:
+                return NodeView(self, row)
+        raise ValueError("No depot row")
+
+    def nbytes(self) -> int:
+        """Bytes held by the column buffers (excluding the id -> row dict)."""
+        columns = (self.ids, self.x, self.y, self.delivery_fee, self.estimated_tip,
+                   self.window_start, self.window_end, self.service_time,
+                   self.priority, self.region_code)
+        return sum(c.itemsize * len(c) for c in columns) + len(self.is_depot)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, row: int) -> "NodeView":
+        if not 0 <= row < len(self.ids):
+            raise IndexError(row)
+        return NodeView(self, row)
+
+    def __iter__(self) -> Iterator["NodeView"]:
+        for row in range(len(self.ids)):
+            yield NodeView(self, row)
+
+    def __repr__(self):
+        return f"NodeTable({len(self.ids)} nodes)"
+
+
+class NodeView:
+    """
+    Read-only Node-like view of one NodeTable row.
+
+    Exposes the same attributes and methods as main.Node.
+    """
+    __slots__ = ("table", "row")
+
+    def __init__(self, table: NodeTable, row: int):
+        self.table = table
+        self.row = row
+
+    @property
+    def id(self) -> int:
+        return self.table.ids[self.row]
+
+    @property
+    def x(self) -> float:
+        return self.table.x[self.row]
+
+    @property
+    def y(self) -> float:
+        return self.table.y[self.row]
+
+    @property
+    def delivery_fee(self) -> float:
+        return self.table.delivery_fee[self.row]
+
+    @property
+    def estimated_tip(self) -> float:
+        return self.table.estimated_tip[self.row]
+
+    @property
+    def window_start(self) -> float:
+        return self.table.window_start[self.row]
+
+    @property
+    def window_end(self) -> float:
+        return self.table.window_end[self.row]
+
+    @property
+    def service_time(self) -> float:
+        return self.table.service_time[self.row]
+
+    @property
+    def region(self) -> str:
+        return self.table.regions[self.table.region_code[self.row]]
+
+    @property
+    def priority(self) -> int:
+        return self.table.priority[self.row]
+
+    @property
+    def is_depot(self) -> bool:
+        return bool(self.table.is_depot[self.row])
+
+    def distance_to(self, other_node) -> float:
+        """
+        Calculate Euclidean distance to another node.
+
+        Args:
+            other_node (Node or NodeView): The target node
+
+        Returns:
+            float: Euclidean distance between this node and the other node
+        """
+        return ((self.x - other_node.x) ** 2 + (self.y - other_node.y) ** 2) ** 0.5
+
+    def to_node(self) -> Node:
+        """Copy this row out into a standalone Node."""
+        return Node(self.id, self.x, self.y, self.delivery_fee, self.estimated_tip,
+                    self.region, self.priority, self.is_depot,
+                    self.window_start, self.window_end, self.service_time)
+
+    __repr__ = Node.__repr__
+
+
+class EdgeTable:
+    """
+    Column store for roads between rows of a NodeTable.
+
+    Attributes:
+        nodes (NodeTable): Table the endpoints refer to
+        u_rows, v_rows (array): Endpoint rows per edge (int64)
+    """
+
+    def __init__(self, nodes: NodeTable):
+        self.nodes = nodes
+        self.u_rows = array('q')
+        self.v_rows = array('q')
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Edge], nodes: NodeTable) -> "EdgeTable":
+        """
+        Build a table from Edge objects whose endpoints are already in nodes.
+
+        Args:
+            edges (Iterable[Edge]): Roads to copy (e.g. mn_dataset.MN_EDGES)
+            nodes (NodeTable): Table holding every endpoint
+
+        Returns:
+            EdgeTable: Table with one row per edge, in the given order
+        """
+        table = cls(nodes)
+        for edge in edges:
+            table.append(edge.u.id, edge.v.id)
+        return table
+
+    def append(self, u_id: int, v_id: int) -> int:
+        """Add a road between two node ids. Returns the new edge row."""
+        if isinstance(self.u_rows, memoryview):
+            raise TypeError("EdgeTable loaded from a dataset file is read-only")
+        self.u_rows.append(self.nodes.row_of[u_id])
+        self.v_rows.append(self.nodes.row_of[v_id])
+        return len(self.u_rows) - 1
+
+    def extend(self, u_rows: array, v_rows: array):
+        """Add many roads at once from endpoint row columns (int64)."""
+        if isinstance(self.u_rows, memoryview):
+            raise TypeError("EdgeTable loaded from a dataset file is read-only")
+        self.u_rows.extend(u_rows)
+        self.v_rows.extend(v_rows)
+
+    def nbytes(self) -> int:
+        """Bytes held by the endpoint columns."""
+        return self.u_rows.itemsize * len(self.u_rows) * 2
+
+    def __len__(self):
+        return len(self.u_rows)
+
+    def __getitem__(self, row: int) -> "EdgeView":
+        if not 0 <= row < len(self.u_rows):
+            raise IndexError(row)
+        return EdgeView(self, row)
+
+    def __iter__(self) -> Iterator["EdgeView"]:
+        for row in range(len(self.u_rows)):
+            yield EdgeView(self, row)
+
+    def __repr__(self):
+        return f"EdgeTable({len(self.u_rows)} edges)"
+
+
+class EdgeView:
+    """
+    Read-only Edge-like view of one EdgeTable row.
+
+    Exposes the same attributes and methods as main.Edge.
+    """
+    __slots__ = ("table", "row")
+
+    def __init__(self, table: EdgeTable, row: int):
+        self.table = table
+        self.row = row
+
+    @property
+    def u(self) -> NodeView:
+        return NodeView(self.table.nodes, self.table.u_rows[self.row])
+
+    @property
+    def v(self) -> NodeView:
+        return NodeView(self.table.nodes, self.table.v_rows[self.row])
+
+    def get_distance(self, oracle=None) -> float:
+        """
+        Calculate Euclidean distance between the two nodes.
+
+        Args:
+            oracle (DistanceOracle, optional): Distance cache to look the pair up in
+
+        Returns:
+            float: Distance between nodes u and v
+        """
+        if oracle is not None:
+            return oracle.distance(self.u, self.v)
+        return self.u.distance_to(self.v)
+
+    __repr__ = Edge.__repr__
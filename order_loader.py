@@ -0,0 +1,297 @@
+"""
+Greedy Algorithm Assignment - Streaming Order Import
+
+Orders arrive as CSV or JSONL exports (one order per row/line) rather than as
+Node(...) literals like mn_dataset.py. This file reads them in fixed-size chunks,
+so parsing memory stays bounded however large the file is, and appends each
+chunk to a NodeTable (orders) or EdgeTable (roads) as whole typed columns.
+
+Each chunk is transposed into columns and converted column by column
+(array(code, map(float, column)) and friends), and the checks run on whole
+columns too (min/max, set membership); rows are only looked at one by one to
+point at the offending row once a column fails. CSV chunks without quoting are
+split in one str.split call instead of going through csv.reader.
+
+Order columns (CSV header names / JSON keys, any order, extra ones ignored):
+    id, x, y, delivery_fee, estimated_tip, region, priority, is_depot
+Road columns:
+    u, v  (node ids)
+
+Checks: one JSON object per JSONL line; integer ids, unique across the file;
+finite numbers; priority 1-5; region one of downtown / suburban / rural;
+is_depot 0/1/true/false; exactly one depot in the file; roads between known
+node ids. Every failure names the file and the row.
+"""
+import csv
+import json
+import math
+from array import array
+from itertools import islice, repeat
+from operator import itemgetter
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from node_table import NodeTable, EdgeTable, REGIONS
+
+ORDER_FIELDS = ("id", "x", "y", "delivery_fee", "estimated_tip", "region", "priority", "is_depot")
+ROAD_FIELDS = ("u", "v")
+CHUNK_ROWS = 65536
+PRIORITY_RANGE = (1, 5)
+
+_DEPOT_FLAGS = {"1": 1, "0": 0, "true": 1, "false": 0, "True": 1, "False": 0, True: 1, False: 0}
+# single-digit text columns (priority, is_depot) map straight to bytes: "0".."9" -> 0..9
+_DIGITS = bytes.maketrans(b"0123456789", bytes(range(10)))
+
+
+def _format_of(path: str, format: Optional[str]) -> str:
+    if format is None:
+        format = "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+    if format not in ("csv", "jsonl"):
+        raise ValueError(f"Unknown format: {format!r}")
+    return format
+
+
+def _raw_chunks(path: str, fields: Sequence[str], chunk_rows: int,
+                format: Optional[str]) -> Iterator[Tuple[Sequence[int], List[tuple]]]:
+    """
+    Yield (row numbers, [column per field]) with the raw values of each chunk.
+
+    Rows are numbered by line, 1 for the line after a CSV header, so blank lines
+    (which are skipped) and quoted values spanning lines still count.
+    """
+    if _format_of(path, format) == "csv":
+        with open(path, newline="") as f:
+            header = next(csv.reader([f.readline()]), None)
+            if not header:
+                return
+            missing = [name for name in fields if name not in header]
+            if missing:
+                raise ValueError(f"{path}: missing columns {missing}")
+            width = len(header)
+            positions = [header.index(name) for name in fields]
+            picks = itemgetter(*positions)
+            first = 1
+            while True:
+                lines = list(islice(f, chunk_rows))
+                if not lines:
+                    return
+                text = "".join(lines)
+                if '"' not in text and set(map(str.count, lines, repeat(","))) == {width - 1}:
+                    # no quoting and every line has the right number of fields: split the
+                    # whole chunk at once and take every width-th field for each column
+                    if "\r" in text:
+                        text = text.replace("\r", "")
+                    flat = text.replace("\n", ",").split(",")
+                    if text.endswith("\n"):
+                        flat.pop()
+                    yield range(first, first + len(lines)), [flat[p::width] for p in positions]
+                    first += len(lines)
+                    continue
+                reader = csv.reader(lines)
+                rows, numbers, start = [], [], 0
+                for row in reader:
+                    if row:
+                        rows.append(row)
+                        numbers.append(first + start)
+                    start = reader.line_num
+                first += len(lines)
+                if not rows:
+                    continue
+                widths = set(map(len, rows))
+                if widths != {width}:
+                    bad = next(i for i, row in enumerate(rows) if len(row) != width)
+                    raise ValueError(f"{path}: row {numbers[bad]} has {len(rows[bad])} fields, "
+                                     f"expected {width}")
+                yield numbers, list(zip(*map(picks, rows)))
+    else:
+        with open(path) as f:
+            first = 1
+            while True:
+                lines = list(islice(f, chunk_rows))
+                if not lines:
+                    return
+                numbers = [first + i for i, line in enumerate(lines) if line.strip()]
+                first += len(lines)
+                if not numbers:
+                    continue
+                # one parse per chunk instead of one json.loads call per line
+                try:
+                    records = json.loads("[" + ",".join(line for line in lines if line.strip()) + "]")
+                except json.JSONDecodeError:
+                    for number, line in zip(numbers, (line for line in lines if line.strip())):
+                        try:
+                            json.loads(line)
+                        except json.JSONDecodeError as error:
+                            raise ValueError(f"{path}: row {number}: invalid JSON ({error.msg})") from None
+                    raise
+                if not all(isinstance(record, dict) for record in records):
+                    bad = next(i for i, r in enumerate(records) if not isinstance(r, dict))
+                    raise ValueError(f"{path}: row {numbers[bad]}: expected a JSON object, "
+                                     f"got {type(records[bad]).__name__}")
+                try:
+                    yield numbers, list(zip(*map(itemgetter(*fields), records)))
+                except KeyError as missing:
+                    bad = next(i for i, r in enumerate(records) if any(k not in r for k in fields))
+                    raise ValueError(f"{path}: row {numbers[bad]} is missing {missing}") from None
+
+
+def _convert(path: str, rows: Sequence[int], name: str, code: str, values: tuple, parse) -> array:
+    """Typed column from raw values, naming the first bad row if one doesn't parse."""
+    try:
+        column = array(code, map(parse, values))
+    except (TypeError, ValueError, OverflowError):
+        for i, value in enumerate(values):
+            try:
+                array(code, [parse(value)])
+            except (TypeError, ValueError, OverflowError):
+                raise ValueError(f"{path}: row {rows[i]}: bad {name} {value!r}") from None
+        raise
+    return column
+
+
+def _check(path: str, rows: Sequence[int], name: str, values, ok, rule: str):
+    """Raise for the first value failing ok (only scanned row by row once something fails)."""
+    for i, value in enumerate(values):
+        if not ok(value):
+            raise ValueError(f"{path}: row {rows[i]}: {name} {rule}, got {value!r}")
+
+
+def _integers(path: str, rows: Sequence[int], name: str, code: str, values: tuple) -> array:
+    """Typed integer column; JSON floats and booleans are rejected rather than converted by int()."""
+    types = set(map(type, values))
+    if float in types or bool in types:
+        _check(path, rows, name, values, lambda v: not isinstance(v, (float, bool)), "must be an integer")
+    return _convert(path, rows, name, code, values, int)
+
+
+def _lookup(mapping: dict, values) -> list:
+    """mapping.get for every value, None for values that can't be keys (JSON lists and objects)."""
+    try:
+        return list(map(mapping.get, values))
+    except TypeError:
+        return [mapping.get(v) if isinstance(v, (str, int, float)) else None for v in values]
+
+
+def _digit_bytes(values) -> Optional[bytes]:
+    """Column of one-character digit strings as bytes 0-9, or None if it isn't one."""
+    if not values or not isinstance(values[0], str):
+        return None
+    text = "".join(values)
+    if len(text) != len(values) or not text.isdigit() or not text.isascii():
+        return None
+    return text.encode("ascii").translate(_DIGITS)
+
+
+def iter_order_chunks(path: str, chunk_rows: int = CHUNK_ROWS,
+                      format: Optional[str] = None) -> Iterator[Dict[str, array]]:
+    """
+    Read orders in chunks of typed, validated columns.
+
+    The "exactly one depot" and unique-id checks span chunks, so they are left to load_orders.
+
+    Args:
+        path (str): CSV or JSONL file (chosen by extension unless format is given)
+        chunk_rows (int): Rows parsed at a time
+        format (str, optional): "csv" or "jsonl"
+
+    Returns:
+        Iterator[Dict[str, array]]: Columns named like NodeTable's (region as region_code)
+    """
+    for _, columns in _order_chunks(path, chunk_rows, format):
+        yield columns
+
+
+def _order_chunks(path: str, chunk_rows: int,
+                  format: Optional[str]) -> Iterator[Tuple[Sequence[int], Dict[str, array]]]:
+    """iter_order_chunks, with the row numbers of each chunk."""
+    region_codes = {name: code for code, name in enumerate(REGIONS)}
+    low, high = PRIORITY_RANGE
+    for rows, (ids, xs, ys, fees, tips, regions, priorities, depots) in \
+            _raw_chunks(path, ORDER_FIELDS, chunk_rows, format):
+        columns = {"ids": _integers(path, rows, "id", "q", ids)}
+        for name, raw in (("x", xs), ("y", ys), ("delivery_fee", fees), ("estimated_tip", tips)):
+            column = columns[name] = _convert(path, rows, name, "d", raw, float)
+            # the sum is finite unless some value isn't (or it overflows, and the scan passes)
+            if not math.isfinite(sum(column)):
+                _check(path, rows, name, column, math.isfinite, "must be a finite number")
+
+        digits = _digit_bytes(priorities)
+        if digits is not None:
+            priority = array("b", digits)
+        else:
+            priority = _integers(path, rows, "priority", "b", priorities)
+        if min(priority) < low or max(priority) > high:
+            _check(path, rows, "priority", priority, lambda p: low <= p <= high, f"must be {low}-{high}")
+        columns["priority"] = priority
+
+        codes = _lookup(region_codes, regions)
+        if None in codes:
+            _check(path, rows, "region", regions, lambda r: isinstance(r, str) and r in region_codes,
+                   f"must be one of {REGIONS}")
+        columns["region_code"] = array("B", codes)
+
+        flags = _digit_bytes(depots)
+        if flags is None or max(flags) > 1:
+            flags = _lookup(_DEPOT_FLAGS, depots)
+            if None in flags:
+                _check(path, rows, "is_depot", depots, lambda d: _lookup(_DEPOT_FLAGS, [d]) != [None],
+                       "must be 0/1/true/false")
+        columns["is_depot"] = bytes(flags)
+        yield rows, columns
+
+
+def load_orders(path: str, chunk_rows: int = CHUNK_ROWS, format: Optional[str] = None) -> NodeTable:
+    """
+    Load an order export into a NodeTable, one chunk at a time.
+
+    Args:
+        path (str): CSV or JSONL file (chosen by extension unless format is given)
+        chunk_rows (int): Rows parsed at a time; bounds the parsing memory
+        format (str, optional): "csv" or "jsonl"
+
+    Returns:
+        NodeTable: One row per order, in file order
+    """
+    table = NodeTable()
+    for rows, columns in _order_chunks(path, chunk_rows, format):
+        try:
+            table.extend(**columns)
+        except ValueError:
+            # extend checks before adding anything; find the first repeated id for the message
+            row_of, seen = table.row_of, set()
+            for number, node_id in zip(rows, columns["ids"]):
+                if node_id in row_of or node_id in seen:
+                    raise ValueError(f"{path}: row {number}: duplicate id {node_id}") from None
+                seen.add(node_id)
+            raise
+    depots = table.is_depot.count(1)
+    if depots != 1:
+        raise ValueError(f"{path}: expected exactly one depot, found {depots}")
+    return table
+
+
+def load_roads(path: str, nodes: NodeTable, chunk_rows: int = CHUNK_ROWS,
+               format: Optional[str] = None) -> EdgeTable:
+    """
+    Load a road export (u, v node-id pairs) into an EdgeTable over the given nodes.
+
+    Args:
+        path (str): CSV or JSONL file (chosen by extension unless format is given)
+        nodes (NodeTable): Table holding every endpoint
+        chunk_rows (int): Rows parsed at a time
+        format (str, optional): "csv" or "jsonl"
+
+    Returns:
+        EdgeTable: One row per road, in file order
+    """
+    table = EdgeTable(nodes)
+    row_of = nodes.row_of
+    for rows, (us, vs) in _raw_chunks(path, ROAD_FIELDS, chunk_rows, format):
+        ends = []
+        for name, raw in (("u", us), ("v", vs)):
+            ids = _integers(path, rows, name, "q", raw)
+            try:
+                ends.append(array("q", map(row_of.__getitem__, ids)))
+            except KeyError:
+                _check(path, rows, name, ids, row_of.__contains__, "must be a known node id")
+        table.extend(*ends)
+    return table
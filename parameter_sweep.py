@@ -0,0 +1,373 @@
+"""
+Greedy Algorithm Assignment - Ethical Rule Parameter Sweeps
+
+The Part C rules come with fixed constants (the $3.00 high-tip threshold, the
++3/-2/+2 fairness bonuses, the 15-mile fatigue threshold, the priority-ratio
+bonuses). This file plans greedy_ethical_route for every combination in a
+parameter grid to show how earnings trade off against the rule's effect.
+
+Points are planned on a process pool that receives the graph once, through the
+batch planner's pool initializer. As results come back, in point order, they are
+measured in batches with route_analytics and appended to a columnar results file
+chunk by chunk, so a long sweep can be read while it runs and never has to fit in
+memory as Node routes.
+
+Every route is measured with the same (default) metric definitions, whatever
+thresholds its rule was given, so points stay comparable. pareto_front() picks
+the points no other point beats on both earnings and one metric.
+
+Results file layout:
+    0   magic b"GRDYSWP1"
+    8   header length, uint64 little-endian
+    16  header: UTF-8 JSON with the version, byte order, rule names and the
+        (name, typecode) of every column
+    ..  chunks, each a uint64 row count followed by every column's values for
+        those rows, in header order
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import struct
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from main import Node, Edge
+from adjacency import AdjacencyIndex
+from datasets import get_dataset
+from node_table import NodeTable
+from policies import ETHICAL_RULES, ethical_policy
+from greedy_approach import greedy_ethical_route
+from route_analytics import analyze_ragged
+from batch_planner import init_worker, worker_graph
+
+MAGIC = b"GRDYSWP1"
+VERSION = 1
+METRIC_COLUMNS = (("stops", "q"), ("high_tip", "q"), ("alternations", "q"), ("long_drives", "q"),
+                  ("max_consecutive_long", "q"), ("distance", "d"), ("urgent", "q"),
+                  ("avg_urgent_position", "d"), ("company_profit", "d"))
+
+# metric -> True if larger is better; the metrics analyze_fairness_impact,
+# analyze_fatigue_impact and analyze_priority_impact report
+PARETO_METRICS = {"alternations": True, "long_drives": False, "max_consecutive_long": False,
+                  "avg_urgent_position": False}
+
+
+class SweepPoint(NamedTuple):
+    """
+    One parameter combination.
+
+    Attributes:
+        rule (str): "fairness", "fatigue" or "priority"
+        params (Tuple[Tuple[str, float], ...]): Constructor arguments of the rule's policy
+    """
+    rule: str
+    params: Tuple[Tuple[str, float], ...] = ()
+
+
+def parameter_grid(rule: str, **values: Sequence[float]) -> List[SweepPoint]:
+    """
+    Every combination of the given parameter values for one rule.
+
+    Args:
+        rule (str): "fairness", "fatigue" or "priority"
+        **values: Values to try per constructor argument of the rule's policy,
+            e.g. alternate_bonus=[1.0, 3.0, 5.0]; other arguments keep their defaults
+
+    Returns:
+        List[SweepPoint]: One point per combination, the last parameter varying fastest
+    """
+    if rule not in ETHICAL_RULES:
+        raise ValueError(f"Unknown ethical rule: {rule!r}")
+    names = list(values)
+    # unknown parameter names raise TypeError here rather than in a worker
+    ethical_policy(rule, **{name: values[name][0] for name in names if values[name]})
+    return [SweepPoint(rule, tuple(zip(names, combination)))
+            for combination in itertools.product(*(values[name] for name in names))]
+
+
+class SweepResults:
+    """
+    Columns of a finished sweep, one row per point.
+
+    Attributes:
+        rules (List[str]): Rule names; the "rule" column holds indices into it
+        columns (Dict[str, array]): "point" (index in the sweep), "rule", one
+            "param:<name>" column per swept parameter (NaN where the point's rule
+            doesn't take it), "total" (driver earnings) and the METRIC_COLUMNS
+    """
+
+    def __init__(self, rules: List[str], columns: Dict[str, array]):
+        self.rules = rules
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.columns["point"])
+
+    def __getitem__(self, name: str) -> array:
+        return self.columns[name]
+
+    def row(self, index: int) -> dict:
+        """One point as a dict, with its rule name and only the parameters it was given."""
+        result = {}
+        for name, column in self.columns.items():
+            value = column[index]
+            if name == "rule":
+                value = self.rules[value]
+            elif name.startswith("param:") and math.isnan(value):
+                continue
+            result[name] = value
+        return result
+
+    def pareto_front(self, metric: str, maximize: Optional[bool] = None) -> List[int]:
+        """
+        Rows no other row beats on both earnings ("total") and metric.
+
+        Args:
+            metric (str): A metric column, e.g. "alternations"
+            maximize (bool, optional): Whether larger metric values are better
+                (default: from PARETO_METRICS)
+
+        Returns:
+            List[int]: Row indices, by decreasing earnings
+        """
+        if maximize is None:
+            maximize = PARETO_METRICS[metric]
+        return pareto_front(self.columns["total"], self.columns[metric], maximize)
+
+    def pareto_fronts(self) -> Dict[str, List[int]]:
+        """pareto_front() for every metric in PARETO_METRICS."""
+        return {metric: self.pareto_front(metric) for metric in PARETO_METRICS}
+
+
+def pareto_front(earnings: Sequence[float], values: Sequence[float], maximize: bool = True) -> List[int]:
+    """
+    Indices of the points not dominated on (earnings, value): no other point has
+    earnings and value at least as good and one of them strictly better. Points
+    with a NaN value are left out; identical points are all kept.
+
+    Args:
+        earnings (Sequence[float]): Larger is better
+        values (Sequence[float]): The other objective
+        maximize (bool): Whether larger values are better
+
+    Returns:
+        List[int]: Indices, by decreasing earnings (then best value, then index)
+    """
+    sign = 1.0 if maximize else -1.0
+    order = sorted((i for i in range(len(values)) if not math.isnan(values[i])),
+                   key=lambda i: (-earnings[i], -sign * values[i], i))
+    front: List[int] = []
+    best = -math.inf        # best value among points with strictly higher earnings
+    start = 0
+    while start < len(order):
+        level = earnings[order[start]]
+        end = start
+        while end < len(order) and earnings[order[end]] == level:
+            end += 1
+        top = sign * values[order[start]]
+        if top > best:
+            front.extend(i for i in order[start:end] if sign * values[i] == top)
+            best = top
+        start = end
+    return front
+
+
+# ---------------------------------------------------------------------- planning
+
+def _sweep_route(graph: AdjacencyIndex, depot_id: int, point: SweepPoint) -> Tuple[List[int], float]:
+    """Plan one point's route over every customer. Returns the route as node ids, plus the total."""
+    depot = graph.nodes[graph.slot_of[depot_id]]
+    nodes = [depot] + [node for node in graph.nodes if not node.is_depot]
+    route, total = greedy_ethical_route(nodes, depot, graph, ethical_policy(point.rule, **dict(point.params)))
+    return [node.id for node in route], total
+
+
+def _sweep_in_worker(task: Tuple[int, SweepPoint]) -> Tuple[List[int], float]:
+    return _sweep_route(worker_graph(), *task)
+
+
+def _planned(points: List[SweepPoint], depot_id: int, nodes: List[Node], edges: List[Edge],
+             workers: int, chunksize: Optional[int]) -> Iterator[Tuple[List[int], float]]:
+    """(route ids, total) per point, in point order, as they are planned."""
+    if workers == 1:
+        graph = AdjacencyIndex(edges, nodes)
+        for point in points:
+            yield _sweep_route(graph, depot_id, point)
+        return
+    if chunksize is None:
+        chunksize = max(1, len(points) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(nodes, edges)) as pool:
+        yield from pool.map(_sweep_in_worker, ((depot_id, point) for point in points), chunksize=chunksize)
+
+
+def _schema(points: List[SweepPoint]) -> Tuple[List[str], List[str], List[Tuple[str, str]]]:
+    """Rule names, swept parameter names and (name, typecode) of every results column."""
+    rules = sorted({point.rule for point in points})
+    params = sorted({name for point in points for name, _ in point.params})
+    columns = [("point", "q"), ("rule", "B")] + [(f"param:{name}", "d") for name in params]
+    return rules, params, columns + [("total", "d")] + list(METRIC_COLUMNS)
+
+
+def run_sweep(points: Iterable[SweepPoint], nodes: List[Node], depot: Node, edges: List[Edge],
+              path: Optional[str] = None, workers: Optional[int] = None,
+              chunksize: Optional[int] = None, flush_every: int = 256) -> SweepResults:
+    """
+    Plan greedy_ethical_route for every point and measure the routes.
+
+    Args:
+        points (Iterable[SweepPoint]): Parameter combinations, e.g. from parameter_grid
+        nodes (List[Node]): All delivery locations including depot
+        depot (Node): The starting depot location
+        edges (List[Edge]): All road connections
+        path (str, optional): Results file to stream the rows to (overwritten if it exists)
+        workers (int, optional): Worker processes (default: os.cpu_count()); 1 plans in this process
+        chunksize (int, optional): Points sent to a worker at a time (default: about 4 chunks per worker)
+        flush_every (int): Rows measured and written per chunk
+
+    Returns:
+        SweepResults: One row per point, in point order
+    """
+    points = list(points)
+    for point in points:
+        if point.rule not in ETHICAL_RULES:
+            raise ValueError(f"Unknown ethical rule: {point.rule!r}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(points)))
+    rules, params, schema = _schema(points)
+    columns = {name: array(code) for name, code in schema}
+    rule_index = {rule: i for i, rule in enumerate(rules)}
+    table = NodeTable.from_nodes(nodes)
+
+    out = open(path, "wb") if path is not None else None
+    try:
+        if out is not None:
+            _write_header(out, rules, schema)
+        start = 0
+        ids, offsets, totals = array("q"), array("q", [0]), []
+        planned = _planned(points, depot.id, nodes, edges, workers, chunksize)
+        for index, (route_ids, total) in enumerate(planned, 1):
+            ids.extend(route_ids)
+            offsets.append(len(ids))
+            totals.append(total)
+            if index - start < flush_every and index < len(points):
+                continue
+            metrics = analyze_ragged(ids, offsets, table)
+            for i, point in enumerate(points[start:index], start):
+                given = dict(point.params)
+                columns["point"].append(i)
+                columns["rule"].append(rule_index[point.rule])
+                for name in params:
+                    columns[f"param:{name}"].append(given.get(name, math.nan))
+            columns["total"].extend(totals)
+            for name, _ in METRIC_COLUMNS:
+                columns[name].extend(getattr(metrics, name))
+            if out is not None:
+                _write_chunk(out, columns, schema, start, index)
+            start = index
+            ids, offsets, totals = array("q"), array("q", [0]), []
+    finally:
+        if out is not None:
+            out.close()
+    return SweepResults(rules, columns)
+
+
+# ---------------------------------------------------------------------- results file
+
+def _write_header(out, rules: List[str], schema: List[Tuple[str, str]]):
+    header = json.dumps({"version": VERSION, "byteorder": sys.byteorder, "rules": rules,
+                         "columns": schema}).encode("utf-8")
+    out.write(MAGIC)
+    out.write(struct.pack("<Q", len(header)))
+    out.write(header)
+
+
+def _write_chunk(out, columns: Dict[str, array], schema: List[Tuple[str, str]], start: int, end: int):
+    out.write(struct.pack("<Q", end - start))
+    for name, _ in schema:
+        out.write(columns[name][start:end])
+    out.flush()
+
+
+def read_sweep(path: str) -> SweepResults:
+    """
+    Read a results file written by run_sweep (also while the sweep is still running).
+
+    Args:
+        path (str): Results file
+
+    Returns:
+        SweepResults: The rows of every complete chunk
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:8] != MAGIC:
+        raise ValueError(f"{path} is not a sweep results file")
+    (header_length,) = struct.unpack_from("<Q", data, 8)
+    header = json.loads(data[16:16 + header_length].decode("utf-8"))
+    if header["version"] != VERSION:
+        raise ValueError(f"Unsupported sweep results file version: {header['version']}")
+    schema = [tuple(column) for column in header["columns"]]
+    columns = {name: array(code) for name, code in schema}
+    row_size = sum(array(code).itemsize for _, code in schema)
+
+    position = 16 + header_length
+    while position + 8 <= len(data):
+        (rows,) = struct.unpack_from("<Q", data, position)
+        if position + 8 + rows * row_size > len(data):
+            break       # chunk still being written
+        position += 8
+        for name, code in schema:
+            size = rows * columns[name].itemsize
+            columns[name].frombytes(data[position:position + size])
+            position += size
+    if header["byteorder"] != sys.byteorder:
+        for column in columns.values():
+            column.byteswap()
+    return SweepResults(header["rules"], columns)
+
+
+# ---------------------------------------------------------------------- command line
+
+def _parse_values(text: str) -> List[Union[int, float]]:
+    """"1,2,3" or "0.5:3.0:0.5" (start:stop:step, stop included) -> values."""
+    if ":" in text:
+        start, stop, step = (float(part) for part in text.split(":"))
+        count = int(math.floor((stop - start) / step + 1e-9)) + 1
+        return [start + i * step for i in range(count)]
+    return [int(part) if part.lstrip("-").isdigit() else float(part) for part in text.split(",")]
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Sweep ethical-rule parameters on a dataset.")
+    parser.add_argument("rule", choices=sorted(ETHICAL_RULES))
+    parser.add_argument("params", nargs="*", metavar="NAME=VALUES",
+                        help='e.g. alternate_bonus=1,2,3 or high_tip_threshold=2.0:4.0:0.5')
+    parser.add_argument("--dataset", default="mn", help="dataset name or columnar dataset file (see datasets.py)")
+    parser.add_argument("--out", help="results file to write")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args(argv)
+
+    nodes, depot, edges = get_dataset(args.dataset)
+    values = {}
+    for item in args.params:
+        name, _, text = item.partition("=")
+        values[name] = _parse_values(text)
+    points = parameter_grid(args.rule, **values)
+    results = run_sweep(points, nodes, depot, edges, args.out, args.workers)
+    print(f"{len(results)} points")
+    for metric, front in results.pareto_fronts().items():
+        print(f"Pareto front, earnings vs {metric}:")
+        for index in front:
+            row = results.row(index)
+            params = ", ".join(f"{k[6:]}={v:g}" for k, v in row.items() if k.startswith("param:"))
+            print(f"  ${row['total']:.2f}  {metric}={row[metric]:g}  {params}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""
+Greedy Algorithm Assignment - Region-Partitioned Routing
+
+For state-scale inputs this file trades a little route quality for wall-clock
+time: the customers are split into partitions (by their region attribute, by
+k-means clustering of their coordinates, or into whole connected components of
+the roads between them), each partition is routed by the usual
+greedy builder in its own worker process, and the sub-routes are stitched into
+one depot-to-depot tour.
+
+Each worker only receives its own partition: the depot, the partition's
+customers and the roads between them. Roads leading out of a partition are never
+used by its greedy builder anyway (every other customer counts as visited), so a
+sub-route is exactly what the full graph would give for that customer set.
+
+Stitching is a cheap join: starting at the depot, the next sub-route is the one
+with an end closest to the current position, driven in whichever direction
+starts at that end. Joins are straight-line legs, like the routers' fallback
+jumps. The stitched tour is then valued leg by leg, and, unless compare=False,
+the monolithic greedy route is planned too so the lost profit can be reported.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from main import Node, Edge
+from adjacency import AdjacencyIndex
+from graph_components import ComponentIndex
+from greedy_approach import greedy_company_route, greedy_driver_route, greedy_ethical_route
+from route_analytics import analyze_routes
+
+METHODS = ("region", "kmeans", "components")
+
+
+class PartitionedRoute(NamedTuple):
+    """
+    A stitched route and how it compares with the monolithic greedy route.
+
+    Attributes:
+        route (List[Node]): Stops in order, depot first and last
+        total (float): Total profit/earnings of the stitched route
+        partitions (List[List[int]]): Customer ids of each sub-route, as driven
+        monolithic_total (float, optional): Total of the monolithic greedy route (None if not compared)
+        loss (float, optional): monolithic_total - total
+        seconds (Dict[str, float]): Wall-clock time of each phase ("partition", "plan",
+            "stitch" and, when compared, "monolithic")
+    """
+    route: List[Node]
+    total: float
+    partitions: List[List[int]]
+    monolithic_total: Optional[float]
+    loss: Optional[float]
+    seconds: Dict[str, float]
+
+
+def partition_by_region(customers: Sequence[Node]) -> List[List[Node]]:
+    """Group customers by region, in order of each region's first customer."""
+    groups: Dict[str, List[Node]] = {}
+    for node in customers:
+        groups.setdefault(node.region, []).append(node)
+    return list(groups.values())
+
+
+def partition_kmeans(customers: Sequence[Node], parts: int, iterations: int = 10,
+                     sample: int = 4096) -> List[List[Node]]:
+    """
+    Cluster customers by location with Lloyd's k-means.
+
+    Centers are fitted on an evenly spaced sample of at most sample customers and
+    every customer then goes to its nearest center. The first center is the first
+    sampled customer and each next one the sampled customer farthest from the
+    centers so far, so the result is deterministic.
+
+    Args:
+        customers (Sequence[Node]): Customers to split
+        parts (int): Number of clusters
+        iterations (int): Most Lloyd iterations (stops early once assignments settle)
+        sample (int): Most customers the centers are fitted on
+
+    Returns:
+        List[List[Node]]: The non-empty clusters
+    """
+    if not customers:
+        return []
+    parts = max(1, min(parts, len(customers)))
+    step = -(-len(customers) // sample)
+    xs = [node.x for node in customers[::step]]
+    ys = [node.y for node in customers[::step]]
+
+    def nearest_center(xs: List[float], ys: List[float]) -> List[int]:
+        # one column of squared distances per center, then the nearest center per customer
+        columns = [[(x - cx) ** 2 + (y - cy) ** 2 for x, y in zip(xs, ys)] for cx, cy in centers]
+        return [row.index(min(row)) for row in zip(*columns)]
+
+    centers = [(xs[0], ys[0])]
+    nearest = [(x - xs[0]) ** 2 + (y - ys[0]) ** 2 for x, y in zip(xs, ys)]
+    while len(centers) < min(parts, len(xs)):
+        far = max(range(len(nearest)), key=nearest.__getitem__)
+        cx, cy = xs[far], ys[far]
+        centers.append((cx, cy))
+        nearest = [min(d, (x - cx) ** 2 + (y - cy) ** 2) for d, x, y in zip(nearest, xs, ys)]
+
+    labels = None
+    for _ in range(iterations):
+        new_labels = nearest_center(xs, ys)
+        if new_labels == labels:
+            break
+        labels = new_labels
+        sums = [[0.0, 0.0, 0] for _ in centers]
+        for label, x, y in zip(labels, xs, ys):
+            entry = sums[label]
+            entry[0] += x
+            entry[1] += y
+            entry[2] += 1
+        centers = [(sx / count, sy / count) if count else center
+                   for (sx, sy, count), center in zip(sums, centers)]
+
+    clusters: List[List[Node]] = [[] for _ in centers]
+    for label, node in zip(nearest_center([n.x for n in customers], [n.y for n in customers]), customers):
+        clusters[label].append(node)
+    return [cluster for cluster in clusters if cluster]
+
+
+def partition_by_components(customers: Sequence[Node], edges: List[Edge], parts: int) -> List[List[Node]]:
+    """
+    Group the connected components of the roads between the customers into partitions.
+
+    A component is never split, so no sub-route has to jump to a part of its
+    partition it can't reach by road. Components are dealt largest first to the
+    partition with the fewest customers so far.
+
+    Args:
+        customers (Sequence[Node]): Customers to split
+        edges (List[Edge]): All road connections
+        parts (int): Most partitions
+
+    Returns:
+        List[List[Node]]: The non-empty partitions
+    """
+    graph = AdjacencyIndex(edges, list(customers))
+    slot_of = graph.slot_of
+    components = ComponentIndex(graph, [slot_of[node.id] for node in customers])
+    groups: List[List[Node]] = [[] for _ in range(max(1, min(parts, len(components))))]
+    for component in sorted(range(len(components)), key=lambda c: -len(components.members[c])):
+        min(groups, key=len).extend(components.nodes_of(component))
+    return [group for group in groups if group]
+
+
+def _greedy(nodes: List[Node], depot: Node, edges: List[Edge], objective: str,
+            ethical_rule: Optional[str]) -> Tuple[List[Node], float]:
+    if objective == "company":
+        return greedy_company_route(nodes, depot, edges)
+    if objective == "driver":
+        return greedy_driver_route(nodes, depot, edges)
+    return greedy_ethical_route(nodes, depot, edges, ethical_rule)
+
+
+def _plan_partition(task: tuple) -> List[int]:
+    """Greedy sub-route over one partition; returns its customer ids in visiting order."""
+    depot, customers, edges, objective, ethical_rule = task
+    route, _ = _greedy([depot] + customers, depot, edges, objective, ethical_rule)
+    return [node.id for node in route if not node.is_depot]
+
+
+def _partition_edges(edges: List[Edge], partitions: List[List[Node]], depot: Node) -> List[List[Edge]]:
+    """Roads inside each partition (the depot belongs to all of them)."""
+    part_of = {node.id: index for index, part in enumerate(partitions) for node in part}
+    inside: List[List[Edge]] = [[] for _ in partitions]
+    for edge in edges:
+        u, v = edge.u.id, edge.v.id
+        if u == depot.id:
+            u = v
+        elif v == depot.id:
+            v = u
+        part = part_of.get(u)
+        if part is not None and part_of.get(v) == part:
+            inside[part].append(edge)
+    return inside
+
+
+def stitch(depot: Node, segments: List[List[Node]]) -> Tuple[List[Node], List[int]]:
+    """
+    Join open sub-routes into one tour, nearest segment end first.
+
+    Args:
+        depot (Node): Where the tour starts and ends
+        segments (List[List[Node]]): Customer sequences, each driven forwards or backwards
+
+    Returns:
+        Tuple[List[Node], List[int]]: (tour, depot first and last; segment indices in tour order)
+    """
+    remaining = [i for i, segment in enumerate(segments) if segment]
+    route, order = [depot], []
+    here = depot
+    while remaining:
+        best, best_distance, reverse = None, None, False
+        for i in remaining:
+            segment = segments[i]
+            for flipped, end in ((False, segment[0]), (True, segment[-1])):
+                distance = here.distance_to(end)
+                if best_distance is None or distance < best_distance:
+                    best, best_distance, reverse = i, distance, flipped
+        remaining.remove(best)
+        order.append(best)
+        route.extend(reversed(segments[best]) if reverse else segments[best])
+        here = route[-1]
+    route.append(depot)
+    return route, order
+
+
+def partitioned_route(nodes: List[Node], depot: Node, edges: List[Edge], objective: str = "driver",
+                      ethical_rule: Optional[str] = None, method: str = "region",
+                      parts: Optional[int] = None, workers: Optional[int] = None,
+                      compare: bool = True) -> PartitionedRoute:
+    """
+    Route each partition of the customers in parallel and stitch the sub-routes.
+
+    Args:
+        nodes (List[Node]): All delivery locations including depot
+        depot (Node): The starting depot location
+        edges (List[Edge]): All road connections
+        objective (str): "company" (Part A), "driver" (Part B) or "ethical" (Part C)
+        ethical_rule (str, optional): Rule for the "ethical" objective
+        method (str): "region" (one partition per region), "kmeans" (spatial clusters)
+            or "components" (whole road components)
+        parts (int, optional): Partitions for "kmeans" and "components" (default: workers)
+        workers (int, optional): Worker processes (default: os.cpu_count()); 1 plans in this process
+        compare (bool): Also plan the monolithic greedy route and report the loss
+
+    Returns:
+        PartitionedRoute: The stitched route, its total and the comparison
+    """
+    if objective not in ("company", "driver", "ethical"):
+        raise ValueError(f"Unknown objective: {objective!r}")
+    if objective == "ethical" and ethical_rule is None:
+        raise ValueError("Ethical routes need an ethical_rule")
+    if method not in METHODS:
+        raise ValueError(f"Unknown partition method: {method!r}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    seconds = {}
+
+    start = time.perf_counter()
+    customers = [node for node in nodes if not node.is_depot]
+    if method == "region":
+        partitions = partition_by_region(customers)
+    elif method == "kmeans":
+        partitions = partition_kmeans(customers, parts or workers)
+    else:
+        partitions = partition_by_components(customers, edges, parts or workers)
+    inside = _partition_edges(edges, partitions, depot)
+    seconds["partition"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tasks = [(depot, part, part_edges, objective, ethical_rule) for part, part_edges in zip(partitions, inside)]
+    workers = max(1, min(workers, len(tasks)))
+    if workers == 1:
+        planned = [_plan_partition(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # largest partitions first, so one doesn't start last and hold up the rest
+            order = sorted(range(len(tasks)), key=lambda i: -len(partitions[i]))
+            results = dict(zip(order, pool.map(_plan_partition, [tasks[i] for i in order])))
+        planned = [results[i] for i in range(len(tasks))]
+    seconds["plan"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    by_id = {node.id: node for node in customers}
+    route, order = stitch(depot, [[by_id[node_id] for node_id in ids] for ids in planned])
+    metrics = analyze_routes([route])
+    total = (metrics.company_profit if objective == "company" else metrics.driver_earnings)[0]
+    seconds["stitch"] = time.perf_counter() - start
+
+    monolithic_total = loss = None
+    if compare:
+        start = time.perf_counter()
+        _, monolithic_total = _greedy(nodes, depot, edges, objective, ethical_rule)
+        seconds["monolithic"] = time.perf_counter() - start
+        loss = monolithic_total - total
+    driven, position = [], 1
+    for i in order:
+        driven.append([node.id for node in route[position:position + len(planned[i])]])
+        position += len(planned[i])
+    return PartitionedRoute(route, total, driven, monolithic_total, loss, seconds)
+
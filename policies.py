@@ -0,0 +1,354 @@
+"""
+Greedy Algorithm Assignment - Scoring Policies
+
+This file contains the pluggable scoring rules used by the policy-driven greedy
+router (greedy_approach.iter_policy_route). A policy scores a move from the
+current node to a candidate, and updates its own entries in the route state once
+a stop is chosen. Policies can be combined with weights, e.g. driver earnings
+plus fairness plus fatigue.
+
+Every policy has a scalar form (score, one candidate as Node objects) and a
+batched form (score_batch, a whole candidate set as ScoringEngine slots, with the
+distances computed once and shared by all terms). Both use the same floating-point
+operations, so they agree bit for bit.
+"""
+from typing import List, Optional, Protocol, Sequence, Tuple
+
+from main import Node, calculate_travel_cost
+from scoring import ScoringEngine, BASE_COST_PER_MILE, HIGH_TIP_THRESHOLD, LONG_DRIVE_MILES
+
+# (values per slot or None for all zeros, cost per mile, largest bonus): every score
+# of the policy is at most values[slot] - distance * cost_per_mile + bonus
+FallbackBound = Tuple[Optional[List[float]], float, float]
+
+
+class ScoringPolicy(Protocol):
+    """Interface every scoring policy implements."""
+
+    def init_state(self, state: dict):
+        """Add this policy's entries to a fresh route state."""
+
+    def score(self, current: Node, candidate: Node, state: dict) -> float:
+        """Score of moving from current to candidate."""
+
+    def score_batch(self, engine: ScoringEngine, current: int, slots: Sequence[int],
+                    dists: Sequence[float], state: dict) -> List[float]:
+        """Scores for many candidate slots; dists[i] is the distance to slots[i]."""
+
+    def update(self, state: dict, chosen: Node):
+        """Record the chosen stop; state["current"] is still the node it was chosen from."""
+
+    def fallback_bound(self, engine: ScoringEngine, state: dict) -> Optional[FallbackBound]:
+        """Upper bound used by the spatial index for fallback jumps, or None if there is none."""
+
+
+class CompanyPolicy:
+    """Part A: delivery_fee - travel_cost."""
+
+    def init_state(self, state: dict):
+        pass
+
+    def score(self, current: Node, candidate: Node, state: dict) -> float:
+        return candidate.delivery_fee - calculate_travel_cost(current.distance_to(candidate))
+
+    def score_batch(self, engine, current, slots, dists, state):
+        fee = engine.fee
+        return [fee[s] - d * BASE_COST_PER_MILE for s, d in zip(slots, dists)]
+
+    def update(self, state: dict, chosen: Node):
+        pass
+
+    def fallback_bound(self, engine, state):
+        return engine.fee, BASE_COST_PER_MILE, 0.0
+
+    def __repr__(self):
+        return "CompanyPolicy()"
+
+
+class DriverPolicy:
+    """Part B: delivery_fee + estimated_tip - travel_cost."""
+
+    def init_state(self, state: dict):
+        pass
+
+    def score(self, current: Node, candidate: Node, state: dict) -> float:
+        return (candidate.delivery_fee + candidate.estimated_tip
+                - calculate_travel_cost(current.distance_to(candidate)))
+
+    def score_batch(self, engine, current, slots, dists, state):
+        gain = engine.gain
+        return [gain[s] - d * BASE_COST_PER_MILE for s, d in zip(slots, dists)]
+
+    def update(self, state: dict, chosen: Node):
+        pass
+
+    def fallback_bound(self, engine, state):
+        return engine.gain, BASE_COST_PER_MILE, 0.0
+
+    def __repr__(self):
+        return "DriverPolicy()"
+
+
+class FairnessPolicy:
+    """
+    Alternate between high-tip and low-tip areas.
+
+    Bonus only: alternate_bonus when the tip level changes, repeat_penalty when it
+    doesn't, plus low_after_high_bonus for a low-tip stop right after a high-tip one.
+    """
+
+    def __init__(self, high_tip_threshold: float = HIGH_TIP_THRESHOLD, alternate_bonus: float = 3.0,
+                 repeat_penalty: float = -2.0, low_after_high_bonus: float = 2.0):
+        self.high_tip_threshold = high_tip_threshold
+        self.alternate_bonus = alternate_bonus
+        self.repeat_penalty = repeat_penalty
+        self.low_after_high_bonus = low_after_high_bonus
+
+    def init_state(self, state: dict):
+        # no history yet, so the first stop can be either kind
+        state["last_was_high_tip"] = False
+
+    def _bonus(self, is_high_tip: bool, last_high: bool) -> float:
+        bonus = self.alternate_bonus if is_high_tip != last_high else self.repeat_penalty
+        if not is_high_tip and last_high:
+            bonus += self.low_after_high_bonus
+        return bonus
+
+    def score(self, current: Node, candidate: Node, state: dict) -> float:
+        return self._bonus(candidate.estimated_tip >= self.high_tip_threshold, state["last_was_high_tip"])
+
+    def score_batch(self, engine, current, slots, dists, state):
+        last_high = state["last_was_high_tip"]
+        high, low = self._bonus(True, last_high), self._bonus(False, last_high)
+        tip, threshold = engine.tip, self.high_tip_threshold
+        return [high if tip[s] >= threshold else low for s in slots]
+
+    def update(self, state: dict, chosen: Node):
+        state["last_was_high_tip"] = chosen.estimated_tip >= self.high_tip_threshold
+
+    def fallback_bound(self, engine, state):
+        last_high = state["last_was_high_tip"]
+        return None, 0.0, max(self._bonus(True, last_high), self._bonus(False, last_high))
+
+    def __repr__(self):
+        return (f"FairnessPolicy(high_tip_threshold={self.high_tip_threshold}, "
+                f"alternate_bonus={self.alternate_bonus}, repeat_penalty={self.repeat_penalty}, "
+                f"low_after_high_bonus={self.low_after_high_bonus})")
+
+
+class FatiguePolicy:
+    """
+    Limit consecutive long drives.
+
+    Bonus only: after a long drive, another long one gets long_after_long_penalty
+    and a short "rest" drive gets rest_bonus. Drives are measured with state["distance"]
+    when the router provides one (road distance on a RoadNetwork), else in a straight line.
+    """
+
+    def __init__(self, long_drive_miles: float = LONG_DRIVE_MILES,
+                 long_after_long_penalty: float = -10.0, rest_bonus: float = 3.0):
+        self.long_drive_miles = long_drive_miles
+        self.long_after_long_penalty = long_after_long_penalty
+        self.rest_bonus = rest_bonus
+
+    def init_state(self, state: dict):
+        state["consecutive_long"] = 0
+
+    def score(self, current: Node, candidate: Node, state: dict) -> float:
+        if state["consecutive_long"] > 0:
+            is_long = state.get("distance", Node.distance_to)(current, candidate) >= self.long_drive_miles
+            return self.long_after_long_penalty if is_long else self.rest_bonus
+        return 0.0
+
+    def score_batch(self, engine, current, slots, dists, state):
+        if state["consecutive_long"] > 0:
+            long_miles, penalty, rest = self.long_drive_miles, self.long_after_long_penalty, self.rest_bonus
+            return [penalty if d >= long_miles else rest for d in dists]
+        return [0.0] * len(slots)
+
+    def update(self, state: dict, chosen: Node):
+        if state.get("distance", Node.distance_to)(state["current"], chosen) >= self.long_drive_miles:
+            state["consecutive_long"] += 1
+        else:
+            state["consecutive_long"] = 0
+
+    def fallback_bound(self, engine, state):
+        if state["consecutive_long"] > 0:
+            return None, 0.0, max(self.long_after_long_penalty, self.rest_bonus)
+        return None, 0.0, 0.0
+
+    def __repr__(self):
+        return (f"FatiguePolicy(long_drive_miles={self.long_drive_miles}, "
+                f"long_after_long_penalty={self.long_after_long_penalty}, rest_bonus={self.rest_bonus})")
+
+
+class PriorityPolicy:
+    """
+    Serve roughly 2 urgent deliveries for every routine one.
+
+    Bonus only: urgent stops (priority <= urgent_priority) get urgent_bonus while
+    fewer than urgent_run urgent stops were served in a row; routine stops get
+    routine_bonus once starvation_run urgent stops were served in a row. On
+    mn_dataset.py an urgent_bonus below 5 never changes the driver route.
+    """
+
+    def __init__(self, urgent_priority: int = 2, urgent_bonus: float = 8.0, urgent_run: int = 2,
+                 routine_bonus: float = 6.0, starvation_run: int = 3):
+        self.urgent_priority = urgent_priority
+        self.urgent_bonus = urgent_bonus
+        self.urgent_run = urgent_run
+        self.routine_bonus = routine_bonus
+        self.starvation_run = starvation_run
+
+    def init_state(self, state: dict):
+        state["urgent_streak"] = 0
+
+    def _bonuses(self, streak: int) -> Tuple[float, float]:
+        urgent = self.urgent_bonus if streak < self.urgent_run else 0.0
+        routine = self.routine_bonus if streak >= self.starvation_run else 0.0
+        return urgent, routine
+
+    def score(self, current: Node, candidate: Node, state: dict) -> float:
+        urgent, routine = self._bonuses(state["urgent_streak"])
+        return urgent if candidate.priority <= self.urgent_priority else routine
+
+    def score_batch(self, engine, current, slots, dists, state):
+        urgent, routine = self._bonuses(state["urgent_streak"])
+        priority, cutoff = engine.priority, self.urgent_priority
+        return [urgent if priority[s] <= cutoff else routine for s in slots]
+
+    def update(self, state: dict, chosen: Node):
+        if chosen.priority <= self.urgent_priority:
+            state["urgent_streak"] += 1
+        else:
+            state["urgent_streak"] = 0
+
+    def fallback_bound(self, engine, state):
+        return None, 0.0, max(self._bonuses(state["urgent_streak"]))
+
+    def __repr__(self):
+        return (f"PriorityPolicy(urgent_priority={self.urgent_priority}, urgent_bonus={self.urgent_bonus}, "
+                f"urgent_run={self.urgent_run}, routine_bonus={self.routine_bonus}, "
+                f"starvation_run={self.starvation_run})")
+
+
+class WeightedPolicy:
+    """
+    Weighted sum of other policies, e.g. WeightedPolicy([(1.0, DriverPolicy()), (0.5, FatiguePolicy())]).
+
+    Terms are added in order, so with weight 1.0 the result is the plain sum.
+    """
+
+    def __init__(self, terms: Sequence[Tuple[float, ScoringPolicy]]):
+        if not terms:
+            raise ValueError("WeightedPolicy needs at least one term")
+        self.terms = list(terms)
+        self._values_for = None  # (engine, its size, combined values, max |value|) for fallback_bound
+
+    def init_state(self, state: dict):
+        for _, policy in self.terms:
+            policy.init_state(state)
+
+    def score(self, current: Node, candidate: Node, state: dict) -> float:
+        weight, policy = self.terms[0]
+        total = policy.score(current, candidate, state)
+        if weight != 1.0:
+            total = weight * total
+        for weight, policy in self.terms[1:]:
+            term = policy.score(current, candidate, state)
+            total += term if weight == 1.0 else weight * term
+        return total
+
+    def score_batch(self, engine, current, slots, dists, state):
+        weight, policy = self.terms[0]
+        totals = policy.score_batch(engine, current, slots, dists, state)
+        if weight != 1.0:
+            totals = [weight * t for t in totals]
+        for weight, policy in self.terms[1:]:
+            terms = policy.score_batch(engine, current, slots, dists, state)
+            if weight == 1.0:
+                totals = [t + u for t, u in zip(totals, terms)]
+            else:
+                totals = [t + weight * u for t, u in zip(totals, terms)]
+        return totals
+
+    def update(self, state: dict, chosen: Node):
+        for _, policy in self.terms:
+            policy.update(state, chosen)
+
+    def fallback_bound(self, engine, state):
+        columns, cost, bonus = [], 0.0, 0.0
+        for weight, policy in self.terms:
+            bound = policy.fallback_bound(engine, state)
+            if bound is None or weight < 0:
+                return None
+            term_values, term_cost, term_bonus = bound
+            if term_values is not None:
+                columns.append((weight, term_values))
+            cost += weight * term_cost
+            bonus += weight * term_bonus
+
+        # The combined column (and its magnitude, for the rounding slack) only depends
+        # on the engine (and grows with it, see ScoringEngine.append); keep returning the
+        # same list so the caller's spatial index isn't rebuilt on every fallback jump
+        if (self._values_for is None or self._values_for[0] is not engine
+                or self._values_for[1] != len(engine.nodes)):
+            if not columns:
+                values, scale = None, 0.0
+            else:
+                if len(columns) == 1 and columns[0][0] == 1.0:
+                    values = columns[0][1]
+                else:
+                    values = [0.0] * len(engine.nodes)
+                    for weight, column in columns:
+                        values = [a + weight * b for a, b in zip(values, column)]
+                scale = max((abs(v) for v in values), default=0.0)
+            self._values_for = (engine, len(engine.nodes), values, scale)
+        _, _, values, scale = self._values_for
+        # the bound is summed in a different order than the scores, so leave room for rounding
+        return values, cost, bonus + 1e-9 * (1.0 + scale + abs(bonus))
+
+    def __repr__(self):
+        return f"WeightedPolicy({self.terms!r})"
+
+
+ETHICAL_RULES = {"fairness": FairnessPolicy, "fatigue": FatiguePolicy, "priority": PriorityPolicy}
+
+
+def ethical_policy(ethical_rule: str, **params) -> WeightedPolicy:
+    """
+    Policy used by greedy_ethical_route for a rule name: driver earnings plus the rule's bonus.
+
+    Args:
+        ethical_rule (str): "fairness", "fatigue" or "priority"
+        **params: Constructor arguments of the rule's policy, e.g. alternate_bonus=4.0
+            (default: the Part C constants)
+
+    Returns:
+        WeightedPolicy: DriverPolicy + the rule, both with weight 1.0
+    """
+    if ethical_rule not in ETHICAL_RULES:
+        raise ValueError(f"Unknown ethical rule: {ethical_rule!r}")
+    return WeightedPolicy([(1.0, DriverPolicy()), (1.0, ETHICAL_RULES[ethical_rule](**params))])
+
+
+POLICY_NAMES = ("company", "driver") + tuple(ETHICAL_RULES)
+
+
+def named_policy(name: str) -> ScoringPolicy:
+    """
+    Policy for a name: "company", "driver" or an ethical rule (as for greedy_ethical_route).
+
+    Args:
+        name (str): One of POLICY_NAMES
+
+    Returns:
+        ScoringPolicy: A new policy instance
+    """
+    if name == "company":
+        return CompanyPolicy()
+    if name == "driver":
+        return DriverPolicy()
+    if name not in ETHICAL_RULES:
+        raise ValueError(f"Unknown policy: {name!r}")
+    return ethical_policy(name)
@@ -0,0 +1,333 @@
+"""
+Greedy Algorithm Assignment - Road-Network Distances
+
+Node.distance_to measures the straight line between two nodes, even when the only
+way between them is a long detour over the roads in the edge list. This file
+contains a RoadNetwork: an AdjacencyIndex whose roads are weighted by
+Edge.get_distance, answering shortest-path distances over those roads.
+
+Searches are Dijkstra runs that stop as soon as the asked-for targets are settled
+and are kept per source (least recently used ones are dropped), so later queries
+from the same node resume the search instead of starting over. One-off pair
+queries with no search cached run A* instead, guided by the straight-line
+distance and, after build_landmarks, by landmark (ALT) lower bounds.
+
+Pairs with no road between them are charged the straight-line distance, as if the
+driver left the network; path() returns an empty list for them.
+"""
+from collections import OrderedDict
+from heapq import heappop, heappush
+from typing import Dict, List, Optional, Sequence
+
+from main import Node, Edge, calculate_travel_cost
+from adjacency import AdjacencyIndex
+
+INF = float('inf')
+
+
+class _Search:
+    """Resumable single-source Dijkstra over slots."""
+
+    __slots__ = ("settled", "parent", "_tentative", "_heap")
+
+    def __init__(self, source: int):
+        self.settled: Dict[int, float] = {}
+        self.parent: Dict[int, int] = {}
+        self._tentative: Dict[int, float] = {source: 0.0}
+        self._heap = [(0.0, source)]
+
+    @property
+    def complete(self) -> bool:
+        return not self._heap
+
+    def run(self, network: "RoadNetwork", targets: Sequence[int] = None):
+        """Settle slots until every target is settled (or everything reachable, without targets)."""
+        settled = self.settled
+        if targets is None:
+            pending = None
+        else:
+            pending = {t for t in targets if t not in settled}
+            if not pending:
+                return
+        heap, tentative, parent = self._heap, self._tentative, self.parent
+        offsets, neighbor_slots, weights = network.offsets, network.neighbor_slots, network.weights
+        while heap:
+            d, u = heappop(heap)
+            if u in settled:
+                continue
+            settled[u] = d
+            for i in range(offsets[u], offsets[u + 1]):
+                v = neighbor_slots[i]
+                if v in settled:
+                    continue
+                nd = d + weights[i]
+                if nd < tentative.get(v, INF):
+                    tentative[v] = nd
+                    parent[v] = u
+                    heappush(heap, (nd, v))
+            if pending is not None:
+                pending.discard(u)
+                if not pending:
+                    return
+
+
+class RoadNetwork(AdjacencyIndex):
+    """
+    AdjacencyIndex with road lengths, answering shortest-path distances.
+
+    Pass one anywhere the route functions take edges to have every leg (neighbor
+    moves, fallback jumps, the return to the depot) charged by road distance.
+
+    Attributes:
+        weights (List[float]): Length of the road behind each neighbor_slots entry
+        max_trees (int): Most per-source searches kept
+        landmarks (List[int]): Landmark slots chosen by build_landmarks
+    """
+
+    def __init__(self, edges: List[Edge], nodes: Optional[List[Node]] = None,
+                 landmarks: int = 0, max_trees: int = 256):
+        """
+        Args:
+            edges (List[Edge]): Road connections, weighted by Edge.get_distance
+            nodes (List[Node], optional): Nodes to register even if they have no roads
+            landmarks (int): Landmarks to preprocess for A* (0 = straight-line guidance only)
+            max_trees (int): Most per-source searches kept before evicting least recently used ones
+        """
+        super().__init__(edges, nodes)
+        if max_trees < 1:
+            raise ValueError("max_trees must be at least 1")
+        self.max_trees = max_trees
+
+        # same fill order as AdjacencyIndex, so weights[i] belongs to neighbor_slots[i]
+        self.weights = [0.0] * len(self.neighbor_slots)
+        cursor = list(self.offsets[:-1])
+        for edge in self.edges:
+            u = self.slot_of[edge.u.id]
+            v = self.slot_of[edge.v.id]
+            length = edge.get_distance()
+            self.weights[cursor[u]] = length
+            cursor[u] += 1
+            self.weights[cursor[v]] = length
+            cursor[v] += 1
+
+        self._searches: "OrderedDict[int, _Search]" = OrderedDict()
+        self.landmarks: List[int] = []
+        self._landmark_dist: List[List[float]] = []
+        if landmarks:
+            self.build_landmarks(landmarks)
+
+    def ensure_nodes(self, nodes: List[Node]):
+        """Register nodes without roads; they are unreachable from everything else."""
+        before = len(self.nodes)
+        super().ensure_nodes(nodes)
+        added = len(self.nodes) - before
+        if added:
+            for column in self._landmark_dist:
+                column.extend([INF] * added)
+
+    # ------------------------------------------------------------------
+    # searches
+
+    def _search(self, source: int) -> _Search:
+        searches = self._searches
+        search = searches.get(source)
+        if search is None:
+            search = searches[source] = _Search(source)
+            if len(searches) > self.max_trees:
+                searches.popitem(last=False)
+        else:
+            searches.move_to_end(source)
+        return search
+
+    def _full_distances(self, source: int) -> List[float]:
+        search = _Search(source)
+        search.run(self)
+        settled = search.settled
+        return [settled.get(slot, INF) for slot in range(len(self.nodes))]
+
+    def tree(self, node: Node) -> Dict[Node, float]:
+        """
+        Shortest-path tree from a node: road distance to every reachable node.
+
+        Args:
+            node (Node): Source node
+
+        Returns:
+            Dict[Node, float]: Distance to each reachable node (the source included)
+        """
+        slot = self.slot_of.get(node.id)
+        if slot is None:
+            return {node: 0.0}
+        search = self._search(slot)
+        search.run(self)
+        nodes = self.nodes
+        return {nodes[s]: d for s, d in search.settled.items()}
+
+    def distances(self, source: int, slots: Sequence[int]) -> List[float]:
+        """
+        Road distance from a slot to each of the given slots, from the cached search.
+
+        Args:
+            source (int): Slot to measure from
+            slots (Sequence[int]): Target slots
+
+        Returns:
+            List[float]: Distances, straight-line for targets no road reaches
+        """
+        search = self._search(source)
+        search.run(self, slots)
+        settled, nodes = search.settled, self.nodes
+        out = []
+        for slot in slots:
+            d = settled.get(slot)
+            out.append(nodes[source].distance_to(nodes[slot]) if d is None else d)
+        return out
+
+    # ------------------------------------------------------------------
+    # point-to-point queries
+
+    def build_landmarks(self, count: int):
+        """
+        Pick landmarks by farthest-point selection and store road distances from each.
+
+        Afterwards A* bounds the remaining distance to t by |d(L, t) - d(L, v)| for
+        every landmark L, as well as by the straight line.
+
+        Args:
+            count (int): Number of landmarks (0 removes them)
+        """
+        self.landmarks, self._landmark_dist = [], []
+        n = len(self.nodes)
+        if count <= 0 or n == 0:
+            return
+        # farthest from slot 0 first, then farthest from every landmark so far;
+        # unreachable counts as farthest, so each component gets one
+        nearest = self._full_distances(0)
+        for _ in range(min(count, n)):
+            landmark = nearest.index(max(nearest))
+            if nearest[landmark] == 0.0:
+                break
+            column = self._full_distances(landmark)
+            self.landmarks.append(landmark)
+            self._landmark_dist.append(column)
+            nearest = [min(a, b) for a, b in zip(nearest, column)] if len(self.landmarks) > 1 else column
+
+    def _heuristic(self, target: int):
+        nodes = self.nodes
+        goal = nodes[target]
+        columns = [(column[target], column) for column in self._landmark_dist]
+
+        def lower_bound(slot: int) -> float:
+            bound = nodes[slot].distance_to(goal)
+            for to_target, column in columns:
+                to_slot = column[slot]
+                if to_target == INF or to_slot == INF:
+                    if to_target != to_slot:
+                        return INF      # different components
+                    continue
+                gap = abs(to_target - to_slot)
+                if gap > bound:
+                    bound = gap
+            return bound
+
+        return lower_bound
+
+    def _astar(self, source: int, target: int):
+        """(distance, parent links) of a shortest path, or (INF, {}) if target is unreachable."""
+        h = self._heuristic(target)
+        offsets, neighbor_slots, weights = self.offsets, self.neighbor_slots, self.weights
+        g = {source: 0.0}
+        parent: Dict[int, int] = {}
+        heap = [(h(source), 0.0, source)]
+        while heap:
+            _, d, u = heappop(heap)
+            if u == target:
+                return d, parent
+            if d > g[u]:
+                continue
+            for i in range(offsets[u], offsets[u + 1]):
+                v = neighbor_slots[i]
+                nd = d + weights[i]
+                if nd < g.get(v, INF):
+                    bound = h(v)
+                    if bound == INF:
+                        continue
+                    g[v] = nd
+                    parent[v] = u
+                    heappush(heap, (nd + bound, nd, v))
+        return INF, {}
+
+    def _shortest(self, u: int, v: int):
+        search = self._searches.get(u)
+        if search is not None:
+            self._searches.move_to_end(u)
+            search.run(self, [v])
+            return search.settled.get(v, INF), search.parent
+        return self._astar(u, v)
+
+    def distance(self, u: Node, v: Node) -> float:
+        """
+        Road distance between two nodes (drop-in for DistanceOracle.distance).
+
+        Resumes the cached search from u if there is one, otherwise runs A*.
+
+        Args:
+            u (Node): Start node
+            v (Node): End node
+
+        Returns:
+            float: Shortest road distance, or the straight line if no road connects them
+        """
+        su, sv = self.slot_of.get(u.id), self.slot_of.get(v.id)
+        if su is None or sv is None:
+            return u.distance_to(v)
+        if su == sv:
+            return 0.0
+        d, _ = self._shortest(su, sv)
+        return u.distance_to(v) if d == INF else d
+
+    def travel_cost(self, u: Node, v: Node, base_cost_per_mile: float = 0.50) -> float:
+        """Travel cost between two nodes, via calculate_travel_cost on the road distance."""
+        return calculate_travel_cost(self.distance(u, v), base_cost_per_mile)
+
+    def path(self, u: Node, v: Node) -> List[Node]:
+        """
+        Nodes along a shortest road path from u to v.
+
+        Args:
+            u (Node): Start node
+            v (Node): End node
+
+        Returns:
+            List[Node]: u, the nodes passed through, then v; empty if no road connects them
+        """
+        su, sv = self.slot_of.get(u.id), self.slot_of.get(v.id)
+        if su is None or sv is None:
+            return [u] if u is v else []
+        if su == sv:
+            return [self.nodes[su]]
+        d, parent = self._shortest(su, sv)
+        if d == INF:
+            return []
+        slots = [sv]
+        while slots[-1] != su:
+            slots.append(parent[slots[-1]])
+        return [self.nodes[s] for s in reversed(slots)]
+
+    def stats(self) -> dict:
+        """Cached searches, how many of them ran to completion, settled slots and landmarks."""
+        searches = self._searches.values()
+        return {
+            "trees": len(self._searches),
+            "complete": sum(1 for s in searches if s.complete),
+            "settled": sum(len(s.settled) for s in searches),
+            "landmarks": len(self.landmarks),
+        }
+
+    def clear(self):
+        """Drop every cached search (landmarks are kept)."""
+        self._searches.clear()
+
+    def __repr__(self):
+        return (f"RoadNetwork({len(self.nodes)} nodes, {len(self.neighbor_slots)} neighbor entries, "
+                f"{len(self.landmarks)} landmarks)")
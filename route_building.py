@@ -0,0 +1,86 @@
+"""
+Greedy Algorithm Assignment - Route Building Blocks
+
+The pieces every greedy route loop is made of: the cached scoring engine of a
+graph, batched objective scorers, leg distances (by road on a RoadNetwork), the
+initial visited flags, the candidate neighbors of a stop and the spatial index
+used for fallback jumps. greedy_approach.py, route_planner.py, time_windows.py
+and beam_search.py build their loops from these, so every variant scores,
+breaks ties and jumps exactly like the Part A-C routers.
+"""
+from typing import Callable, List, Tuple
+
+from main import Node
+from adjacency import AdjacencyIndex
+from road_network import RoadNetwork
+from scoring import ScoringEngine, BASE_COST_PER_MILE
+from spatial_index import GridIndex
+
+
+def scoring_engine(graph: AdjacencyIndex) -> ScoringEngine:
+    """Scoring engine for the graph's nodes, built once and kept in graph.cache."""
+    engine = graph.cache.get("engine")
+    if engine is None:
+        engine = graph.cache["engine"] = ScoringEngine(graph.nodes)
+    return engine
+
+
+def objective_scores(graph: AdjacencyIndex, engine: ScoringEngine,
+                     objective: str) -> Tuple[Callable[[int, List[int]], List[float]], List[float]]:
+    """
+    Batched scorer for "company" or "driver", and the per-slot values it subtracts travel from.
+
+    Legs are straight lines, or road distances when the graph is a RoadNetwork.
+    """
+    values = engine.fee if objective == "company" else engine.gain
+    if not isinstance(graph, RoadNetwork):
+        return (engine.company_scores if objective == "company" else engine.driver_scores), values
+
+    road_distances = graph.distances
+
+    def road_scores(current: int, slots: List[int]) -> List[float]:
+        return [values[s] - d * BASE_COST_PER_MILE
+                for s, d in zip(slots, road_distances(current, slots))]
+    return road_scores, values
+
+
+def leg_distance(graph: AdjacencyIndex, u: Node, v: Node) -> float:
+    """Distance charged for driving from u to v: by road on a RoadNetwork, else straight."""
+    if isinstance(graph, RoadNetwork):
+        return graph.distance(u, v)
+    return u.distance_to(v)
+
+
+def route_start(graph: AdjacencyIndex, nodes: List[Node]) -> Tuple[List[int], bytearray]:
+    """
+    Customer slots of this route and the initial visited flags.
+
+    Everything that is not one of the route's customers (the depot, other depots,
+    nodes the graph knows about but that were not passed in) starts out as visited,
+    so it is never offered as a candidate.
+    """
+    customers = [graph.slot_of[node.id] for node in nodes if not node.is_depot]
+    visited = bytearray(b"\x01") * len(graph)
+    for slot in customers:
+        visited[slot] = 0
+    return customers, visited
+
+
+def next_candidates(graph: AdjacencyIndex, engine: ScoringEngine, current: int,
+                    visited: bytearray) -> List[int]:
+    """Slots of the unvisited customer neighbors of the current slot."""
+    is_depot = engine.is_depot
+    return [s for s in graph.neighbor_slots_of(current)
+            if not visited[s] and not is_depot[s]]
+
+
+def fallback_index(engine: ScoringEngine, customers: List[int], visited: bytearray,
+                   values: List[float], cost_per_mile: float = BASE_COST_PER_MILE) -> GridIndex:
+    """
+    Spatial index over the unvisited customers, for jumps when no neighbor is reachable.
+
+    Built the first time a route gets stuck; ties go to the earliest customer in
+    the nodes list, as in a plain sweep.
+    """
+    remaining = [s for s in customers if not visited[s]]
+    return GridIndex(engine.x, engine.y, values, remaining, cost_per_mile=cost_per_mile)
@@ -0,0 +1,311 @@
+"""
+Greedy Algorithm Assignment - Incremental Route Re-planning
+
+This file keeps a greedy plan alive while the driver is on the road. Orders are
+added and cancelled mid-route, and the driver reports each stop reached; instead
+of calling greedy_driver_route again on the whole node list, RoutePlanner keeps
+the stops already driven (and the running total and policy state that go with
+them) and only re-plans the part of the remaining plan a change can affect.
+
+Every planned step records the policy state it was chosen with and the score that
+won. Candidate scores don't depend on the other candidates, so:
+    add_stop     the plan stays the same up to the first step the new stop would
+                 win: one where it is a road neighbor of the position (or the step
+                 was a fallback jump) and it scores strictly higher than the chosen
+                 stop (it comes last in candidate order, so it loses ties). Only
+                 the new stop is scored at the kept steps.
+    cancel_stop  the steps before the cancelled stop never chose it, so only the
+                 suffix from that stop on is planned again.
+    advance_to   reaching the next planned stop just moves it out of the plan;
+                 reaching any other stop re-plans from there.
+
+The plan is always the one planning from scratch at the current position would
+give (see replan()). Legs are straight lines, as in Parts A-C, or road distances
+when edges is a RoadNetwork (whose roads are fixed, so add_stop needs plain
+edges); when no unvisited stop is a road neighbor the next one is the best
+remaining stop anywhere (first added wins ties), found with the routers' spatial
+index, built once per re-plan. Scoring, legs and jumps come from route_building,
+as in the routers.
+"""
+from typing import Dict, Iterable, List, NamedTuple, Optional, Union
+
+from main import Node, Edge, calculate_travel_cost
+from adjacency import AdjacencyIndex, as_adjacency
+from road_network import RoadNetwork
+from scoring import ScoringEngine, argmax_first
+from policies import ScoringPolicy, named_policy
+from greedy_approach import RouteStep
+from route_building import fallback_index, leg_distance, objective_scores
+
+
+class _Step(NamedTuple):
+    """One planned stop: its slot, reward, running total, winning score, the policy
+    state it was chosen with, and whether it was a fallback jump."""
+    slot: int
+    reward: float
+    total: float
+    score: float
+    state: dict
+    fallback: bool
+
+
+class RoutePlanner:
+    """
+    Stateful greedy planning session for one driver.
+
+    Attributes:
+        depot (Node): Where the route starts and ends
+        policy (ScoringPolicy): How candidates are scored
+        reward (str): What the total adds up: "driver" earnings or "company" profit
+        route (List[Node]): Stops driven so far, depot first
+        total (float): Reward collected on the stops driven so far
+        state (dict): Policy state after the stops driven so far
+    """
+
+    def __init__(self, nodes: List[Node], depot: Node, edges: Union[List[Edge], AdjacencyIndex],
+                 policy: Union[str, ScoringPolicy] = "driver", reward: Optional[str] = None):
+        """
+        Args:
+            nodes (List[Node]): All delivery locations including depot
+            depot (Node): The starting depot location
+            edges (List[Edge], AdjacencyIndex or RoadNetwork): All road connections between cities
+            policy (str or ScoringPolicy): "company", "driver", an ethical rule name
+                ("fairness", "fatigue", "priority") or any ScoringPolicy
+            reward (str, optional): "driver" or "company" (default: "company" for the
+                company policy, "driver" otherwise)
+        """
+        if isinstance(policy, str):
+            if reward is None:
+                reward = "company" if policy == "company" else "driver"
+            policy = named_policy(policy)
+        reward = reward or "driver"
+        if reward not in ("driver", "company"):
+            raise ValueError(f"Unknown reward: {reward!r}")
+        self.depot = depot
+        self.policy = policy
+        self.reward = reward
+
+        graph = as_adjacency(edges, nodes)
+        self._graph = graph
+        # a copy rather than scoring_engine(graph): add_stop appends to it
+        self._engine = ScoringEngine(list(graph.nodes))
+        self._slot_of: Dict[int, int] = dict(graph.slot_of)
+        self._neighbors: List[List[int]] = [list(graph.neighbor_slots_of(s)) for s in range(len(graph))]
+        self._reward_batch, _ = objective_scores(graph, self._engine, reward)
+        self._distances = graph.distances if isinstance(graph, RoadNetwork) else self._engine.distances
+
+        # taken: driven, not a customer of this route, cancelled, or already in the plan
+        self._customers = [self._slot_of[node.id] for node in nodes if not node.is_depot]
+        self._taken = bytearray(b"\x01") * len(self._engine.nodes)
+        for slot in self._customers:
+            self._taken[slot] = 0
+        self._remaining = set(self._customers)
+
+        self._here = self._slot_of[depot.id]
+        self.route: List[Node] = [depot]
+        self.total = 0.0
+        self.state = {"current": depot, "distance": lambda u, v: leg_distance(graph, u, v)}
+        policy.init_state(self.state)
+
+        self._plan: List[_Step] = []
+        self._tail_state = self.state
+        self._counts = {"replans": 0, "planned_steps": 0, "kept_steps": 0}
+        self.replan()
+
+    # ------------------------------------------------------------------ planning
+
+    def _position(self, index: int) -> int:
+        """Slot the driver is at before planned step index."""
+        return self._plan[index - 1].slot if index else self._here
+
+    def _truncate(self, index: int):
+        """Drop planned steps from index on, so they can be planned again."""
+        for step in self._plan[index:]:
+            self._taken[step.slot] = 0
+        if index < len(self._plan):
+            self._tail_state = self._plan[index].state
+        del self._plan[index:]
+
+    def _extend(self):
+        """Plan greedily from the end of the plan until every remaining stop is in it."""
+        engine, nodes, taken, policy = self._engine, self._engine.nodes, self._taken, self.policy
+        plan = self._plan
+        here = self._position(len(plan))
+        total = plan[-1].total if plan else self.total
+        state = dict(self._tail_state)
+        grid = None
+
+        def score_batch(here: int, slots: List[int]) -> List[float]:
+            return policy.score_batch(engine, here, slots, self._distances(here, slots), state)
+
+        for _ in range(len(self._remaining) - len(plan)):
+            candidates = [s for s in self._neighbors[here] if not taken[s]]
+            fallback = not candidates
+            if fallback:
+                bound = policy.fallback_bound(engine, state)
+                if bound is None or bound[0] is None:
+                    candidates = [s for s in self._customers if not taken[s]]
+                else:
+                    values, cost_per_mile, bonus = bound
+                    if grid is None or grid.values is not values or grid.cost_per_mile != cost_per_mile:
+                        grid = fallback_index(engine, self._customers, taken, values, cost_per_mile)
+                    jump_from = here
+                    candidates = [grid.best(engine.x[here], engine.y[here],
+                                            lambda slots: score_batch(jump_from, slots), bonus)]
+            scores = score_batch(here, candidates)
+            best = argmax_first(scores)
+            slot = candidates[best]
+            reward = self._reward_batch(here, [slot])[0]
+            total += reward
+            plan.append(_Step(slot, reward, total, scores[best], dict(state), fallback))
+            policy.update(state, nodes[slot])
+            state["current"] = nodes[slot]
+            taken[slot] = 1
+            if grid is not None:
+                grid.remove(slot)
+            here = slot
+        self._tail_state = state
+
+    def _replan_from(self, index: int):
+        """Keep the first index planned steps and plan the rest again."""
+        self._truncate(index)
+        self._extend()
+        counts = self._counts
+        counts["replans"] += 1
+        counts["kept_steps"] += index
+        counts["planned_steps"] += len(self._plan) - index
+
+    def replan(self):
+        """Plan everything after the current position from scratch."""
+        self._replan_from(0)
+
+    # ------------------------------------------------------------------ changes
+
+    def add_stop(self, node: Node, roads: Iterable[int] = ()) -> int:
+        """
+        Add an order, optionally with new roads from it to existing locations.
+
+        Args:
+            node (Node): The new delivery location (its id must be new)
+            roads (Iterable[int]): Ids of the locations it has a road to
+
+        Returns:
+            int: Index in planned_route() from which the plan changed
+        """
+        if isinstance(self._graph, RoadNetwork):
+            raise ValueError("add_stop can't add roads to a RoadNetwork; plan over the edge list")
+        if node.id in self._slot_of:
+            raise ValueError(f"Duplicate node id: {node.id}")
+        if node.is_depot:
+            raise ValueError("Only customers can be added")
+        ends = [self._slot_of[node_id] for node_id in roads]
+
+        slot = self._engine.append(node)
+        self._slot_of[node.id] = slot
+        self._neighbors.append(ends)
+        for end in ends:
+            if end != slot:
+                self._neighbors[end].append(slot)
+        self._customers.append(slot)
+        self._taken.append(0)
+        self._remaining.add(slot)
+
+        # first planned step the new stop would win (it comes last, so it loses ties)
+        engine, policy, adjacent = self._engine, self.policy, set(ends)
+        changed = len(self._plan)
+        for index, step in enumerate(self._plan):
+            here = self._position(index)
+            if here in adjacent:
+                if step.fallback:
+                    changed = index
+                    break
+            elif not step.fallback:
+                continue
+            score = policy.score_batch(engine, here, [slot], self._distances(here, [slot]), step.state)[0]
+            if score > step.score:
+                changed = index
+                break
+        self._replan_from(changed)
+        return changed
+
+    def cancel_stop(self, node_id: int) -> int:
+        """
+        Cancel a stop that hasn't been driven to yet.
+
+        Args:
+            node_id (int): Id of the cancelled stop
+
+        Returns:
+            int: Index in planned_route() from which the plan changed
+        """
+        slot = self._slot_of[node_id]
+        if slot not in self._remaining:
+            raise ValueError(f"Node {node_id} is not a remaining stop")
+        index = next(i for i, step in enumerate(self._plan) if step.slot == slot)
+        self._remaining.discard(slot)
+        self._truncate(index)
+        self._taken[slot] = 1
+        self._replan_from(index)
+        return index
+
+    def advance_to(self, node_id: int) -> RouteStep:
+        """
+        Record that the driver reached a stop (normally the next planned one).
+
+        Args:
+            node_id (int): Id of the stop reached
+
+        Returns:
+            RouteStep: (node, step_reward, running_total) for the leg just driven
+        """
+        slot = self._slot_of[node_id]
+        if slot not in self._remaining:
+            raise ValueError(f"Node {node_id} is not a remaining stop")
+        node = self._engine.nodes[slot]
+        on_plan = self._plan[0].slot == slot
+        if on_plan:
+            # the rest of the plan was chosen from exactly this position and state
+            step = self._plan.pop(0)
+            reward, self.total = step.reward, step.total
+            self.state = self._plan[0].state if self._plan else self._tail_state
+        else:
+            self._truncate(0)
+            reward = self._reward_batch(self._here, [slot])[0]
+            self.total += reward
+            self.state = dict(self.state)
+            self.policy.update(self.state, node)
+            self.state["current"] = node
+            self._taken[slot] = 1
+            self._tail_state = self.state
+        self._remaining.discard(slot)
+        self._here = slot
+        self.route.append(node)
+        if not on_plan:
+            self._replan_from(0)
+        return node, reward, self.total
+
+    # ------------------------------------------------------------------ results
+
+    @property
+    def current(self) -> Node:
+        """Where the driver is now."""
+        return self._engine.nodes[self._here]
+
+    def planned_route(self) -> List[Node]:
+        """Remaining stops in planned order, ending with the depot."""
+        nodes = self._engine.nodes
+        return [nodes[step.slot] for step in self._plan] + [self.depot]
+
+    def planned_total(self) -> float:
+        """Total of the whole route if the plan is followed, including the return to the depot."""
+        last = self._engine.nodes[self._position(len(self._plan))]
+        total = self._plan[-1].total if self._plan else self.total
+        return total - calculate_travel_cost(leg_distance(self._graph, last, self.depot))
+
+    def stats(self) -> Dict[str, int]:
+        """replans, planned_steps (steps scored again) and kept_steps (steps reused) so far."""
+        return dict(self._counts)
+
+    def __repr__(self):
+        return (f"RoutePlanner({len(self.route) - 1} driven, {len(self._plan)} planned, "
+                f"policy={self.policy!r})")
@@ -0,0 +1,89 @@
+"""
+Greedy Algorithm Assignment - Batched Candidate Scoring
+
+This file keeps node attributes in flat per-slot columns (one entry per AdjacencyIndex
+slot) and scores a whole set of candidate stops in one pass, instead of calling
+Node.distance_to and calculate_travel_cost one candidate at a time.
+
+The columns are plain lists of floats: without NumPy, list indexing is the cheapest
+element access CPython offers (array.array boxes a new float on every read).
+
+Every score is computed with the same floating-point operations, in the same order,
+as the scalar helpers in greedy_approach.py, so the results are bit-for-bit identical.
+"""
+from typing import List, Sequence
+
+from main import Node
+
+BASE_COST_PER_MILE = 0.50   # same rate as calculate_travel_cost's default
+HIGH_TIP_THRESHOLD = 3.00   # tips at or above this count as a high-tip area
+LONG_DRIVE_MILES = 15.0     # drives at or above this count as long
+
+
+def argmax_first(scores: Sequence[float]) -> int:
+    """
+    Position of the highest score, taking the first one on ties.
+
+    Args:
+        scores (Sequence[float]): Non-empty list of scores
+
+    Returns:
+        int: Index of the first maximum
+    """
+    return scores.index(max(scores))
+
+
+class ScoringEngine:
+    """
+    Struct-of-arrays view of the nodes used to score candidates in batches.
+
+    Attributes:
+        nodes (List[Node]): Node object in each slot
+        x, y (List[float]): Coordinates per slot
+        fee, tip (List[float]): delivery_fee and estimated_tip per slot
+        gain (List[float]): delivery_fee + estimated_tip per slot
+        priority (List[int]): Priority level per slot
+        is_depot (bytearray): 1 if the slot holds a depot
+    """
+
+    def __init__(self, nodes: List[Node]):
+        self.nodes = nodes
+        self.x = [float(n.x) for n in nodes]
+        self.y = [float(n.y) for n in nodes]
+        self.fee = [float(n.delivery_fee) for n in nodes]
+        self.tip = [float(n.estimated_tip) for n in nodes]
+        self.gain = [fee + tip for fee, tip in zip(self.fee, self.tip)]
+        self.priority = [n.priority for n in nodes]
+        self.is_depot = bytearray(1 if n.is_depot else 0 for n in nodes)
+
+    def append(self, node: Node) -> int:
+        """Add a node in the next slot (also appended to self.nodes). Returns the slot."""
+        self.nodes.append(node)
+        self.x.append(float(node.x))
+        self.y.append(float(node.y))
+        self.fee.append(float(node.delivery_fee))
+        self.tip.append(float(node.estimated_tip))
+        self.gain.append(self.fee[-1] + self.tip[-1])
+        self.priority.append(node.priority)
+        self.is_depot.append(1 if node.is_depot else 0)
+        return len(self.x) - 1
+
+    def distances(self, current: int, slots: Sequence[int]) -> List[float]:
+        """Euclidean distance from the current slot to every candidate slot."""
+        x0, y0 = self.x[current], self.y[current]
+        xs, ys = self.x, self.y
+        return [((x0 - xs[s]) ** 2 + (y0 - ys[s]) ** 2) ** 0.5 for s in slots]
+
+    def company_scores(self, current: int, slots: Sequence[int]) -> List[float]:
+        """Company profit (delivery_fee - travel_cost) for every candidate."""
+        x0, y0 = self.x[current], self.y[current]
+        xs, ys, fee = self.x, self.y, self.fee
+        return [fee[s] - ((x0 - xs[s]) ** 2 + (y0 - ys[s]) ** 2) ** 0.5 * BASE_COST_PER_MILE
+                for s in slots]
+
+    def driver_scores(self, current: int, slots: Sequence[int]) -> List[float]:
+        """Driver earnings (delivery_fee + estimated_tip - travel_cost) for every candidate."""
+        x0, y0 = self.x[current], self.y[current]
+        xs, ys, gain = self.x, self.y, self.gain
+        return [gain[s] - ((x0 - xs[s]) ** 2 + (y0 - ys[s]) ** 2) ** 0.5 * BASE_COST_PER_MILE
+                for s in slots]
@@ -0,0 +1,183 @@
+"""
+Greedy Algorithm Assignment - Spatial Index for the Fallback Jump
+
+When no unvisited customer is reachable by road, the greedy routers jump to the
+best remaining customer anywhere. This file contains a uniform grid over the
+customers' coordinates that supports deletion as customers are visited, so that
+jump becomes a best-first search over nearby cells instead of a sweep over every
+unvisited customer.
+
+Scores have the form value - distance * cost_per_mile (+ a bounded bonus), so a
+cell can be skipped once value_max - min_distance * cost_per_mile + bonus drops
+below the best score found so far.
+"""
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from scoring import BASE_COST_PER_MILE
+
+
+class GridIndex:
+    """
+    Uniform grid over a set of slots, with deletion and best-score queries.
+
+    Each cell keeps its member slots (in insertion order), the bounding box of
+    the points inserted into it and the largest value among them. Deleting a
+    slot never tightens those, so they stay valid upper bounds.
+
+    Attributes:
+        cell_size (float): Width and height of each cell
+        values (Sequence[float]): Per-slot values the scores are bounded by
+        cost_per_mile (float): Travel cost per unit distance assumed by the bounds
+    """
+
+    def __init__(self, xs: Sequence[float], ys: Sequence[float], values: Sequence[float],
+                 slots: Sequence[int], cell_size: Optional[float] = None,
+                 cost_per_mile: float = BASE_COST_PER_MILE, per_cell: int = 4):
+        """
+        Args:
+            xs, ys (Sequence[float]): Coordinates, indexed by slot
+            values (Sequence[float]): Per-slot value the score is bounded by (fee, or fee + tip)
+            slots (Sequence[int]): Slots to insert; ties go to the earliest one in this order
+            cell_size (float, optional): Cell width; by default about per_cell points per cell
+            cost_per_mile (float): Travel cost per unit distance used in the scores
+            per_cell (int): Target average points per cell when cell_size is not given
+        """
+        self._xs, self._ys = xs, ys
+        self.values = values
+        self.cost_per_mile = cost_per_mile
+        self._order: Dict[int, int] = {s: i for i, s in enumerate(slots)}
+        self._count = len(self._order)
+
+        if self._count:
+            self._x0 = min(xs[s] for s in slots)
+            self._y0 = min(ys[s] for s in slots)
+            width = max(xs[s] for s in slots) - self._x0
+            height = max(ys[s] for s in slots) - self._y0
+        else:
+            self._x0 = self._y0 = width = height = 0.0
+        if cell_size is None:
+            count = max(self._count, 1)
+            # about per_cell points per cell, but never more cells along an axis than
+            # points, which collinear or very flat point sets would otherwise get
+            cell_size = max((width * height * per_cell / count) ** 0.5,
+                            max(width, height) * per_cell / count) or 1.0
+        self.cell_size = cell_size
+        self._nx = int(width / cell_size) + 1
+        self._ny = int(height / cell_size) + 1
+
+        self._cells: Dict[Tuple[int, int], Dict[int, None]] = {}
+        self._bbox: Dict[Tuple[int, int], List[float]] = {}
+        self._cell_max: Dict[Tuple[int, int], float] = {}
+        self._cell_of_slot: Dict[int, Tuple[int, int]] = {}
+        self._max_value = -float('inf')
+        for s in slots:
+            self._insert(s)
+
+    def _cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        cx = min(max(int((x - self._x0) // self.cell_size), 0), self._nx - 1)
+        cy = min(max(int((y - self._y0) // self.cell_size), 0), self._ny - 1)
+        return cx, cy
+
+    def _insert(self, slot: int):
+        x, y, value = self._xs[slot], self._ys[slot], self.values[slot]
+        cell = self._cell_of(x, y)
+        self._cell_of_slot[slot] = cell
+        bucket = self._cells.get(cell)
+        if bucket is None:
+            self._cells[cell] = {slot: None}
+            self._bbox[cell] = [x, y, x, y]
+            self._cell_max[cell] = value
+        else:
+            bucket[slot] = None
+            box = self._bbox[cell]
+            box[0], box[1] = min(box[0], x), min(box[1], y)
+            box[2], box[3] = max(box[2], x), max(box[3], y)
+            self._cell_max[cell] = max(self._cell_max[cell], value)
+        self._max_value = max(self._max_value, value)
+
+    def remove(self, slot: int):
+        """
+        Delete a slot from the index (no-op if it was never inserted or is already gone).
+
+        Args:
+            slot (int): Slot to delete
+        """
+        cell = self._cell_of_slot.pop(slot, None)
+        if cell is None:
+            return
+        bucket = self._cells[cell]
+        del bucket[slot]
+        if not bucket:
+            del self._cells[cell], self._bbox[cell], self._cell_max[cell]
+        self._count -= 1
+
+    def _min_distance(self, cell: Tuple[int, int], x: float, y: float) -> float:
+        x_lo, y_lo, x_hi, y_hi = self._bbox[cell]
+        dx = max(x_lo - x, 0.0, x - x_hi)
+        dy = max(y_lo - y, 0.0, y - y_hi)
+        return (dx ** 2 + dy ** 2) ** 0.5
+
+    def _ring(self, cx: int, cy: int, r: int):
+        """Cells on the square ring at Chebyshev distance r from (cx, cy), clipped to the grid."""
+        if r == 0:
+            yield cx, cy
+            return
+        x_lo, x_hi = max(cx - r, 0), min(cx + r, self._nx - 1)
+        y_lo, y_hi = max(cy - r, 0), min(cy + r, self._ny - 1)
+        for gy in (cy - r, cy + r):
+            if 0 <= gy < self._ny:
+                for gx in range(x_lo, x_hi + 1):
+                    yield gx, gy
+        for gx in (cx - r, cx + r):
+            if 0 <= gx < self._nx:
+                for gy in range(max(y_lo, cy - r + 1), min(y_hi, cy + r - 1) + 1):
+                    yield gx, gy
+
+    def best(self, x: float, y: float, score_batch: Callable[[List[int]], List[float]],
+             bonus: float = 0.0) -> Optional[int]:
+        """
+        Slot with the highest score, searching outward from (x, y).
+
+        Args:
+            x, y (float): Query position (the current node)
+            score_batch (Callable): Scores a list of slots; each score must be at most
+                values[slot] - distance * cost_per_mile + bonus
+            bonus (float): Upper bound on anything score_batch adds to that
+
+        Returns:
+            Optional[int]: Best slot (earliest inserted on ties), or None if the index is empty
+        """
+        if not self._count:
+            return None
+        cx = int((x - self._x0) // self.cell_size)
+        cy = int((y - self._y0) // self.cell_size)
+        max_ring = max(cx, self._nx - 1 - cx, cy, self._ny - 1 - cy, 0)
+        # rings closer than this lie entirely outside the grid
+        min_ring = max(-cx, cx - (self._nx - 1), -cy, cy - (self._ny - 1), 0)
+
+        best_slot, best_score, best_order = None, -float('inf'), 0
+        order = self._order
+        for r in range(min_ring, max_ring + 1):
+            # every cell in ring r is at least (r - 1) cells away from the query cell;
+            # one more cell of slack covers rounding at cell borders
+            ring_bound = self._max_value - max(r - 2, 0) * self.cell_size * self.cost_per_mile + bonus
+            if best_slot is not None and ring_bound < best_score:
+                break
+            for cell in self._ring(cx, cy, r):
+                bucket = self._cells.get(cell)
+                if bucket is None:
+                    continue
+                cell_bound = self._cell_max[cell] - self._min_distance(cell, x, y) * self.cost_per_mile + bonus
+                if cell_bound < best_score:
+                    continue
+                members = list(bucket)
+                for slot, score in zip(members, score_batch(members)):
+                    if score > best_score or (score == best_score and order[slot] < best_order):
+                        best_slot, best_score, best_order = slot, score, order[slot]
+        return best_slot
+
+    def __len__(self):
+        return self._count
+
+    def __repr__(self):
+        return f"GridIndex({self._count} points, {len(self._cells)} cells, cell_size={self.cell_size:.3g})"
@@ -0,0 +1,36 @@
+# Tests for the precomputed adjacency index. Run with: pytest -q
+
+import mn_dataset as data
+import greedy_approach as stu
+from adjacency import AdjacencyIndex
+from main import Node, Edge
+
+
+def test_index_matches_edge_scan():
+    """Neighbors from the index come back in the same order as a full edge scan."""
+    graph = AdjacencyIndex(data.MN_EDGES, data.MN_NODES)
+    for node in data.MN_NODES:
+        expected = [n.id for n in stu.get_neighbors(node, data.MN_EDGES)]
+        assert [n.id for n in stu.get_neighbors(node, graph)] == expected
+        assert graph.degree(node) == len(expected)
+
+
+def test_isolated_node_self_loop_and_duplicate():
+    a, b, c = Node(1, 0.0, 0.0), Node(2, 1.0, 0.0), Node(3, 5.0, 5.0)
+    edges = [Edge(a, b), Edge(a, a), Edge(b, a)]
+    graph = AdjacencyIndex(edges, [a, b, c])
+    assert [n.id for n in graph.neighbors(a)] == [2] == [n.id for n in stu.get_neighbors(a, edges)]
+    assert (graph.duplicate_edges, graph.self_loops, graph.degree(b)) == (1, 1, 1)
+    assert graph.neighbors(c) == []
+    assert graph.neighbors(Node(99, 0.0, 0.0)) == []
+
+
+def test_routes_accept_index():
+    graph = AdjacencyIndex(data.MN_EDGES, data.MN_NODES)
+    for fn in (stu.greedy_company_route, stu.greedy_driver_route):
+        route_a, total_a = fn(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES)
+        route_b, total_b = fn(data.MN_NODES, data.MN_DEPOT, graph)
+        assert [n.id for n in route_a] == [n.id for n in route_b]
+        assert total_a == total_b
+    route_c, _ = stu.greedy_ethical_route(data.MN_NODES, data.MN_DEPOT, graph, "fairness")
+    assert len(route_c) == len(data.MN_NODES) + 1
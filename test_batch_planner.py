@@ -0,0 +1,39 @@
+# Tests for batch route planning. Run with: pytest -q
+
+import mn_dataset as data
+import greedy_approach as stu
+from batch_planner import RouteJob, plan_routes_batch
+
+
+def _jobs():
+    customers = [n.id for n in data.MN_NODES if not n.is_depot]
+    return [
+        RouteJob(data.MN_DEPOT.id, "company"),
+        RouteJob(data.MN_DEPOT.id, "driver"),
+        RouteJob(data.MN_DEPOT.id, "ethical", ethical_rule="fairness"),
+        RouteJob(data.MN_DEPOT.id, "driver", customer_ids=tuple(customers[:8])),
+        RouteJob(data.MN_DEPOT.id, "driver", customer_ids=tuple(customers[8:])),
+    ]
+
+
+def test_batch_matches_direct_calls_in_order():
+    results = plan_routes_batch(_jobs(), data.MN_NODES, data.MN_EDGES, workers=2)
+    assert [r.job for r in results] == _jobs()
+
+    route, total = stu.greedy_company_route(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES)
+    assert [n.id for n in results[0].route] == [n.id for n in route]
+    assert results[0].total == total
+    route, total = stu.greedy_ethical_route(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES, "fairness")
+    assert results[2].total == total
+
+    # each split route only visits its own customers
+    for result in results[3:]:
+        visited = [n.id for n in result.route if not n.is_depot]
+        assert sorted(visited) == sorted(result.job.customer_ids)
+
+
+def test_in_process_matches_pool():
+    serial = plan_routes_batch(_jobs(), data.MN_NODES, data.MN_EDGES, workers=1)
+    pooled = plan_routes_batch(_jobs(), data.MN_NODES, data.MN_EDGES, workers=2)
+    assert [(r.total, [n.id for n in r.route]) for r in serial] == \
+           [(r.total, [n.id for n in r.route]) for r in pooled]
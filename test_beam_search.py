@@ -0,0 +1,37 @@
+# Tests for the beam-search / lookahead routers. Run with: pytest -q
+
+import pytest
+
+import mn_dataset as data
+from adjacency import AdjacencyIndex
+from benchmarks.generators import generate_dataset
+from greedy_approach import greedy_company_route, greedy_driver_route
+from beam_search import beam_search_route
+
+ARGS = (data.MN_NODES, data.MN_DEPOT, data.MN_EDGES)
+
+
+def test_beam_one_depth_one_is_the_greedy_router():
+    nodes, depot, edges = generate_dataset(2000, seed=3)
+    for args in (ARGS, (nodes, depot, edges), (nodes, depot, AdjacencyIndex(edges, nodes))):
+        for objective, router in (("company", greedy_company_route), ("driver", greedy_driver_route)):
+            route, total = router(*args)
+            beam_route, beam_total = beam_search_route(*args, objective)
+            assert [n.id for n in beam_route] == [n.id for n in route] and beam_total == total
+
+    with pytest.raises(ValueError):
+        beam_search_route(*ARGS, "company", beam=0)
+
+
+def test_wider_beams_never_lose_to_greedy():
+    _, greedy_total = greedy_company_route(*ARGS)
+    route, total = beam_search_route(*ARGS, "company", beam=8, depth=3)
+    assert total > greedy_total
+    assert sorted(n.id for n in route[1:-1]) == sorted(n.id for n in data.MN_NODES if not n.is_depot)
+
+    nodes, depot, edges = generate_dataset(1000, seed=0)
+    for objective, router in (("company", greedy_company_route), ("driver", greedy_driver_route)):
+        _, greedy_total = router(nodes, depot, edges)
+        for beam, depth in ((2, 1), (4, 2)):
+            route, total = beam_search_route(nodes, depot, edges, objective, beam, depth)
+            assert total >= greedy_total and len(route) == len(nodes) + 1
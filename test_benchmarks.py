@@ -0,0 +1,35 @@
+# Tests for the synthetic dataset generator and benchmark runner. Run with: pytest -q
+
+from benchmarks import generate_dataset
+from benchmarks.run import compare, run_benchmarks
+
+
+def test_generator_is_seeded_and_well_formed():
+    nodes, depot, edges = generate_dataset(200, seed=7)
+    again_nodes, _, again_edges = generate_dataset(200, seed=7)
+    assert [(n.x, n.y, n.delivery_fee, n.estimated_tip) for n in nodes] == \
+        [(n.x, n.y, n.delivery_fee, n.estimated_tip) for n in again_nodes]
+    assert [(e.u.id, e.v.id) for e in edges] == [(e.u.id, e.v.id) for e in again_edges]
+
+    assert len(nodes) == 200 and nodes[0] is depot and depot.is_depot
+    assert not any(node.is_depot for node in nodes[1:])
+    assert {node.region for node in nodes[1:]} == {"downtown", "suburban", "rural"}
+    ids = {node.id for node in nodes}
+    assert all(e.u.id in ids and e.v.id in ids and e.u is not e.v for e in edges)
+
+
+def test_runner_records_and_compares():
+    records = run_benchmarks([50], ["A", "C"], repeat=1, rules=("fairness",))
+    assert [(r["part"], r["rule"]) for r in records] == [("A", None), ("C", "fairness")]
+    assert all(r["stops"] == 51 for r in records)
+    compare(records, [dict(records[0], seconds_min=records[0]["seconds_min"] * 2)])
+    assert records[0]["total_changed"] is False and records[0]["speedup"] > 1.9
+    assert "speedup" not in records[1]
+
+
+def test_runner_reports_beam_gain_and_cost():
+    records = run_benchmarks([60], ["B"], repeat=1, beams=[(1, 1), (3, 2)])
+    assert [(r["part"], r.get("beam"), r.get("depth")) for r in records] == \
+        [("B", None, None), ("B", 1, 1), ("B", 3, 2)]
+    assert records[1]["total_gain"] == 0.0 and records[1]["greedy_total"] == records[0]["total"]
+    assert records[2]["total_gain"] >= 0.0 and records[2]["cpu_ratio"] > 0
@@ -0,0 +1,35 @@
+# Tests for the incremental candidate heaps. Run with: pytest -q
+
+import mn_dataset as data
+import greedy_approach as stu
+from adjacency import AdjacencyIndex
+from route_building import scoring_engine
+from candidate_queue import CandidateQueue, FrontierCache, ScanQueue
+from main import Node, Edge
+
+
+def test_heap_and_scan_agree_on_ties():
+    hub = Node(0, 0.0, 0.0, is_depot=True)
+    # three equally scored neighbors, the first one listed must win
+    leaves = [Node(i, 3.0 * (-1) ** i, 4.0 if i > 1 else 0.0, delivery_fee=10.0) for i in (1, 2, 3)]
+    graph = AdjacencyIndex([Edge(hub, leaf) for leaf in leaves] + [Edge(leaves[0], leaves[1])])
+    engine = scoring_engine(graph)
+    visited = bytearray(len(graph))
+    heap = CandidateQueue(FrontierCache(graph, engine.is_depot, engine.company_scores), visited)
+    scan = ScanQueue(graph, engine.is_depot, engine.company_scores, visited)
+    for _ in leaves:
+        expected = scan.best(0)
+        assert heap.best(0) == expected
+        visited[expected[0]] = 1
+    assert heap.best(0) is None and scan.best(0) is None
+
+
+def test_prebuilt_index_reused_across_routes():
+    graph = AdjacencyIndex(data.MN_EDGES, data.MN_NODES)
+    for fn in (stu.greedy_company_route, stu.greedy_driver_route):
+        expected = fn(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES)
+        for _ in range(2):
+            route, total = fn(data.MN_NODES, data.MN_DEPOT, graph)
+            assert [n.id for n in route] == [n.id for n in expected[0]]
+            assert total == expected[1]
+    assert "frontier_company" in graph.cache and "frontier_driver" in graph.cache
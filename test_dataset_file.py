@@ -0,0 +1,65 @@
+# Tests for the columnar dataset file format. Run with: pytest -q
+
+import pytest
+
+import mn_dataset as data
+import greedy_approach as stu
+from batch_planner import RouteJob, plan_routes_batch, plan_routes_batch_from_file
+from dataset_file import load_dataset, write_dataset
+from benchmarks.generators import generate_dataset
+from test_node_table import ATTRS
+
+
+@pytest.fixture
+def mn_file(tmp_path):
+    path = str(tmp_path / "mn.gcol")
+    write_dataset(path, data.MN_NODES, data.MN_EDGES)
+    return path
+
+
+def test_round_trip_is_zero_copy_and_read_only(mn_file):
+    nodes, edges = load_dataset(mn_file)
+    assert nodes.readonly and isinstance(nodes.x, memoryview)
+    for node, view in zip(data.MN_NODES, nodes):
+        assert all(getattr(view, attr) == getattr(node, attr) for attr in ATTRS)
+    assert [(e.u.id, e.v.id) for e in edges] == [(e.u.id, e.v.id) for e in data.MN_EDGES]
+    with pytest.raises(TypeError):
+        nodes.append(99, 0.0, 0.0)
+
+    copied, _ = load_dataset(mn_file, copy=True)
+    copied.append(99, 0.0, 0.0)
+    assert len(copied) == len(data.MN_NODES) + 1
+
+
+def test_routes_and_batches_from_file(mn_file):
+    nodes, edges = load_dataset(mn_file)
+    route, total = stu.greedy_driver_route(nodes.views(), nodes.depot(), list(edges))
+    expected_route, expected_total = stu.greedy_driver_route(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES)
+    assert [n.id for n in route] == [n.id for n in expected_route] and total == expected_total
+
+    jobs = [RouteJob(data.MN_DEPOT.id, "company"), RouteJob(data.MN_DEPOT.id, "ethical", ethical_rule="priority")]
+    direct = plan_routes_batch(jobs, data.MN_NODES, data.MN_EDGES, workers=1)
+    for workers in (1, 2):
+        from_file = plan_routes_batch_from_file(jobs, mn_file, workers=workers)
+        assert [(r.total, [n.id for n in r.route]) for r in from_file] == \
+               [(r.total, [n.id for n in r.route]) for r in direct]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not_a_dataset.bin"
+    path.write_bytes(b"hello world, not a dataset")
+    with pytest.raises(ValueError):
+        load_dataset(str(path))
+
+
+def test_time_windows_survive_tables_and_files(tmp_path):
+    nodes, _, edges = generate_dataset(50, seed=1)
+    for i, node in enumerate(nodes):
+        node.window_start, node.window_end, node.service_time = 10.0 * i, 10.0 * i + 45.0, 5.0
+    path = str(tmp_path / "windows.gcol")
+    write_dataset(path, nodes, edges)
+    for copy in (False, True):
+        loaded, _ = load_dataset(path, copy=copy)
+        for node, view in zip(nodes, loaded):
+            assert all(getattr(view, attr) == getattr(node, attr) for attr in ATTRS)
+            assert (view.to_node().window_end, view.to_node().service_time) == (node.window_end, 5.0)
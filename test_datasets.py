@@ -0,0 +1,44 @@
+# Tests for the lazy dataset registry. Run with: pytest -q
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import mn_dataset as data
+import datasets
+from dataset_file import write_dataset
+
+
+def test_importing_the_routers_loads_no_dataset():
+    code = "import sys, datasets, greedy_approach; print(sorted({'mn_dataset', 'json'} & set(sys.modules)))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.abspath(datasets.__file__)))
+    assert out.stdout.strip() == "[]"
+
+
+def test_datasets_load_once_per_process(tmp_path):
+    nodes, depot, edges = datasets.get_dataset("mn")
+    assert nodes is data.MN_NODES and depot is data.MN_DEPOT and edges is data.MN_EDGES
+    assert datasets.get_dataset("mn") is datasets.get_dataset("mn")
+    assert datasets.get_graph("mn") is datasets.get_graph("mn")
+    assert len(datasets.get_dataset("synthetic-50").nodes) == 50
+
+    path = str(tmp_path / "mn.gcol")
+    write_dataset(path, data.MN_NODES, data.MN_EDGES)
+    calls = []
+    datasets.register("test-mn-file", lambda: calls.append(path) or datasets._load_file(path))
+    try:
+        assert "test-mn-file" in datasets.names() and not calls
+        loaded = datasets.get_dataset("test-mn-file")
+        assert datasets.get_dataset("test-mn-file") is loaded and calls == [path]
+        assert [n.id for n in loaded.nodes] == [n.id for n in data.MN_NODES] and loaded.depot.id == 0
+        assert [n.id for n in datasets.get_dataset(path).nodes] == [n.id for n in data.MN_NODES]
+        with pytest.raises(ValueError):
+            datasets.register("test-mn-file", datasets._load_mn)
+    finally:
+        datasets._loaders.pop("test-mn-file")
+        datasets.clear_cache()
+    with pytest.raises(KeyError):
+        datasets.get_dataset("no-such-dataset")
@@ -0,0 +1,133 @@
+# Tests for the asyncio dispatch service. Run with: pytest -q
+
+import asyncio
+import json
+
+import pytest
+
+import mn_dataset as data
+from adjacency import AdjacencyIndex
+from batch_planner import RouteJob, plan_routes_batch
+from benchmarks.load import run_load
+from dispatch_service import DispatchService, ServiceClosed, ServiceOverloaded, _plan_batch, serve_http
+
+
+def _jobs():
+    customers = [n.id for n in data.MN_NODES if not n.is_depot]
+    return [RouteJob(data.MN_DEPOT.id, "company"),
+            RouteJob(data.MN_DEPOT.id, "driver", customer_ids=tuple(customers[:10])),
+            RouteJob(data.MN_DEPOT.id, "ethical", ethical_rule="priority")] * 10
+
+
+def test_concurrent_requests_are_batched_and_match_batch_planner():
+    async def scenario():
+        async with DispatchService(data.MN_NODES, data.MN_EDGES, batch_window_ms=5) as service:
+            results = await asyncio.gather(*(service.plan(job) for job in _jobs()))
+            return results, service.stats()
+
+    results, stats = asyncio.run(scenario())
+    expected = plan_routes_batch(_jobs(), data.MN_NODES, data.MN_EDGES, workers=1)
+    assert [(r.route, r.total) for r in results] == [(r.route, r.total) for r in expected]
+    assert stats["completed"] == 30 and stats["batches"] < 30
+    assert stats["planned_jobs"] < stats["batched_jobs"]     # repeated jobs planned once per batch
+    assert 0 < stats["p50"] <= stats["p99"] <= stats["max"]
+
+
+def test_backpressure_and_bad_jobs():
+    async def scenario():
+        async with DispatchService(data.MN_NODES, data.MN_EDGES, max_pending=5) as service:
+            outcomes = await asyncio.gather(*(service.plan(job) for job in _jobs()),
+                                            return_exceptions=True)
+            with pytest.raises(ValueError):
+                await service.plan(RouteJob(data.MN_DEPOT.id, "scenic"))
+            with pytest.raises(KeyError):
+                await service.plan(RouteJob(12345, "driver"))
+            return outcomes, service.stats()
+
+    outcomes, stats = asyncio.run(scenario())
+    rejected = [o for o in outcomes if isinstance(o, ServiceOverloaded)]
+    assert len(rejected) == 25 and stats["rejected"] == 25
+    assert stats["completed"] == 5 and stats["failed"] == 1
+
+
+def test_http_endpoint_under_concurrent_load():
+    async def scenario():
+        async with DispatchService(data.MN_NODES, data.MN_EDGES) as service:
+            server = await serve_http(service, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            report = await run_load(_jobs() * 5, concurrency=50, target=("127.0.0.1", port))
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"GET /nowhere HTTP/1.1\r\nConnection: close\r\n\r\n")
+            status = (await reader.read()).split(b"\r\n", 1)[0]
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return report, status
+
+    report, status = asyncio.run(scenario())
+    assert report["statuses"] == {"200": 150}
+    assert report["p99"] >= report["p50"] > 0
+    assert status == b"HTTP/1.1 404 Not Found"
+
+
+def test_one_bad_job_fails_only_itself():
+    good = RouteJob(data.MN_DEPOT.id, "driver")
+    planned = _plan_batch(AdjacencyIndex(data.MN_EDGES, data.MN_NODES),
+                          [good, RouteJob(data.MN_DEPOT.id, "ethical", ethical_rule=5), good])
+    assert isinstance(planned[1], Exception)
+    assert planned[0] == planned[2] and planned[0][1] == pytest.approx(289.48621618098906)
+
+    async def post(port, body):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"POST /route HTTP/1.1\r\nConnection: close\r\nContent-Length: %d\r\n\r\n%s"
+                     % (len(body), body))
+        reply = await reader.read()
+        writer.close()
+        return reply.split(b"\r\n", 1)[0]
+
+    async def scenario():
+        async with DispatchService(data.MN_NODES, data.MN_EDGES, batch_window_ms=20) as service:
+            with pytest.raises(ValueError):
+                await service.plan(RouteJob(data.MN_DEPOT.id, "ethical", ethical_rule=5))
+            server = await serve_http(service, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            bodies = [json.dumps({"depot_id": data.MN_DEPOT.id, "objective": "ethical", "ethical_rule": 5}),
+                      json.dumps({"depot_id": data.MN_DEPOT.id, "objective": "driver"}), "[1]"]
+            statuses = await asyncio.gather(*(post(port, body.encode()) for body in bodies))
+            server.close()
+            await server.wait_closed()
+            return statuses
+
+    assert asyncio.run(scenario()) == [b"HTTP/1.1 400 Bad Request", b"HTTP/1.1 200 OK",
+                                       b"HTTP/1.1 400 Bad Request"]
+
+
+def test_malformed_and_oversized_requests_get_answers():
+    async def send(port, raw):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(raw)
+        reply = await reader.read()
+        writer.close()
+        return reply.split(b"\r\n", 1)[0]
+
+    async def scenario():
+        async with DispatchService(data.MN_NODES, data.MN_EDGES) as service:
+            server = await serve_http(service, "127.0.0.1", 0, max_body=64)
+            port = server.sockets[0].getsockname()[1]
+            statuses = [await send(port, raw) for raw in (
+                b"NONSENSE\r\n\r\n",
+                b"POST /route HTTP/1.1\r\nContent-Length: lots\r\n\r\n",
+                b"POST /route HTTP/1.1\r\nContent-Length: 1000000000\r\n\r\n{",
+            )]
+            server.close()
+            await server.wait_closed()
+        closing = DispatchService(data.MN_NODES, data.MN_EDGES, batch_window_ms=1000)
+        async with closing:
+            queued = asyncio.get_running_loop().create_task(closing.plan(RouteJob(data.MN_DEPOT.id)))
+            await asyncio.sleep(0.05)
+        with pytest.raises(ServiceClosed):
+            await queued
+        return statuses
+
+    assert asyncio.run(scenario()) == [b"HTTP/1.1 400 Bad Request", b"HTTP/1.1 400 Bad Request",
+                                       b"HTTP/1.1 413 Payload Too Large"]
@@ -0,0 +1,30 @@
+# Tests for the pairwise distance cache. Run with: pytest -q
+
+import mn_dataset as data
+from distance_oracle import DistanceOracle
+from main import calculate_travel_cost
+
+
+def test_dense_and_sparse_match_distance_to():
+    for mode in ("dense", "sparse"):
+        oracle = DistanceOracle(data.MN_NODES, mode=mode)
+        for u in data.MN_NODES:
+            for v in data.MN_NODES:
+                assert oracle.distance(u, v) == u.distance_to(v)
+                assert oracle.travel_cost(u, v) == calculate_travel_cost(u.distance_to(v))
+        for edge in data.MN_EDGES:
+            assert edge.get_distance(oracle) == edge.get_distance()
+
+
+def test_sparse_cache_counts_and_evicts():
+    a, b, c = data.MN_NODES[:3]
+    oracle = DistanceOracle(data.MN_NODES, mode="sparse", max_entries=2)
+    oracle.distance(a, b)
+    oracle.distance(b, a)        # same pair, other direction
+    oracle.distance(a, c)
+    oracle.distance(b, c)        # evicts (a, b), the least recently used pair
+    oracle.distance(a, b)
+    stats = oracle.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 4, 2)
+    oracle.clear()
+    assert oracle.stats()["entries"] == 0 and oracle.hits == oracle.misses == 0
@@ -0,0 +1,87 @@
+# Tests for the multi-vehicle fleet planner. Run with: pytest -q
+
+import random
+
+import pytest
+
+import mn_dataset as data
+from benchmarks.generators import generate_dataset
+from greedy_approach import greedy_driver_route
+from main import Node
+from fleet_planner import METHODS, _nearest_pairs, plan_fleet, savings_routes, sweep_clusters
+
+ARGS = (data.MN_NODES, data.MN_DEPOT, data.MN_EDGES)
+CUSTOMERS = [node for node in data.MN_NODES if not node.is_depot]
+
+
+def test_every_customer_is_served_once_within_capacity():
+    for method in ("sweep", "savings"):
+        for vehicles, capacity in ((1, None), (3, None), (4, 7), (5, None)):
+            plan = plan_fleet(*ARGS, vehicles, capacity, method=method)
+            served = [node.id for route in plan.routes for node in route[1:-1]]
+            # the fleet has room for every customer, so none is left out
+            assert sorted(served) == sorted(n.id for n in CUSTOMERS) and plan.unassigned == []
+            assert len(plan.routes) <= vehicles and plan.total == pytest.approx(sum(plan.totals))
+            assert all(route[0] is data.MN_DEPOT and route[-1] is data.MN_DEPOT for route in plan.routes)
+            assert max(plan.loads) <= (capacity or -(-len(CUSTOMERS) // vehicles))
+
+    # one sweep vehicle is exactly the single-driver greedy route
+    plan = plan_fleet(*ARGS, 1, method="sweep")
+    route, total = greedy_driver_route(*ARGS)
+    assert [n.id for n in plan.routes[0]] == [n.id for n in route] and plan.totals[0] == total
+
+    with pytest.raises(ValueError):
+        plan_fleet(*ARGS, 2, method="tsp")
+
+
+def test_savings_respects_route_length_and_sweep_stays_in_sectors():
+    depot = data.MN_DEPOT
+    for sequence in savings_routes(CUSTOMERS, depot, capacity=100, max_distance=40.0):
+        stops = [depot] + sequence + [depot]
+        assert sum(a.distance_to(b) for a, b in zip(stops, stops[1:])) <= 40.0 + 1e-9
+
+    # a customer too far for any route is left out
+    far = max(CUSTOMERS, key=depot.distance_to)
+    limit = 2 * depot.distance_to(far) - 1e-6
+    served = {n.id for sequence in savings_routes(CUSTOMERS, depot, 100, max_distance=limit) for n in sequence}
+    assert far.id not in served
+
+    clusters = sweep_clusters(CUSTOMERS, depot, vehicles=5, capacity=5)
+    assert sorted(n.id for c in clusters for n in c) == sorted(n.id for n in CUSTOMERS)
+    assert [len(c) for c in clusters] == [5, 5, 5, 5, 4]
+
+
+def test_both_methods_keep_routes_within_max_distance():
+    for method in METHODS:
+        plan = plan_fleet(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES, 5, method=method, max_distance=40.0)
+        assert max(plan.distances) <= 40.0 + 1e-9 and plan.unassigned
+        served = [n.id for route in plan.routes for n in route[1:-1]] + [n.id for n in plan.unassigned]
+        assert sorted(served) == sorted(n.id for n in CUSTOMERS)
+
+
+def test_large_fleet_on_synthetic_data():
+    nodes, depot, edges = generate_dataset(3000, seed=1)
+    for method in ("sweep", "savings"):
+        plan = plan_fleet(nodes, depot, edges, 30, method=method)
+        assert len(plan.routes) <= 30 and max(plan.loads) <= 100
+        assert sum(len(route) - 2 for route in plan.routes) == len(nodes) - 1 and plan.unassigned == []
+
+
+def test_savings_on_collinear_and_clustered_customers():
+    rng = random.Random(5)
+    depot = Node(0, 0.0, 0.0, 0.0, 0.0, is_depot=True)
+    line = [depot] + [Node(i, 5.0, rng.uniform(-50, 50), 10.0, 2.0) for i in range(1, 2001)]
+    plan = plan_fleet(line, depot, [], 20)
+    assert plan.unassigned == [] and plan.loads == [100.0] * 20
+
+    # a dense cluster plus one far outlier: every customer still finds close partners
+    cluster = [Node(i, 100 + rng.gauss(0, 0.1), 100 + rng.gauss(0, 0.1), 10.0, 2.0) for i in range(1, 3000)]
+    outlier = Node(3000, -900.0, -900.0, 10.0, 2.0)
+    xs = [node.x for node in cluster + [outlier]]
+    ys = [node.y for node in cluster + [outlier]]
+    nearest = _nearest_pairs(xs, ys, 10)
+    assert all(len(partners) == 10 and len(xs) - 1 not in partners for partners in nearest[:-1])
+    exact = min(range(1, len(xs)), key=lambda j: (xs[j] - xs[0]) ** 2 + (ys[j] - ys[0]) ** 2)
+    assert nearest[0][0] == exact
+    plan = plan_fleet([depot] + cluster + [outlier], depot, [], 30)
+    assert plan.unassigned == [] and sum(plan.loads) == 3000
@@ -0,0 +1,48 @@
+# Tests for union-find connected components. Run with: pytest -q
+
+import mn_dataset as data
+from main import Node, Edge
+from adjacency import AdjacencyIndex
+from graph_components import ComponentIndex, UnionFind, route_components
+from greedy_approach import greedy_driver_route
+from partitioned_routing import partitioned_route
+from profiling import RouteProfiler
+
+
+def _islands():
+    depot = Node(0, 0.0, 0.0, 0.0, 0.0, "downtown", 1, is_depot=True)
+    a, b, c, d, e = (Node(i, x, y, 10.0, 2.0, "suburban", 3)
+                     for i, x, y in ((1, 1.0, 0.0), (2, 2.0, 0.0), (3, 20.0, 0.0), (4, 21.0, 0.0), (5, 40.0, 0.0)))
+    edges = [Edge(depot, a), Edge(a, b), Edge(b, a), Edge(c, d), Edge(d, d)]
+    return [depot, a, b, c, d, e], depot, edges
+
+
+def test_union_find_and_component_index():
+    sets = UnionFind(4)
+    assert sets.union(0, 1) and sets.union(3, 2) and not sets.union(1, 0)
+    assert sets.find(1) == sets.find(0) != sets.find(2) == sets.find(3)
+
+    nodes, depot, edges = _islands()
+    graph = AdjacencyIndex(edges, nodes)
+    components = ComponentIndex(graph)
+    assert [[n.id for n in components.nodes_of(c)] for c in range(len(components))] == [[0, 1, 2], [3, 4], [5]]
+    assert components.component_of(nodes[4]) == 1 and components.component_of(Node(99, 0.0, 0.0)) == -1
+    # without the depot, nothing connects 1-2 to anything else and 0 is outside the set
+    assert ComponentIndex(graph, [2, 1, 5]).members == [[2, 1], [5]]
+    assert ComponentIndex(graph, [2, 1, 5]).label[0] == -1
+
+
+def test_route_components_bound_fallback_jumps():
+    connected = route_components(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES)
+    assert len(connected.reachable) == len(data.MN_NODES) - 1 and connected.forced_jumps == 0
+
+    nodes, depot, edges = _islands()
+    split = route_components(nodes, depot, edges)
+    assert [n.id for n in split.reachable] == [1, 2]
+    assert [[n.id for n in c] for c in split.unreachable] == [[3, 4], [5]] and split.forced_jumps == 2
+    with RouteProfiler() as profiler:
+        greedy_driver_route(nodes, depot, edges)
+    assert profiler.counters["fallback_jumps"] >= split.forced_jumps
+
+    result = partitioned_route(nodes, depot, edges, method="components", parts=2, workers=1)
+    assert sorted(sorted(part) for part in result.partitions) == [[1, 2, 5], [3, 4]]
@@ -0,0 +1,41 @@
+# Tests for the 2-opt / Or-opt route improver. Run with: pytest -q
+
+import pytest
+
+import mn_dataset as data
+from benchmarks import generate_dataset
+from greedy_approach import greedy_company_route, greedy_driver_route
+from local_search import improve_route, route_total
+from policies import CompanyPolicy, DriverPolicy, FatiguePolicy
+from test_greedy_ab import EXPECTED_PART_A_TOTAL, EXPECTED_PART_B_TOTAL, _assert_route_well_formed
+
+
+def test_improves_mn_routes_without_breaking_them():
+    cases = ((greedy_company_route, "company", CompanyPolicy(), EXPECTED_PART_A_TOTAL),
+             (greedy_driver_route, "driver", DriverPolicy(), EXPECTED_PART_B_TOTAL))
+    for router, name, policy, expected in cases:
+        route, total = router(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES)
+        assert route_total(route, policy) == total
+        better, better_total = improve_route(route, name, time_budget_ms=1000)
+        _assert_route_well_formed(better, data.MN_DEPOT, data.MN_NODES)
+        assert better_total > expected
+        assert better_total == route_total(better, policy)
+
+
+def test_respects_time_budget_on_1k_stops():
+    nodes, depot, edges = generate_dataset(1001)
+    route, total = greedy_driver_route(nodes, depot, edges)
+    # a spent budget makes no moves at all (no wall-clock assertion, which would flake)
+    unchanged, unchanged_total = improve_route(route, DriverPolicy(), time_budget_ms=0)
+    assert [n.id for n in unchanged] == [n.id for n in route] and unchanged_total == total
+    better, better_total = improve_route(route, DriverPolicy(), time_budget_ms=50)
+    assert better_total >= total
+    assert sorted(n.id for n in better) == sorted(n.id for n in route)
+
+
+def test_rejects_order_dependent_policies():
+    route, _ = greedy_driver_route(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES)
+    with pytest.raises(ValueError):
+        improve_route(route, FatiguePolicy())
+    with pytest.raises(ValueError):
+        improve_route(route, "fatigue")
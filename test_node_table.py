@@ -0,0 +1,39 @@
+# Tests for the array-backed node/edge tables. Run with: pytest -q
+
+import mn_dataset as data
+import greedy_approach as stu
+from distance_oracle import DistanceOracle
+from node_table import NodeTable, EdgeTable
+
+ATTRS = ("id", "x", "y", "delivery_fee", "estimated_tip", "region", "priority", "is_depot",
+         "window_start", "window_end", "service_time")
+
+
+def test_views_expose_node_attributes():
+    table = NodeTable.from_nodes(data.MN_NODES)
+    for node, view in zip(data.MN_NODES, table.views()):
+        for attr in ATTRS:
+            assert getattr(view, attr) == getattr(node, attr)
+        assert repr(view) == repr(node)
+    assert table.depot().id == data.MN_DEPOT.id
+    assert not hasattr(table[0], "__dict__")
+
+
+def test_edge_views_match_edges():
+    nodes = NodeTable.from_nodes(data.MN_NODES)
+    edges = EdgeTable.from_edges(data.MN_EDGES, nodes)
+    oracle = DistanceOracle(nodes.views())
+    for edge, view in zip(data.MN_EDGES, edges):
+        assert (view.u.id, view.v.id) == (edge.u.id, edge.v.id)
+        assert view.get_distance() == view.get_distance(oracle) == edge.get_distance()
+        assert repr(view) == repr(edge)
+
+
+def test_routes_run_on_tables():
+    nodes = NodeTable.from_nodes(data.MN_NODES)
+    edges = EdgeTable.from_edges(data.MN_EDGES, nodes)
+    for fn in (stu.greedy_company_route, stu.greedy_driver_route):
+        expected_route, expected_total = fn(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES)
+        route, total = fn(nodes.views(), nodes.depot(), list(edges))
+        assert [n.id for n in route] == [n.id for n in expected_route]
+        assert total == expected_total
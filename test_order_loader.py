@@ -0,0 +1,108 @@
+# Tests for streaming CSV/JSONL order import. Run with: pytest -q
+
+import csv
+import json
+
+import pytest
+
+import mn_dataset as data
+import greedy_approach as stu
+from order_loader import ORDER_FIELDS, load_orders, load_roads
+from test_node_table import ATTRS
+
+
+def _order_row(node):
+    return [node.id, node.x, node.y, node.delivery_fee, node.estimated_tip,
+            node.region, node.priority, int(node.is_depot)]
+
+
+def _write_csv(path, rows, header=ORDER_FIELDS, quoting=csv.QUOTE_MINIMAL):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f, quoting=quoting)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return str(path)
+
+
+def _write_mn(tmp_path):
+    orders = _write_csv(tmp_path / "orders.csv", [_order_row(n) for n in data.MN_NODES])
+    roads = _write_csv(tmp_path / "roads.csv", [[e.u.id, e.v.id] for e in data.MN_EDGES], header=("u", "v"))
+    return orders, roads
+
+
+def test_csv_and_jsonl_load_mn(tmp_path):
+    orders, roads = _write_mn(tmp_path)
+    jsonl = tmp_path / "orders.jsonl"
+    jsonl.write_text("".join(json.dumps({**dict(zip(ORDER_FIELDS, _order_row(n))), "is_depot": n.is_depot}) + "\n"
+                             for n in data.MN_NODES))
+    quoted = _write_csv(tmp_path / "quoted.csv", [_order_row(n) for n in data.MN_NODES], quoting=csv.QUOTE_ALL)
+
+    for path, chunk_rows in ((orders, 65536), (orders, 4), (str(jsonl), 3), (quoted, 5)):
+        nodes = load_orders(path, chunk_rows=chunk_rows)
+        for node, view in zip(data.MN_NODES, nodes):
+            assert all(getattr(view, attr) == getattr(node, attr) for attr in ATTRS)
+
+    edges = load_roads(roads, nodes, chunk_rows=7)
+    route, total = stu.greedy_driver_route(nodes.views(), nodes.depot(), list(edges))
+    assert total == stu.greedy_driver_route(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES)[1]
+
+
+@pytest.mark.parametrize("change, message", [
+    (lambda rows: rows[3].__setitem__(6, 6), "row 4: priority"),
+    (lambda rows: rows[5].__setitem__(5, "urban"), "row 6: region"),
+    (lambda rows: rows[2].__setitem__(7, 1), "exactly one depot"),
+    (lambda rows: rows[9].__setitem__(0, 1), "row 10: duplicate id 1"),
+    (lambda rows: rows[7].__setitem__(1, "nan"), "row 8: x"),
+    (lambda rows: rows[4].append("extra"), "row 5 has 9 fields"),
+])
+def test_invalid_orders_are_reported(tmp_path, change, message):
+    rows = [_order_row(n) for n in data.MN_NODES]
+    change(rows)
+    path = _write_csv(tmp_path / "bad.csv", rows)
+    with pytest.raises(ValueError, match=message):
+        load_orders(path, chunk_rows=8)
+
+
+def test_invalid_roads_and_json_types(tmp_path):
+    orders, _ = _write_mn(tmp_path)
+    nodes = load_orders(orders)
+    roads = _write_csv(tmp_path / "roads.csv", [[0, 1], [1, 404]], header=("u", "v"))
+    with pytest.raises(ValueError, match="row 2: v must be a known node id"):
+        load_roads(roads, nodes)
+
+    jsonl = tmp_path / "orders.jsonl"
+    jsonl.write_text(json.dumps(dict(zip(ORDER_FIELDS, [1.5, 0, 0, 0, 0, "rural", 3, True]))) + "\n")
+    with pytest.raises(ValueError, match="id must be an integer"):
+        load_orders(str(jsonl))
+
+
+def test_rows_after_blank_lines_keep_their_line_numbers(tmp_path):
+    rows = [_order_row(n) for n in data.MN_NODES]
+    rows[6][6] = 9
+    path = _write_csv(tmp_path / "blank.csv", rows[:2] + [[], []] + rows[2:])
+    with pytest.raises(ValueError, match="row 9: priority"):
+        load_orders(path, chunk_rows=8)
+    with pytest.raises(ValueError, match="row 9: priority"):
+        load_orders(path)
+
+    jsonl = tmp_path / "blank.jsonl"
+    jsonl.write_text("\n\n" + "".join(json.dumps(dict(zip(ORDER_FIELDS, row))) + "\n" for row in rows))
+    with pytest.raises(ValueError, match="row 9: priority"):
+        load_orders(str(jsonl), chunk_rows=3)
+
+
+@pytest.mark.parametrize("change, message", [
+    (lambda record: "[1, 2]", "row 3: expected a JSON object, got list"),
+    (lambda record: json.dumps(record)[:-1], "row 3: invalid JSON"),
+    (lambda record: json.dumps({**record, "region": ["rural"]}), "row 3: region must be one of"),
+    (lambda record: json.dumps({**record, "priority": True}), "row 3: priority must be an integer"),
+    (lambda record: json.dumps({**record, "id": 0}), "row 3: duplicate id 0"),
+])
+def test_malformed_jsonl_rows_are_reported(tmp_path, change, message):
+    records = [dict(zip(ORDER_FIELDS, _order_row(n))) for n in data.MN_NODES[:4]]
+    lines = [json.dumps(record) for record in records]
+    lines[2] = change(records[2])
+    jsonl = tmp_path / "bad.jsonl"
+    jsonl.write_text("\n".join(lines) + "\n")
+    with pytest.raises(ValueError, match=message):
+        load_orders(str(jsonl), chunk_rows=2)
@@ -0,0 +1,52 @@
+# Tests for ethical-rule parameter sweeps. Run with: pytest -q
+
+import math
+
+import pytest
+
+import mn_dataset as data
+from greedy_approach import greedy_ethical_route
+from policies import FairnessPolicy, ethical_policy
+from parameter_sweep import SweepPoint, parameter_grid, pareto_front, read_sweep, run_sweep
+
+ARGS = (data.MN_NODES, data.MN_DEPOT, data.MN_EDGES)
+
+
+def test_grid_points_match_the_ethical_router():
+    points = parameter_grid("fairness", alternate_bonus=[0.0, 3.0], high_tip_threshold=[2.5, 3.0])
+    assert len(points) == 4 and dict(points[-1].params) == {"alternate_bonus": 3.0, "high_tip_threshold": 3.0}
+    points += [SweepPoint("fatigue"), SweepPoint("priority", (("urgent_bonus", 8.0),))]
+
+    results = run_sweep(points, *ARGS, workers=1)
+    for i, point in enumerate(points):
+        _, total = greedy_ethical_route(*ARGS, ethical_policy(point.rule, **dict(point.params)))
+        assert results["total"][i] == total
+    # the default constants give the Part C totals
+    assert results["total"][3] == greedy_ethical_route(*ARGS, "fairness")[1]
+    assert results["total"][4] == greedy_ethical_route(*ARGS, "fatigue")[1]
+    assert results.row(5)["rule"] == "priority" and "param:alternate_bonus" not in results.row(5)
+    assert math.isnan(results["param:high_tip_threshold"][4])
+
+    with pytest.raises(TypeError):
+        parameter_grid("fatigue", alternate_bonus=[1.0])
+    assert repr(ethical_policy("fairness", alternate_bonus=1.0).terms[1][1]) == repr(FairnessPolicy(alternate_bonus=1.0))
+
+
+def test_pool_and_streamed_file_agree(tmp_path):
+    points = parameter_grid("fatigue", long_drive_miles=[10.0, 15.0, 20.0], rest_bonus=[0.0, 3.0, 6.0])
+    path = str(tmp_path / "sweep.swp")
+    serial = run_sweep(points, *ARGS, workers=1)
+    pooled = run_sweep(points, *ARGS, path=path, workers=2, flush_every=4)
+    stored = read_sweep(path)
+    assert serial.columns == pooled.columns == stored.columns and stored.rules == ["fatigue"]
+
+    with open(path, "ab") as f:             # a chunk still being written is skipped
+        f.write(b"\x05\0\0\0\0\0\0\0partial")
+    assert len(read_sweep(path)) == len(points)
+
+
+def test_pareto_front():
+    earnings = [10.0, 9.0, 9.0, 8.0, 7.0, 10.0, 6.0]
+    values = [1.0, 3.0, 2.0, 3.0, 5.0, 1.0, math.nan]
+    assert pareto_front(earnings, values) == [0, 5, 1, 4]
+    assert pareto_front(earnings, values, maximize=False) == [0, 5]
@@ -0,0 +1,48 @@
+# Tests for region-partitioned routing. Run with: pytest -q
+
+import pytest
+
+import mn_dataset as data
+from main import Node
+from batch_planner import RouteJob, plan_routes_batch
+from partitioned_routing import partition_kmeans, partitioned_route, stitch
+from test_greedy_ab import EXPECTED_PART_A_TOTAL
+
+ARGS = (data.MN_NODES, data.MN_DEPOT, data.MN_EDGES)
+
+
+def test_sub_routes_match_routing_each_region_on_the_full_graph():
+    result = partitioned_route(*ARGS, objective="company", workers=1)
+    customers = sorted(n.id for n in data.MN_NODES if not n.is_depot)
+    assert sorted(i for part in result.partitions for i in part) == customers
+    assert {frozenset(data.MN_NODES[i].region for i in part) for part in result.partitions} == \
+        {frozenset([region]) for region in ("downtown", "suburban", "rural")}
+
+    jobs = [RouteJob(data.MN_DEPOT.id, "company", tuple(sorted(part))) for part in result.partitions]
+    for part, planned in zip(result.partitions, plan_routes_batch(jobs, data.MN_NODES, data.MN_EDGES, workers=1)):
+        ids = [n.id for n in planned.route[1:-1]]
+        assert part in (ids, ids[::-1])
+
+    assert [n.id for n in result.route[1:-1]] == [i for part in result.partitions for i in part]
+    assert result.monolithic_total == EXPECTED_PART_A_TOTAL
+    assert result.loss == result.monolithic_total - result.total > 0
+
+
+def test_kmeans_partitions_are_deterministic_and_pool_agrees():
+    serial = partitioned_route(*ARGS, objective="ethical", ethical_rule="fairness", method="kmeans",
+                               parts=3, workers=1, compare=False)
+    pooled = partitioned_route(*ARGS, objective="ethical", ethical_rule="fairness", method="kmeans",
+                               parts=3, workers=2, compare=False)
+    assert serial.route == pooled.route and serial.total == pooled.total
+    assert serial.loss is None and "monolithic" not in serial.seconds
+    customers = [n for n in data.MN_NODES if not n.is_depot]
+    assert len(partition_kmeans(customers, 3)) == 3 and partition_kmeans([], 3) == []
+    with pytest.raises(ValueError):
+        partitioned_route(*ARGS, method="grid")
+
+
+def test_stitch_joins_nearest_segment_ends():
+    depot = Node(0, 0.0, 0.0, 0.0, 0.0, "downtown", 1, is_depot=True)
+    a, b, c, d = (Node(i, x, 0.0, 1.0, 0.0, "downtown", 1) for i, x in ((1, 5.0), (2, 1.0), (3, 2.0), (4, 6.0)))
+    route, order = stitch(depot, [[a, d], [c, b], []])
+    assert [n.id for n in route] == [0, 2, 3, 1, 4, 0] and order == [1, 0]
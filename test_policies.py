@@ -0,0 +1,59 @@
+# Tests for the pluggable scoring policies. Run with: pytest -q
+
+import mn_dataset as data
+import greedy_approach as stu
+from adjacency import AdjacencyIndex
+from route_building import scoring_engine
+from policies import (CompanyPolicy, DriverPolicy, FairnessPolicy, FatiguePolicy,
+                      PriorityPolicy, WeightedPolicy, ethical_policy)
+from test_greedy_c import _avg_urgent_position
+
+STATES = [
+    {"last_was_high_tip": False, "consecutive_long": 0, "urgent_streak": 0},
+    {"last_was_high_tip": True, "consecutive_long": 2, "urgent_streak": 3},
+    {"last_was_high_tip": True, "consecutive_long": 1, "urgent_streak": 1},
+]
+
+
+def test_scalar_and_batched_scores_agree():
+    graph = AdjacencyIndex(data.MN_EDGES, data.MN_NODES)
+    engine = scoring_engine(graph)
+    slots = list(range(len(graph)))
+    policies = [CompanyPolicy(), DriverPolicy(), FairnessPolicy(), FatiguePolicy(), PriorityPolicy(),
+                WeightedPolicy([(1.0, DriverPolicy()), (0.5, FairnessPolicy()), (2.0, FatiguePolicy())])]
+    for policy in policies:
+        for state in STATES:
+            for current, node in enumerate(graph.nodes):
+                batch = policy.score_batch(engine, current, slots, engine.distances(current, slots), state)
+                assert batch == [policy.score(node, other, state) for other in graph.nodes]
+
+
+def test_rule_names_map_to_policies():
+    for rule in ("fairness", "fatigue", "priority"):
+        by_name = stu.greedy_ethical_route(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES, rule)
+        by_policy = stu.greedy_ethical_route(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES,
+                                             ethical_policy(rule))
+        assert [n.id for n in by_name[0]] == [n.id for n in by_policy[0]]
+        assert by_name[1] == by_policy[1]
+
+
+def test_company_policy_reproduces_part_a():
+    expected = stu.greedy_company_route(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES)
+    route, total = stu.greedy_policy_route(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES,
+                                           CompanyPolicy(), reward="company")
+    assert [n.id for n in route] == [n.id for n in expected[0]]
+    assert total == expected[1]
+
+
+def test_combined_fairness_and_fatigue_route_is_valid():
+    policy = WeightedPolicy([(1.0, DriverPolicy()), (1.0, FairnessPolicy()), (1.0, FatiguePolicy())])
+    route, _ = stu.greedy_policy_route(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES, policy)
+    assert route[0].id == route[-1].id == data.MN_DEPOT.id
+    assert sorted(n.id for n in route[1:-1]) == sorted(n.id for n in data.MN_NODES if not n.is_depot)
+
+
+def test_default_priority_rule_moves_urgent_stops_earlier():
+    driver, driver_total = stu.greedy_driver_route(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES)
+    route, total = stu.greedy_ethical_route(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES, "priority")
+    assert total < driver_total
+    assert _avg_urgent_position(route) < _avg_urgent_position(driver)
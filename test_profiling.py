@@ -0,0 +1,59 @@
+# Tests for the opt-in route profiler. Run with: pytest -q
+
+import json
+
+import mn_dataset as data
+from adjacency import AdjacencyIndex
+from greedy_approach import greedy_company_route, greedy_driver_route, greedy_ethical_route
+from profiling import RouteProfiler, current_profiler
+from test_greedy_ab import EXPECTED_PART_A_TOTAL, EXPECTED_PART_B_TOTAL
+
+
+def test_profiled_routes_match_and_count_steps():
+    with RouteProfiler() as profiler:
+        route, total = greedy_driver_route(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES)
+        assert current_profiler() is profiler
+    assert current_profiler() is None
+    assert total == EXPECTED_PART_B_TOTAL
+    assert route == greedy_driver_route(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES)[0]
+
+    report = profiler.to_dict()
+    (summary,) = report["routes"]
+    assert summary["name"] == "driver" and summary["steps"] == len(route) - 1
+    counters = report["counters"]
+    # one neighbor lookup per stop; every stop comes from a lookup or a fallback jump
+    assert counters["neighbor_lookups"] == len(route) - 2
+    assert sum(step.get("neighbor_lookups", 0) for step in summary["step_counters"]) == len(route) - 2
+    assert counters["candidates_scored"] >= len(route) - 2
+    assert report["phases"]["select"]["calls"] == len(route) - 2
+    assert report["phases"]["fallback"]["calls"] == counters.get("fallback_jumps", 0)
+
+
+def test_frontier_cache_hits_and_policy_routes():
+    index = AdjacencyIndex(data.MN_EDGES, data.MN_NODES)
+    greedy_company_route(data.MN_NODES, data.MN_DEPOT, index)       # warm the frontier cache
+    with RouteProfiler() as profiler:
+        _, total = greedy_company_route(data.MN_NODES, data.MN_DEPOT, index)
+        greedy_ethical_route(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES, "priority")
+    assert total == EXPECTED_PART_A_TOTAL
+    counters = profiler.to_dict()["counters"]
+    assert counters["frontier_hits"] > 0 and "frontier_misses" not in counters
+    assert [r["name"] for r in profiler.routes] == ["company", "WeightedPolicy"]
+
+    # the cache keeps the plain scorer, so later unprofiled routes don't report here
+    events = len(profiler.chrome_trace()["traceEvents"])
+    greedy_company_route(data.MN_NODES, data.MN_DEPOT, index)
+    assert len(profiler.chrome_trace()["traceEvents"]) == events
+
+
+def test_chrome_trace_export(tmp_path):
+    with RouteProfiler() as profiler:
+        greedy_driver_route(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES)
+    path = tmp_path / "trace.json"
+    profiler.write_chrome_trace(str(path))
+    trace = json.loads(path.read_text())["traceEvents"]
+    assert {e["ph"] for e in trace} == {"X"}
+    steps = [e for e in trace if e["name"] == "step"]
+    assert [e["args"]["step"] for e in steps] == list(range(len(steps)))
+    (route,) = [e for e in trace if e["cat"] == "route"]
+    assert all(route["ts"] <= e["ts"] and e["dur"] >= 0 for e in steps)
@@ -0,0 +1,42 @@
+# Tests for road-network distances and road-distance routing. Run with: pytest -q
+
+import mn_dataset as data
+from main import Node, calculate_travel_cost
+from road_network import RoadNetwork
+from greedy_approach import analyze_fatigue_impact, greedy_company_route, iter_driver_route
+
+
+def test_distances_agree_across_search_modes():
+    trees = RoadNetwork(data.MN_EDGES, data.MN_NODES)
+    for u in data.MN_NODES:
+        tree = trees.tree(u)
+        for v in data.MN_NODES:
+            plain = RoadNetwork(data.MN_EDGES, data.MN_NODES).distance(u, v)      # A*
+            alt = RoadNetwork(data.MN_EDGES, data.MN_NODES, landmarks=3).distance(u, v)
+            assert abs(plain - tree[v]) < 1e-9 and abs(alt - tree[v]) < 1e-9
+            assert tree[v] >= u.distance_to(v) - 1e-9
+
+
+def test_path_and_unreachable_pairs():
+    net = RoadNetwork(data.MN_EDGES, data.MN_NODES, landmarks=2)
+    u, v = data.MN_NODES[1], data.MN_NODES[-1]
+    path = net.path(u, v)
+    assert path[0] is u and path[-1] is v
+    length = sum(a.distance_to(b) for a, b in zip(path, path[1:]))
+    assert abs(length - net.distance(u, v)) < 1e-9
+
+    island = Node(99, 0.0, 1.0, 5.0)
+    net.ensure_nodes([island])
+    assert net.path(u, island) == []
+    assert net.distance(u, island) == u.distance_to(island)
+
+
+def test_routes_charge_road_distance():
+    net = RoadNetwork(data.MN_EDGES, data.MN_NODES)
+    route, profit = greedy_company_route(data.MN_NODES, data.MN_DEPOT, net)
+    assert sorted(n.id for n in route[1:-1]) == sorted(n.id for n in data.MN_NODES if not n.is_depot)
+    expected = sum(b.delivery_fee - calculate_travel_cost(net.distance(a, b))
+                   for a, b in zip(route, route[1:]))
+    assert abs(profit - expected) < 1e-9
+    assert list(iter_driver_route(data.MN_NODES, data.MN_DEPOT, net))[-1][0] is data.MN_DEPOT
+    analyze_fatigue_impact(route, net)
@@ -0,0 +1,46 @@
+# Tests for batch route analytics. Run with: pytest -q
+
+import pytest
+
+import mn_dataset as data
+from greedy_approach import greedy_company_route, greedy_driver_route, greedy_ethical_route
+from node_table import NodeTable
+from route_analytics import analyze_padded, analyze_ragged, analyze_routes, routes_to_ragged
+from test_greedy_c import _alternations_tip, _avg_urgent_position, _long_drive_stats
+
+
+def _mn_routes():
+    args = (data.MN_NODES, data.MN_DEPOT, data.MN_EDGES)
+    return ([greedy_company_route(*args), greedy_driver_route(*args)]
+            + [greedy_ethical_route(*args, rule) for rule in ("fairness", "fatigue", "priority")])
+
+
+def test_metrics_match_single_route_helpers_and_router_totals():
+    planned = _mn_routes()
+    metrics = analyze_routes([route for route, _ in planned])
+    assert len(metrics) == 5
+    for i, (route, total) in enumerate(planned):
+        assert metrics.alternations[i] == _alternations_tip(route)
+        assert (metrics.long_drives[i], metrics.max_consecutive_long[i]) == _long_drive_stats(route)
+        assert metrics.avg_urgent_position[i] == _avg_urgent_position(route)
+        row = metrics.row(i)
+        assert sum(row["region_stops"].values()) == row["stops"] == row["urgent"] + row["routine"]
+        assert row["high_tip"] + row["low_tip"] == row["stops"] == len(route) - 2
+    assert metrics.company_profit[0] == planned[0][1]
+    assert [metrics.driver_earnings[i] for i in range(1, 5)] == [total for _, total in planned[1:]]
+
+
+def test_input_layouts_agree():
+    routes = [route for route, _ in _mn_routes()] + [[data.MN_DEPOT], []]
+    ids, offsets, _ = routes_to_ragged(routes)
+    table = NodeTable.from_nodes(data.MN_NODES)
+    width = max(map(len, routes))
+    matrix = [[n.id for n in route] + [-1] * (width - len(route)) for route in routes]
+
+    ragged = analyze_ragged(ids, offsets, table)
+    assert analyze_padded(matrix, data.MN_NODES) == ragged == analyze_routes(routes)
+    empty = ragged.row(6)
+    assert empty["stops"] == 0 and empty["distance"] == 0.0 and empty["avg_urgent_position"] == 0.0
+
+    with pytest.raises(ValueError):
+        analyze_ragged(ids, [0, 5, 3, len(ids)], table)
@@ -0,0 +1,79 @@
+# Tests for incremental re-planning with RoutePlanner. Run with: pytest -q
+
+import pytest
+
+import mn_dataset as data
+from main import Node
+from greedy_approach import greedy_company_route, greedy_driver_route, greedy_ethical_route
+from road_network import RoadNetwork
+from route_planner import RoutePlanner
+from test_greedy_ab import EXPECTED_PART_B_TOTAL
+
+
+def _ids(nodes):
+    return [n.id for n in nodes]
+
+
+def test_initial_plan_matches_the_routers():
+    args = (data.MN_NODES, data.MN_DEPOT, data.MN_EDGES)
+    cases = [("company", greedy_company_route(*args)), ("driver", greedy_driver_route(*args))]
+    cases += [(rule, greedy_ethical_route(*args, rule)) for rule in ("fairness", "fatigue", "priority")]
+    for policy, (route, total) in cases:
+        planner = RoutePlanner(*args, policy)
+        assert _ids(planner.planned_route()) == _ids(route[1:])
+        assert planner.planned_total() == total
+
+
+def test_plans_by_road_on_a_road_network():
+    args = (data.MN_NODES, data.MN_DEPOT, RoadNetwork(data.MN_EDGES, data.MN_NODES))
+    cases = [("driver", greedy_driver_route(*args)), ("fatigue", greedy_ethical_route(*args, "fatigue"))]
+    for policy, (route, total) in cases:
+        planner = RoutePlanner(*args, policy)
+        assert _ids(planner.planned_route()) == _ids(route[1:])
+        assert planner.planned_total() == total
+    assert cases[0][1][1] < EXPECTED_PART_B_TOTAL        # road legs are never shorter
+    with pytest.raises(ValueError):
+        planner.add_stop(Node(500, 1.0, 1.0, 5.0, 1.0))
+
+
+def test_following_the_plan_keeps_totals_and_state():
+    planner = RoutePlanner(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES, "fatigue")
+    route, _ = greedy_ethical_route(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES, "fatigue")
+    for node in route[1:-1]:
+        reached, _, total = planner.advance_to(node.id)
+        assert reached is node and total == planner.total
+    assert planner.planned_route() == [data.MN_DEPOT]
+    assert planner.planned_total() == EXPECTED_PART_B_TOTAL
+    assert _ids(planner.route) == _ids(route[:-1])
+    assert planner.stats()["replans"] == 1          # only the initial plan
+    with pytest.raises(ValueError):
+        planner.advance_to(route[1].id)
+
+
+def test_changes_replan_only_the_affected_suffix():
+    planner = RoutePlanner(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES, "fairness")
+    for node in planner.planned_route()[:5]:
+        planner.advance_to(node.id)
+    before = _ids(planner.planned_route())
+
+    # a low-paying order far away, reachable only from the last planned stop, is never
+    # preferred, so the whole plan is kept and it is appended at the end
+    far = Node(100, 200.0, 200.0, 1.0, 0.0, "rural", 5)
+    assert planner.add_stop(far, roads=[before[-2]]) == len(before) - 1
+    assert _ids(planner.planned_route()) == before[:-1] + [100, data.MN_DEPOT.id]
+
+    # a lucrative order next to the driver takes over from the next step
+    rich = Node(101, planner.current.x, planner.current.y + 0.5, 40.0, 10.0, "downtown", 1)
+    assert planner.add_stop(rich, roads=[planner.current.id]) == 0
+    assert planner.planned_route()[0] is rich
+
+    kept = planner.planned_route()[:3]
+    assert planner.cancel_stop(planner.planned_route()[3].id) == 3
+    assert planner.planned_route()[:3] == kept
+
+    # off-plan stop, then every incremental plan matches a full re-plan
+    planner.advance_to(planner.planned_route()[2].id)
+    plan, total = _ids(planner.planned_route()), planner.planned_total()
+    planner.replan()
+    assert _ids(planner.planned_route()) == plan and planner.planned_total() == total
+    assert planner.stats()["kept_steps"] > 0
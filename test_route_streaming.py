@@ -0,0 +1,38 @@
+# Tests for the streaming route generators. Run with: pytest -q
+
+import pytest
+
+import mn_dataset as data
+import greedy_approach as stu
+
+PAIRS = [
+    (stu.greedy_company_route, stu.iter_company_route),
+    (stu.greedy_driver_route, stu.iter_driver_route),
+]
+
+
+def test_generators_match_full_routes():
+    for full_fn, iter_fn in PAIRS:
+        route, total = full_fn(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES)
+        steps = list(iter_fn(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES))
+        assert [n.id for n, _, _ in steps] == [n.id for n in route[1:]]
+        assert steps[-1][2] == total
+        running = 0.0
+        for _, step, running_total in steps:
+            running += step
+            assert running == running_total
+
+
+def test_first_stop_then_cancel():
+    steps = stu.iter_ethical_route(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES, "fairness")
+    route, _ = stu.greedy_ethical_route(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES, "fairness")
+    first, _, _ = next(steps)
+    assert first.id == route[1].id
+    steps.close()
+    with pytest.raises(StopIteration):
+        next(steps)
+
+
+def test_bad_rule_raises_before_iterating():
+    with pytest.raises(ValueError):
+        stu.iter_ethical_route(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES, "speed")
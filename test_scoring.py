@@ -0,0 +1,36 @@
+# Tests for the batched scoring engine. Run with: pytest -q
+
+import mn_dataset as data
+import greedy_approach as stu
+from adjacency import AdjacencyIndex
+from scoring import ScoringEngine, argmax_first
+
+# Ethical totals on mn_dataset.py from the scalar per-candidate implementation.
+EXPECTED_ETHICAL_TOTALS = {
+    "fairness": 278.5268772536136,
+    "fatigue": 289.48621618098906,
+    "priority": 280.8685641891195,
+}
+
+
+def test_batched_scores_match_scalar_bit_for_bit():
+    graph = AdjacencyIndex(data.MN_EDGES, data.MN_NODES)
+    engine = ScoringEngine(graph.nodes)
+    slots = list(range(len(graph)))
+    for current, node in enumerate(graph.nodes):
+        company = engine.company_scores(current, slots)
+        driver = engine.driver_scores(current, slots)
+        for s, other in enumerate(graph.nodes):
+            assert company[s] == stu.company_profit(node, other)
+            assert driver[s] == stu.driver_earnings(node, other)
+            assert engine.distances(current, [s])[0] == node.distance_to(other)
+
+
+def test_argmax_first_takes_first_tie():
+    assert argmax_first([1.0, 3.0, 2.0, 3.0]) == 1
+
+
+def test_ethical_totals_unchanged():
+    for rule, expected in EXPECTED_ETHICAL_TOTALS.items():
+        _, total = stu.greedy_ethical_route(data.MN_NODES, data.MN_DEPOT, data.MN_EDGES, rule)
+        assert total == expected
@@ -0,0 +1,53 @@
+# Tests for the fallback-jump spatial index. Run with: pytest -q
+
+import random
+
+from spatial_index import GridIndex
+
+
+def _brute_best(xs, ys, values, remaining, x, y):
+    best, best_score = None, -float('inf')
+    for s in remaining:
+        score = values[s] - ((x - xs[s]) ** 2 + (y - ys[s]) ** 2) ** 0.5 * 0.5
+        if score > best_score:
+            best, best_score = s, score
+    return best
+
+
+def test_best_matches_linear_sweep_with_deletions():
+    rng = random.Random(7)
+    n = 300
+    # integer coordinates and a few distinct values so ties are common
+    xs = [float(rng.randint(0, 60)) for _ in range(n)]
+    ys = [float(rng.randint(0, 60)) for _ in range(n)]
+    values = [rng.choice([8.0, 10.0, 12.0]) for _ in range(n)]
+    remaining = list(range(n))
+    index = GridIndex(xs, ys, values, remaining)
+
+    def score_batch(x, y):
+        return lambda slots: [values[s] - ((x - xs[s]) ** 2 + (y - ys[s]) ** 2) ** 0.5 * 0.5
+                              for s in slots]
+
+    while remaining:
+        x, y = rng.uniform(-20, 80), rng.uniform(-20, 80)
+        expected = _brute_best(xs, ys, values, remaining, x, y)
+        assert index.best(x, y, score_batch(x, y)) == expected
+        remaining.remove(expected)
+        index.remove(expected)
+    assert len(index) == 0
+    assert index.best(0.0, 0.0, score_batch(0.0, 0.0)) is None
+
+
+def test_collinear_points_get_a_sensible_grid():
+    rng = random.Random(3)
+    n = 1000
+    xs = [5.0] * n
+    ys = [rng.uniform(0, 100) for _ in range(n)]
+    values = [rng.uniform(5, 15) for _ in range(n)]
+    index = GridIndex(xs, ys, values, list(range(n)))
+    assert index.cell_size > 0.1 and index._nx * index._ny <= n
+
+    for _ in range(20):
+        x, y = rng.uniform(-20, 30), rng.uniform(-20, 120)
+        scores = lambda slots: [values[s] - ((x - xs[s]) ** 2 + (y - ys[s]) ** 2) ** 0.5 * 0.5 for s in slots]
+        assert index.best(x, y, scores) == _brute_best(xs, ys, values, range(n), x, y)
@@ -0,0 +1,63 @@
+# Tests for the time-window / shift-limit greedy mode. Run with: pytest -q
+
+import random
+
+import pytest
+
+import mn_dataset as data
+from node_table import NodeTable
+from benchmarks.generators import generate_dataset
+from greedy_approach import greedy_company_route, greedy_driver_route, greedy_ethical_route
+from time_windows import WindowIndex, greedy_time_window_route
+
+ARGS = (data.MN_NODES, data.MN_DEPOT, data.MN_EDGES)
+
+
+def test_without_time_limits_routes_match_the_routers():
+    cases = [("company", greedy_company_route(*ARGS)), ("driver", greedy_driver_route(*ARGS))]
+    cases += [(rule, greedy_ethical_route(*ARGS, rule)) for rule in ("fairness", "fatigue", "priority")]
+    for policy, (route, total) in cases:
+        timed = greedy_time_window_route(*ARGS, policy)
+        assert [n.id for n in timed.route] == [n.id for n in route] and timed.total == total
+        assert timed.skipped == [] and timed.times[-1] == sum(
+            a.distance_to(b) for a, b in zip(route, route[1:]))
+
+    assert (data.MN_DEPOT.window_start, data.MN_DEPOT.window_end, data.MN_DEPOT.service_time) == \
+        (0.0, float("inf"), 0.0)
+    view = NodeTable.from_nodes(data.MN_NODES).view(3)
+    assert (view.window_start, view.window_end, view.service_time) == (0.0, float("inf"), 0.0)
+
+
+def test_routes_respect_windows_and_shift():
+    nodes, depot, edges = generate_dataset(300, seed=3)
+    rng = random.Random(3)
+    for node in nodes:
+        if not node.is_depot:
+            node.window_start = rng.uniform(0.0, 600.0)
+            node.window_end = node.window_start + rng.uniform(30.0, 200.0)
+            node.service_time = rng.uniform(1.0, 5.0)
+    shift, speed = 720.0, 2.0
+    timed = greedy_time_window_route(nodes, depot, edges, "fatigue", shift_length=shift, speed=speed, wait_cost=0.2)
+    route, times = timed.route, timed.times
+    assert len(route) > 10 and len(route) - 2 + len(timed.skipped) == len(nodes) - 1
+
+    # replay the clock: every stop starts inside its window, and the shift ends on time
+    clock = 0.0
+    for prev, node, start in zip(route, route[1:-1], times[1:-1]):
+        arrival = clock + prev.distance_to(node) / speed
+        assert start == max(arrival, node.window_start) <= node.window_end
+        clock = start + node.service_time
+    assert times[-1] == clock + route[-2].distance_to(depot) / speed <= shift
+
+    # nothing skipped could still have been served from the last stop
+    for node in timed.skipped:
+        start = max(clock + route[-2].distance_to(node) / speed, node.window_start)
+        assert start > node.window_end or start + node.service_time + node.distance_to(depot) / speed > shift
+
+
+def test_window_index_expires_in_deadline_order():
+    index = WindowIndex([10, 11, 12, 13], [5.0, 1.0, 5.0, 3.0])
+    assert index.expire(0.5) == [] and index.expire(3.0) == [11]
+    assert index.expire(6.0) == [13, 10, 12] and len(index) == 0
+    with pytest.raises(ValueError):
+        greedy_time_window_route(*ARGS, speed=0.0)
@@ -0,0 +1,212 @@
+"""
+Greedy Algorithm Assignment - Time Windows and Shift Limits
+
+The routers in greedy_approach.py assume the driver has unlimited time. This
+file adds a time-feasible greedy mode: customers may have a delivery window
+(Node.window_start / window_end, when service can start) and a service time,
+and the driver has a shift that starts at shift_start and must end back at the
+depot by shift_start + shift_length. Travel takes distance / speed.
+
+The clock is advanced incrementally as stops are chosen: arrive, wait for the
+window to open if early, serve, leave. Since the clock never goes back, each
+customer has a fixed deadline, the latest service start that still fits both
+its window and the drive back to the depot before the shift ends; once the
+clock passes it, the customer can never be served. WindowIndex keeps the
+customers sorted by deadline, so dropping every customer whose deadline has
+passed is one binary search per step (plus the dropped customers themselves),
+and they leave the candidate sets and the fallback index for good. Only the
+few road neighbors that survive are checked against their exact arrival time.
+
+With no windows and no shift limit, routes and totals are exactly those of
+greedy_policy_route with the same policy.
+"""
+from bisect import bisect_left
+from typing import List, NamedTuple, Optional, Sequence, Union
+
+from main import Node, Edge, calculate_travel_cost
+from adjacency import AdjacencyIndex, as_adjacency
+from road_network import RoadNetwork
+from scoring import argmax_first
+from policies import ScoringPolicy, named_policy
+from route_building import (fallback_index, leg_distance, next_candidates, objective_scores,
+                            route_start, scoring_engine)
+
+INF = float('inf')
+
+
+class WindowIndex:
+    """
+    Slots ordered by deadline, for dropping every slot whose deadline has passed.
+
+    Ties keep the order the slots were given in.
+    """
+
+    def __init__(self, slots: Sequence[int], deadlines: Sequence[float]):
+        """
+        Args:
+            slots (Sequence[int]): Slots to index
+            deadlines (Sequence[float]): Deadline of each of those slots (same order)
+        """
+        order = sorted(range(len(slots)), key=deadlines.__getitem__)
+        self._slots = [slots[i] for i in order]
+        self._deadlines = [deadlines[i] for i in order]
+        self._expired = 0
+
+    def expire(self, now: float) -> List[int]:
+        """
+        Slots whose deadline is before now and that weren't returned by an earlier call.
+
+        Args:
+            now (float): Current time; must not decrease between calls
+        """
+        end = bisect_left(self._deadlines, now, self._expired)
+        expired = self._slots[self._expired:end]
+        self._expired = max(end, self._expired)
+        return expired
+
+    def __len__(self):
+        return len(self._slots) - self._expired
+
+
+class TimedRoute(NamedTuple):
+    """
+    A time-feasible route.
+
+    Attributes:
+        route (List[Node]): Stops in order, depot first and last
+        total (float): Total profit/earnings of the route
+        times (List[float]): Service start at each stop of route (shift start at the
+            first depot, arrival back at the last)
+        skipped (List[Node]): Customers no feasible route could still reach when they came up
+    """
+    route: List[Node]
+    total: float
+    times: List[float]
+    skipped: List[Node]
+
+
+def greedy_time_window_route(nodes: List[Node], depot: Node, edges: Union[List[Edge], AdjacencyIndex],
+                             policy: Union[str, ScoringPolicy] = "driver", reward: Optional[str] = None,
+                             shift_length: float = INF, shift_start: float = 0.0,
+                             speed: float = 1.0, wait_cost: float = 0.0) -> TimedRoute:
+    """
+    Greedy route that only moves to customers it can still serve in time.
+
+    At each step the best-scoring feasible road neighbor wins; with none, the best
+    feasible customer anywhere. The route returns to the depot once no remaining
+    customer is feasible.
+
+    Args:
+        nodes (List[Node]): All delivery locations including depot
+        depot (Node): The starting depot location
+        edges (List[Edge], AdjacencyIndex or RoadNetwork): All road connections
+        policy (str or ScoringPolicy): "company", "driver", an ethical rule name or any ScoringPolicy
+        reward (str, optional): "driver" or "company" (default: "company" for the
+            company policy, "driver" otherwise)
+        shift_length (float): Time from shift start until the driver must be back at the depot
+        shift_start (float): Clock time the driver leaves the depot
+        speed (float): Distance covered per unit of time
+        wait_cost (float): Subtracted from a candidate's score per unit of time the
+            driver would wait for its window to open (0: waiting is free)
+
+    Returns:
+        TimedRoute: (route, total, service start times, skipped customers)
+    """
+    if isinstance(policy, str):
+        if reward is None:
+            reward = "company" if policy == "company" else "driver"
+        policy = named_policy(policy)
+    reward = reward or "driver"
+    if reward not in ("driver", "company"):
+        raise ValueError(f"Unknown reward: {reward!r}")
+    if speed <= 0:
+        raise ValueError("speed must be positive")
+
+    graph = as_adjacency(edges, nodes)
+    engine = scoring_engine(graph)
+    reward_batch, _ = objective_scores(graph, engine, reward)
+    distances = graph.distances if isinstance(graph, RoadNetwork) else engine.distances
+    customers, visited = route_start(graph, nodes)
+    current = graph.slot_of[depot.id]
+
+    # latest feasible service start per slot: inside the window, and early enough to
+    # serve and drive back before the shift ends (never, if the window opens later)
+    shift_end = shift_start + shift_length
+    opens, deadline = {}, {}
+    for slot, back in zip(customers, distances(current, customers)):
+        node = graph.nodes[slot]
+        opens[slot] = node.window_start
+        latest = min(node.window_end, shift_end - node.service_time - back / speed)
+        deadline[slot] = latest if node.window_start <= latest else -INF
+    windows = WindowIndex(customers, [deadline[s] for s in customers])
+
+    state = {"current": depot, "distance": lambda u, v: leg_distance(graph, u, v)}
+    policy.init_state(state)
+    route, times, skipped = [depot], [shift_start], []
+    now, total, fallback = shift_start, 0.0, None
+
+    def feasible_scores(here: int, slots: List[int]) -> List[float]:
+        """Policy scores less any waiting cost, with -inf for slots that can't be served in time."""
+        dists = distances(here, slots)
+        scores = policy.score_batch(engine, here, slots, dists, state)
+        result = []
+        for s, d, score in zip(slots, dists, scores):
+            arrival = now + d / speed
+            if max(arrival, opens[s]) > deadline[s]:
+                score = -INF
+            elif wait_cost and opens[s] > arrival:
+                score -= (opens[s] - arrival) * wait_cost
+            result.append(score)
+        return result
+
+    for _ in range(len(customers)):
+        for slot in windows.expire(now):
+            if not visited[slot]:
+                visited[slot] = 1
+                skipped.append(slot)
+                if fallback is not None:
+                    fallback.remove(slot)
+
+        next_stops = next_candidates(graph, engine, current, visited)
+        scores = feasible_scores(current, next_stops)
+        if not next_stops or max(scores) == -INF:
+            bound = policy.fallback_bound(engine, state)
+            if bound is None or bound[0] is None:
+                next_stops = [s for s in customers if not visited[s]]
+                scores = feasible_scores(current, next_stops)
+                if not next_stops or max(scores) == -INF:
+                    break
+            else:
+                values, cost_per_mile, bonus = bound
+                if (fallback is None or fallback.values is not values
+                        or fallback.cost_per_mile != cost_per_mile):
+                    fallback = fallback_index(engine, customers, visited, values, cost_per_mile)
+                here = current
+                best = fallback.best(engine.x[here], engine.y[here],
+                                     lambda slots: feasible_scores(here, slots), bonus)
+                if best is None:
+                    break
+                next_stops, scores = [best], [0.0]
+        best = next_stops[argmax_first(scores)]
+
+        # clock: drive, wait for the window to open, serve
+        arrival = now + distances(current, [best])[0] / speed
+        start = max(arrival, opens[best])
+        now = start + graph.nodes[best].service_time
+        total += reward_batch(current, [best])[0]
+        node = graph.nodes[best]
+        policy.update(state, node)
+        state["current"] = node
+        current = best
+        visited[best] = 1
+        if fallback is not None:
+            fallback.remove(best)
+        route.append(node)
+        times.append(start)
+
+    skipped += [s for s in customers if not visited[s]]
+    back = leg_distance(graph, route[-1], depot)
+    total -= calculate_travel_cost(back)
+    route.append(depot)
+    times.append(now + back / speed)
+    return TimedRoute(route, total, times, [graph.nodes[s] for s in skipped])